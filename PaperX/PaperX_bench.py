@@ -0,0 +1,652 @@
+"""
+PaperX ölçüm araçları.
+
+  python PaperX_bench.py importtime        giriş noktalarının açılış süresi bütçesi
+  python PaperX_bench.py docx              sentetik .docx belgelerle dönüşüm aşama süreleri
+  python PaperX_bench.py memory            aşama başına bellek tepe değerleri ve bellek bütçesi
+
+Bütçe aşılırsa / taban ölçüme göre gerileme varsa çıkış kodu 1 olur; CI'da doğrudan kullanılabilir.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# ================== Import-time budget ==================
+# Açılışta (import anında) YÜKLENMEMESİ gereken ağır modüller.
+# Bunlar yalnızca ihtiyaç duyan aşama çalışınca yüklenmeli.
+HEAVY_MODULES = ("docx", "lxml", "numpy", "pandas", "matplotlib", "openpyxl", "email")
+
+# modül -> -X importtime kümülatif süre bütçesi (ms, en iyi ölçüm).
+# python-docx tek başına ~150 ms, pandas ~500 ms, matplotlib.pyplot ~900 ms sürer;
+# bütçeler bunlardan biri yanlışlıkla açılışa geri eklenirse aşılacak şekilde seçildi.
+STARTUP_BUDGET_MS = {
+    "PaperX_report": 120,
+    "PaperX_plots": 100,
+    "PaperX_cli": 150,
+    "PaperX_server": 200,
+    "PaperX_cover": 60,
+}
+
+
+def measure_import(module: str, runs: int = 5) -> tuple[float, set[str]]:
+    """
+    `python -X importtime -c "import <module>"` ile ölçer.
+    İlk çalıştırma .pyc üretmek için ısınmadır; sonraki ölçümlerin en iyisi döner.
+    (kümülatif ms, import edilen tüm modül adları)
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    best_us = None
+    imported: set[str] = set()
+    with tempfile.TemporaryDirectory() as pycache:
+        env["PYTHONPYCACHEPREFIX"] = pycache
+        cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+        for i in range(runs + 1):
+            res = subprocess.run(cmd, cwd=HERE, env=env, capture_output=True, text=True)
+            if res.returncode != 0:
+                raise RuntimeError(f"import {module} failed:\n{res.stderr[-2000:]}")
+            if i == 0:
+                continue
+            for line in res.stderr.splitlines():
+                if not line.startswith("import time:"):
+                    continue
+                parts = line[len("import time:"):].split("|")
+                if len(parts) != 3 or not parts[0].strip().isdigit():
+                    continue
+                name = parts[2].rstrip()[1:]   # "| " sonrası; iç içe importlar ek boşlukla girintili
+                imported.add(name.strip())
+                if name == module:
+                    us = int(parts[1])
+                    best_us = us if best_us is None else min(best_us, us)
+
+    return (best_us or 0) / 1000.0, imported
+
+
+def check_startup_budget(runs: int = 5) -> bool:
+    ok = True
+    print(f"{'module':<16} {'ms':>8} {'budget':>8}  heavy imports")
+    for module, budget in STARTUP_BUDGET_MS.items():
+        ms, imported = measure_import(module, runs=runs)
+        heavy = sorted(
+            h for h in HEAVY_MODULES
+            if any(name == h or name.startswith(h + ".") for name in imported)
+        )
+        passed = ms <= budget and not heavy
+        ok = ok and passed
+        mark = "✅" if passed else "❌"
+        print(f"{module:<16} {ms:8.1f} {budget:8d}  {', '.join(heavy) or '-'} {mark}")
+    return ok
+
+
+# ================== Synthetic .docx benchmark ==================
+PHASES = ("load", "classify", "text", "tables", "equations", "images", "write")
+
+OMML_XML = (
+    '<m:oMathPara xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math">'
+    '<m:oMath><m:r><m:t>E=m</m:t></m:r><m:sSup><m:e><m:r><m:t>c</m:t></m:r></m:e>'
+    '<m:sup><m:r><m:t>2</m:t></m:r></m:sup></m:sSup></m:oMath></m:oMathPara>'
+)
+NUMPR_XML = (
+    '<w:numPr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr>'
+)
+FILLER = ("Ölçülen değerler %5 sapma ile α ve β katsayılarına göre hesaplandı",
+          "Deney düzeneği R_1 & R_2 dirençleri ile {kurulmuştur}",
+          "Sonuçlar tablo ve grafiklerde özetlenmiştir")
+
+
+def png_bytes(width: int = 8, height: int = 8, rgb=(40, 90, 160)) -> bytes:
+    """Tek renkli küçük PNG (Pillow gerekmez)."""
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    row = b"\x00" + bytes(rgb) * width
+    raw = zlib.compress(row * height)
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", raw) + chunk(b"IEND", b"")
+
+
+@dataclass
+class DocSpec:
+    """Sentetik belgenin içeriği (mutlak sayılar)."""
+    paragraphs: int
+    tables: int = 0
+    table_rows: int = 5
+    table_cols: int = 4
+    equations: int = 0          # OMML (Word denklem editörü)
+    dollar_equations: int = 0   # $$ ... $$ satırları
+    images: int = 0             # satır içi görseller (+ "Şekil N:" caption)
+    lists: int = 0              # 3 maddelik Word listeleri
+    markers: int = 0            # $fig$ + $plot$ çiftleri (--- caption --- ile)
+    section_every: int = 25     # kaç metin paragrafında bir başlık
+
+    @property
+    def label(self) -> str:
+        return f"p{self.paragraphs}"
+
+
+def scaled_spec(paragraphs: int, per100: dict, table_shape: tuple[int, int], section_every: int) -> DocSpec:
+    def n(key):
+        return max(0, round(paragraphs * per100.get(key, 0) / 100))
+    return DocSpec(
+        paragraphs=paragraphs, tables=n("tables"),
+        table_rows=table_shape[0], table_cols=table_shape[1],
+        equations=n("equations"), dollar_equations=n("dollar_equations"),
+        images=n("images"), lists=n("lists"), markers=n("markers"),
+        section_every=section_every,
+    )
+
+
+def _spread(count: int, total: int) -> set[int]:
+    """count öğeyi 0..total-1 paragraf konumlarına eşit aralıklarla dağıtır."""
+    if count <= 0 or total <= 0:
+        return set()
+    return {int((i + 0.5) * total / count) for i in range(count)}
+
+
+def build_synthetic_docx(spec: DocSpec, path: str, lang: str = "tr"):
+    """
+    spec'e göre .docx üretir; $fig$/$plot$ için assets/imageN.png ve
+    assets/plots/plotN.png dosyalarını da belgenin yanına yazar.
+    (Satır içi görseller de görsel sayacını artırdığı için imageN sayısı images + markers.)
+    """
+    import io
+    from docx import Document
+    from docx.oxml import parse_xml
+
+    img = png_bytes()
+    d = Document()
+    d.add_paragraph("Kapak metni" if lang == "tr" else "Cover text")
+    d.add_paragraph("---")
+
+    kinds = {
+        "tables": _spread(spec.tables, spec.paragraphs),
+        "equations": _spread(spec.equations, spec.paragraphs),
+        "dollar_equations": _spread(spec.dollar_equations, spec.paragraphs),
+        "images": _spread(spec.images, spec.paragraphs),
+        "lists": _spread(spec.lists, spec.paragraphs),
+        "markers": _spread(spec.markers, spec.paragraphs),
+    }
+    heading = "BÖLÜM" if lang == "tr" else "SECTION"
+    fig_cap = "Şekil" if lang == "tr" else "Figure"
+
+    for i in range(spec.paragraphs):
+        if i % max(1, spec.section_every) == 0:
+            d.add_paragraph(f"{heading} {i // max(1, spec.section_every) + 1}")
+        d.add_paragraph(f"{FILLER[i % len(FILLER)]} {i}")
+
+        if i in kinds["lists"]:
+            for k in range(3):
+                lp = d.add_paragraph(f"Madde {k + 1}", style="List Bullet")
+                lp._p.get_or_add_pPr().append(parse_xml(NUMPR_XML))
+        if i in kinds["tables"]:
+            d.add_paragraph(f"--- Tablo {i} ---")
+            t = d.add_table(rows=spec.table_rows, cols=spec.table_cols)
+            for r in range(spec.table_rows):
+                for c in range(spec.table_cols):
+                    t.cell(r, c).text = f"h{c}" if r == 0 else f"{r * c}.5 ± 0.1 Ω"
+        if i in kinds["equations"]:
+            p = d.add_paragraph()
+            p._p.append(parse_xml(OMML_XML))
+        if i in kinds["dollar_equations"]:
+            d.add_paragraph(f"$$ x_{{{i}}}^2 + σ·y $$")
+        if i in kinds["images"]:
+            d.add_paragraph().add_run().add_picture(io.BytesIO(img))
+            d.add_paragraph(f"{fig_cap} {i}: satır içi görsel")
+        if i in kinds["markers"]:
+            d.add_paragraph("$fig$")
+            d.add_paragraph(f"--- Görsel {i} ---")
+            d.add_paragraph("$plot$")
+            d.add_paragraph(f"--- Grafik {i} ---")
+
+    d.save(path)
+
+    base = os.path.dirname(os.path.abspath(path))
+    os.makedirs(os.path.join(base, "assets", "plots"), exist_ok=True)
+    for n in range(1, spec.images + spec.markers + 1):
+        with open(os.path.join(base, "assets", f"image{n}.png"), "wb") as f:
+            f.write(img)
+    for n in range(1, spec.markers + 1):
+        with open(os.path.join(base, "assets", "plots", f"plot{n}.png"), "wb") as f:
+            f.write(img)
+
+
+def time_conversion(docx_path: str, out_dir: str, lang: str) -> dict:
+    """Tek dönüşüm; aşama süreleri (s) ve çağrı sayıları."""
+    from PaperX_report import ConversionContext, Features, PhaseTimer, convert_docx_with_context
+
+    timer = PhaseTimer()
+    ctx = ConversionContext(input_root=os.path.dirname(docx_path), out_dir=out_dir,
+                            log=lambda _msg: None, timer=timer)
+    t0 = time.perf_counter()
+    convert_docx_with_context(docx_path, lang, Features(), ctx)
+    total = time.perf_counter() - t0
+
+    seconds = {ph: timer.seconds.get(ph, 0.0) for ph in PHASES}
+    seconds["other"] = max(0.0, total - sum(seconds.values()))
+    seconds["total"] = total
+    return {"seconds": seconds, "calls": {ph: timer.calls.get(ph, 0) for ph in PHASES}}
+
+
+def run_docx_bench(specs: list[DocSpec], lang: str = "tr", repeat: int = 3, log=print) -> dict:
+    """Her boyut için belge üretir, repeat kez dönüştürür; en hızlı çalıştırma kaydedilir."""
+    import PaperX_report
+
+    results = []
+    with tempfile.TemporaryDirectory() as td:
+        for spec in specs:
+            work = os.path.join(td, spec.label)
+            os.makedirs(work)
+            docx_path = os.path.join(work, "report.docx")
+            build_synthetic_docx(spec, docx_path, lang=lang)
+
+            runs = [time_conversion(docx_path, os.path.join(work, f"out{r}"), lang) for r in range(repeat)]
+            best = min(runs, key=lambda r: r["seconds"]["total"])
+            totals = [r["seconds"]["total"] for r in runs]
+            results.append({
+                "size": spec.label,
+                "spec": asdict(spec),
+                "docx_bytes": os.path.getsize(docx_path),
+                "seconds": best["seconds"],
+                "calls": best["calls"],
+                "total_median": statistics.median(totals),
+            })
+            log(f"{spec.label:<8} total {best['seconds']['total'] * 1000:9.1f} ms")
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tools": {t: PaperX_report.find_tool(t) is not None
+                  for t in ("pandoc", "xelatex", "pdflatex", "magick", "pdftocairo")},
+        "lang": lang,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def print_phase_table(report: dict):
+    cols = PHASES + ("other", "total")
+    print(f"{'size':<8}" + "".join(f"{c:>11}" for c in cols) + "   (ms)")
+    for r in report["results"]:
+        print(f"{r['size']:<8}" + "".join(f"{r['seconds'][c] * 1000:11.1f}" for c in cols))
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float, min_ms: float) -> list[str]:
+    """
+    Taban ölçüme göre gerilemeler: süre > taban * (1 + tolerance) VE fark > min_ms.
+    (Çok kısa aşamalardaki gürültü gerileme sayılmaz.)
+    """
+    base_by_size = {r["size"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for r in report["results"]:
+        base = base_by_size.get(r["size"])
+        if base is None:
+            continue
+        for key, new_s in r["seconds"].items():
+            old_s = base["seconds"].get(key)
+            if old_s is None:
+                continue
+            diff_ms = (new_s - old_s) * 1000
+            if new_s > old_s * (1 + tolerance) and diff_ms > min_ms:
+                regressions.append(
+                    f"{r['size']} {key}: {old_s * 1000:.1f} -> {new_s * 1000:.1f} ms (+{diff_ms:.1f} ms)"
+                )
+    return regressions
+
+
+def _parse_shape(s: str) -> tuple[int, int]:
+    rows, _, cols = s.lower().partition("x")
+    return int(rows), int(cols)
+
+
+def cmd_docx(args) -> int:
+    per100 = {
+        "tables": args.tables, "equations": args.equations, "dollar_equations": args.dollar_equations,
+        "images": args.images, "lists": args.lists, "markers": args.markers,
+    }
+    shape = _parse_shape(args.table_shape)
+    specs = [scaled_spec(int(n), per100, shape, args.section_every) for n in args.sizes.split(",") if n.strip()]
+
+    report = run_docx_bench(specs, lang=args.lang, repeat=args.repeat)
+    print_phase_table(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"results -> {args.output}")
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"baseline -> {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance, args.min_ms)
+        if regressions:
+            print("❌ regressions vs baseline:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("✅ no regressions vs baseline")
+    return 0
+
+
+# ================== Memory ==================
+# Bellek bütçeleri girdi boyutuna göredir: sabit + katsayı * boyut.
+# report: boyut = word/document.xml'in açılmış hali; plots: boyut = Excel hücre sayısı.
+# traced = tracemalloc tepe değeri (Python nesneleri); rss = RSS artışı
+# (lxml ağacı gibi C tarafı ayırmalar tracemalloc'ta görünmez, RSS'te görünür).
+# Ölçülen değerlerin yaklaşık 2 katı; örn. p2000: traced 2.5 MB, RSS +6.3 MB;
+# 10000 satırlık Excel: traced 6.7 MB, RSS +19 MB.
+MEMORY_BUDGETS = {
+    "report": {"traced_mb": 4, "traced_per_unit": 8.0, "rss_mb": 8, "rss_per_unit": 16.0},
+    "plots": {"traced_mb": 6, "traced_per_unit": 256.0, "rss_mb": 32, "rss_per_unit": 512.0},
+}
+# ölçülen belgelerin içerik karışımı (100 paragraf başına)
+MEMORY_DOC_PER100 = {"tables": 2, "equations": 0, "dollar_equations": 2, "images": 1, "lists": 2, "markers": 1}
+
+
+def _rss_bytes() -> int | None:
+    """Anlık RSS (Linux /proc); yoksa None."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class MemoryTimer:
+    """
+    PaperX_report.PhaseTimer arayüzü (span / wrap / add / lap) + aşama başına bellek:
+    - trace=True:  aşama sürerken tracemalloc tepe değeri (iç içe aşamalar dış aşamaya da yansır)
+    - trace=False: arka plandaki örnekleyicinin o aşamada gördüğü en yüksek RSS
+    İki ölçüm ayrı çalıştırmalarda yapılır; tracemalloc'un kendi belleği RSS'i şişirir.
+    """
+    enabled = True
+
+    def __init__(self, trace: bool, rss_interval: float = 0.002):
+        from PaperX_report import PhaseTimer
+
+        self.trace = trace
+        self.times = PhaseTimer()
+        self.peak: dict[str, int] = {}
+        self._stack: list[list] = []       # [phase, şimdiye kadarki tepe]
+        self._rss_interval = rss_interval
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def __enter__(self):
+        if self.trace:
+            tracemalloc.start()
+        elif _rss_bytes() is not None:
+            self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.trace:
+            self.peak["total"] = tracemalloc.get_traced_memory()[1]
+            for v in self.peak.values():
+                self.peak["total"] = max(self.peak["total"], v)
+            tracemalloc.stop()
+        else:
+            self._stop.set()
+            if self._sampler is not None:
+                self._sampler.join()
+            if self.peak:
+                self.peak["total"] = max(self.peak.values())
+
+    def _sample_rss(self):
+        while not self._stop.wait(self._rss_interval):
+            rss = _rss_bytes()
+            phase = self._stack[-1][0] if self._stack else "other"
+            if rss is not None and rss > self.peak.get(phase, 0):
+                self.peak[phase] = rss
+
+    def _fold_peak(self):
+        """Şimdiye kadarki tracemalloc tepesini açık aşamaların hepsine işler."""
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._stack:
+            frame[1] = max(frame[1], peak)
+
+    def _enter(self, phase: str):
+        if self.trace:
+            self._fold_peak()
+            tracemalloc.reset_peak()
+        self._stack.append([phase, 0])
+
+    def _exit(self):
+        if not self.trace:
+            self._stack.pop()
+            return
+        self._fold_peak()
+        phase, peak = self._stack.pop()
+        tracemalloc.reset_peak()
+        if peak > self.peak.get(phase, 0):
+            self.peak[phase] = peak
+
+    def add(self, phase: str, dt: float):
+        self.times.add(phase, dt)
+
+    def lap(self, key: str | None = None):
+        self.times.lap(key)
+
+    def span(self, phase: str):
+        return _MemorySpan(self, phase)
+
+    def wrap(self, phase: str, fn):
+        def measured(*args, **kwargs):
+            with _MemorySpan(self, phase):
+                return fn(*args, **kwargs)
+        return measured
+
+
+class _MemorySpan:
+    __slots__ = ("owner", "phase", "t0")
+
+    def __init__(self, owner: MemoryTimer, phase: str):
+        self.owner = owner
+        self.phase = phase
+
+    def __enter__(self):
+        self.owner._enter(self.phase)
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.owner.add(self.phase, time.perf_counter() - self.t0)
+        self.owner._exit()
+        return False
+
+
+def build_synthetic_xlsx(path: str, rows: int, y_cols: int = 2):
+    """Başlık satırı + rows satır sayısal veri (A: x, B..: y)."""
+    import math
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Data")
+    ws.append(["Zaman (s)"] + [f"Sıcaklık {k + 1} (°C)" for k in range(y_cols)])
+    for i in range(rows):
+        x = i * 0.1
+        ws.append([x] + [20 + (k + 1) * 1.5 * x + math.sin(i + k) for k in range(y_cols)])
+    wb.save(path)
+
+
+def _memory_run(target: str, path: str, lang: str, trace: bool) -> dict:
+    """
+    Taze bir süreçte tek ölçüm (önceki çalıştırmaların ayırıcı önbelleği RSS'i etkilemesin).
+    Ağır modüller ölçümden ÖNCE yüklenir; import maliyeti aşamalara yazılmaz.
+    Döner: aşama -> tepe bayt (image:/block: kayıtları hariç), RSS için başlangıç değeri düşülmüş.
+    """
+    if target == "report":
+        import docx  # noqa: F401
+        from PaperX_report import Features, convert_docx_to_latex
+
+        base = os.path.dirname(path)
+        rss0 = _rss_bytes() or 0
+        with MemoryTimer(trace) as mt:
+            # IR önbelleği kapalı: iki ölçüm de ayrıştırmayı (load/classify) çalıştırsın
+            convert_docx_to_latex(path, lang, Features(), out_dir=os.path.join(base, f"out_{int(trace)}"),
+                                  log=lambda _msg: None, timer=mt, ir_cache=False)
+    else:
+        import openpyxl  # noqa: F401
+        import pandas  # noqa: F401
+        from PaperX_plots import PlotSpec, _new_figure, generate_plots
+
+        _new_figure()
+        specs = [PlotSpec(degree=1, curves=2, x="A", y=["B", "C"]),
+                 PlotSpec(degree=3, curves=1, x="A", y=["B"])]
+        rss0 = _rss_bytes() or 0
+        with MemoryTimer(trace) as mt:
+            generate_plots(path, specs, lang, base_dir=os.path.join(os.path.dirname(path), f"out_{int(trace)}"),
+                           log=lambda _msg: None, timer=mt)
+
+    offset = 0 if trace else rss0
+    return {ph: max(0, v - offset) for ph, v in mt.peak.items() if not ph.startswith(("image:", "block:"))}
+
+
+def measure_memory(target: str, path: str, size_units: int, lang: str = "tr") -> dict:
+    """tracemalloc ve RSS ölçümlerini ayrı taze süreçlerde yapar, bütçeyle karşılaştırır."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    runs = {}
+    for trace in (True, False):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            runs[trace] = pool.submit(_memory_run, target, path, lang, trace).result()
+    traced, rss = runs[True], runs[False]
+
+    b = MEMORY_BUDGETS[target]
+    budget_traced = int(b["traced_mb"] * 2**20 + b["traced_per_unit"] * size_units)
+    budget_rss = int(b["rss_mb"] * 2**20 + b["rss_per_unit"] * size_units)
+    peak_traced = traced.get("total", 0)
+    peak_rss = rss.get("total")
+    ok = peak_traced <= budget_traced and (peak_rss is None or peak_rss <= budget_rss)
+    return {
+        "target": target,
+        "size_units": size_units,
+        "peak_traced": peak_traced,
+        "peak_rss_growth": peak_rss,
+        "budget_traced": budget_traced,
+        "budget_rss": budget_rss,
+        "ok": ok,
+        "phases": {
+            ph: {"peak_traced": traced.get(ph), "peak_rss_growth": rss.get(ph)}
+            for ph in sorted(set(traced) | set(rss)) if ph != "total"
+        },
+    }
+
+
+def _mb(n) -> str:
+    return "-" if n is None else f"{n / 2**20:.1f}"
+
+
+def cmd_memory(args) -> int:
+    import zipfile
+
+    rows = []
+    with tempfile.TemporaryDirectory() as td:
+        for n in (int(x) for x in args.sizes.split(",") if x.strip()):
+            spec = scaled_spec(n, MEMORY_DOC_PER100, (5, 4), 25)
+            work = os.path.join(td, spec.label)
+            os.makedirs(work)
+            docx_path = os.path.join(work, "report.docx")
+            build_synthetic_docx(spec, docx_path, lang=args.lang)
+            with zipfile.ZipFile(docx_path) as z:
+                xml_bytes = z.getinfo("word/document.xml").file_size
+            row = measure_memory("report", docx_path, xml_bytes, lang=args.lang)
+            row["size"] = spec.label
+            rows.append(row)
+
+        for n in (int(x) for x in args.plot_rows.split(",") if x.strip()):
+            work = os.path.join(td, f"r{n}")
+            os.makedirs(work)
+            xlsx = os.path.join(work, "data.xlsx")
+            build_synthetic_xlsx(xlsx, n, y_cols=2)
+            row = measure_memory("plots", xlsx, (n + 1) * 3, lang=args.lang)
+            row["size"] = f"r{n}"
+            rows.append(row)
+
+    ok = True
+    for r in rows:
+        mark = "✅" if r["ok"] else "❌"
+        print(f"{r['target']:<7} {r['size']:<8} traced {_mb(r['peak_traced']):>7} / {_mb(r['budget_traced']):>7} MB"
+              f"   rss +{_mb(r['peak_rss_growth']):>7} / {_mb(r['budget_rss']):>7} MB {mark}")
+        for ph, v in sorted(r["phases"].items(), key=lambda kv: -(kv[1]["peak_traced"] or 0)):
+            print(f"    {ph:<12} traced {_mb(v['peak_traced']):>7} MB   rss +{_mb(v['peak_rss_growth']):>7} MB")
+        ok = ok and r["ok"]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"created_at": datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "results": rows},
+                      f, ensure_ascii=False, indent=2)
+        print(f"results -> {args.output}")
+
+    if args.check and not ok:
+        print("❌ memory budget exceeded")
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="PaperX_bench", description="PaperX measurement tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("importtime", help="check entry-point import time against the startup budget")
+    p.add_argument("--runs", type=int, default=5, help="measured runs per module (best is used)")
+
+    p = sub.add_parser("docx", help="time conversion phases on generated .docx files")
+    p.add_argument("--sizes", default="100,500,2000", help="comma separated paragraph counts")
+    p.add_argument("--lang", choices=("tr", "en"), default="tr")
+    p.add_argument("--repeat", type=int, default=3, help="conversions per size (fastest is recorded)")
+    p.add_argument("--table-shape", default="5x4", help="rows x cols of generated tables")
+    p.add_argument("--section-every", type=int, default=25, help="text paragraphs per heading")
+    p.add_argument("--tables", type=float, default=2, help="tables per 100 paragraphs")
+    p.add_argument("--equations", type=float, default=1, help="OMML equations per 100 paragraphs")
+    p.add_argument("--dollar-equations", type=float, default=2, help="$$ equations per 100 paragraphs")
+    p.add_argument("--images", type=float, default=1, help="inline images per 100 paragraphs")
+    p.add_argument("--lists", type=float, default=2, help="Word lists per 100 paragraphs")
+    p.add_argument("--markers", type=float, default=1, help="$fig$/$plot$ pairs per 100 paragraphs")
+    p.add_argument("-o", "--output", help="write JSON results here")
+    p.add_argument("--baseline", help="compare against this JSON results file (exit 1 on regression)")
+    p.add_argument("--save-baseline", help="also store these results as a baseline file")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (0.25 = 25%%)")
+    p.add_argument("--min-ms", type=float, default=5.0, help="ignore slowdowns smaller than this (ms)")
+
+    p = sub.add_parser("memory", help="peak memory per phase of report conversion and plot generation")
+    p.add_argument("--sizes", default="200,1000", help="comma separated paragraph counts (report)")
+    p.add_argument("--plot-rows", default="1000,10000", help="comma separated Excel row counts (plots)")
+    p.add_argument("--lang", choices=("tr", "en"), default="tr")
+    p.add_argument("--check", action="store_true", help="exit 1 if a peak exceeds its size-relative budget")
+    p.add_argument("-o", "--output", help="write JSON results here")
+
+    args = parser.parse_args(argv)
+    if args.command == "importtime":
+        return 0 if check_startup_budget(runs=args.runs) else 1
+    if args.command == "docx":
+        return cmd_docx(args)
+    if args.command == "memory":
+        return cmd_memory(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,529 @@
+"""
+paperx — non-interactive command line for PaperX.
+
+Usage:
+  python PaperX_cli.py convert rapor.docx
+  python PaperX_cli.py convert raporlar/ "lab*/*.docx" --lang en --no-plots -j 4
+  python PaperX_cli.py convert raporlar/ --config paperx.toml
+  python PaperX_cli.py convert rapor.docx --profile profile.json   (süre/çağrı profili)
+  python PaperX_cli.py convert tez.docx --section-jobs 8            (uzun belgede bölümler paralel)
+  python PaperX_cli.py convert tez.docx --only-section 3            (bölüm parçaları; yalnızca 3. derlenir)
+  python PaperX_cli.py convert giris.docx yontem.docx sonuc.docx --merge -o rapor   (tek rapor)
+  python PaperX_cli.py watch rapor.docx --plots-job grafikler.json --build   (kaydettikçe dönüştür + derle)
+  python PaperX_cli.py plots deney.toml -j 4                (spec dosyasındaki tüm grafikler, sorusuz)
+  python PaperX_cli.py serve --workers 4            (sıcak işçi havuzlu yerel sunucu)
+  python PaperX_cli.py submit rapor.docx --lang en  (sunucuya gönder)
+
+Every input document gets its own output directory (<out-dir>/<docx name>/)
+holding toc.tex, content.tex and the generated assets. With --merge all inputs
+become one report (in the given order) written directly to <out-dir>.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from dataclasses import fields
+from urllib.parse import urlencode
+
+from PaperX_report import Features, PhaseTimer, _t, convert_docx_files_to_latex, convert_docx_to_latex
+
+FEATURE_NAMES = [f.name for f in fields(Features)]
+CONFIG_KEYS = {"lang", "jobs", "out_dir", "features"}
+
+
+# ================== Config ==================
+def load_config(path: str) -> dict:
+    """
+    JSON veya TOML config okur:
+      {"lang": "en", "jobs": 4, "out_dir": "build",
+       "features": {"use_plots": false}}
+    """
+    if path.lower().endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            cfg = tomllib.load(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+
+    if not isinstance(cfg, dict):
+        raise ValueError(f"Config must be a table/object: {path}")
+    unknown = set(cfg) - CONFIG_KEYS
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+    feats = cfg.get("features", {})
+    if not isinstance(feats, dict):
+        raise ValueError("'features' must be a table/object")
+    unknown = set(feats) - set(FEATURE_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown features: {', '.join(sorted(unknown))}")
+    if cfg.get("lang", "tr") not in ("tr", "en"):
+        raise ValueError("'lang' must be 'tr' or 'en'")
+    return cfg
+
+
+def features_from_args(args, cfg: dict) -> Features:
+    """Config değerleri varsayılan, komut satırı bayrakları her zaman öncelikli."""
+    values = {name: bool(v) for name, v in cfg.get("features", {}).items()}
+    for name in FEATURE_NAMES:
+        flag = getattr(args, name)
+        if flag is not None:
+            values[name] = flag
+    return Features(**values)
+
+
+# ================== Inputs ==================
+def collect_docx_inputs(patterns: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Klasör, glob veya dosya yollarını mutlak .docx listesine çevirir.
+    Word kilit dosyaları (~$...) atlanır. (bulunanlar, eşleşmeyen desenler) döner.
+    """
+    found = []
+    unmatched = []
+    for pat in patterns:
+        if os.path.isdir(pat):
+            matches = sorted(glob.glob(os.path.join(pat, "*.docx")))
+        elif glob.has_magic(pat):
+            matches = sorted(glob.glob(pat, recursive=True))
+        else:
+            matches = [pat] if os.path.isfile(pat) else []
+
+        matches = [
+            m for m in matches
+            if m.lower().endswith(".docx") and not os.path.basename(m).startswith("~$")
+        ]
+        if not matches:
+            unmatched.append(pat)
+        found.extend(os.path.abspath(m) for m in matches)
+
+    return list(dict.fromkeys(found)), unmatched
+
+
+def assign_output_dirs(docx_paths: list[str], out_root: str) -> list[str]:
+    """Her belge için <out_root>/<isim>; aynı isim tekrar ederse <isim>_2, <isim>_3 ..."""
+    used = set()
+    out = []
+    for p in docx_paths:
+        stem = os.path.splitext(os.path.basename(p))[0]
+        name = stem
+        n = 1
+        while name.casefold() in used:
+            n += 1
+            name = f"{stem}_{n}"
+        used.add(name.casefold())
+        out.append(os.path.join(out_root, name))
+    return out
+
+
+# ================== Worker ==================
+def _convert_one(docx_path: str, out_dir: str, lang: str, features: Features, profile: bool = False,
+                 ir_cache: bool = True, section_jobs: int = 1, fragments: bool = False,
+                 only_sections: tuple[int, ...] = ()) -> dict:
+    """
+    Tek belgeyi dönüştürür (havuz işçisinde çalışır).
+    Çıktı mesajları belgeye özel listeye toplanır; özet ana süreçte basılır.
+    profile=True ise aşama/blok/araç/görsel süreleri "profile" anahtarında döner.
+    ir_cache=False ise ayrıştırma önbelleği (.docx yanındaki IR) kullanılmaz.
+    section_jobs > 1 ise belgenin bölümleri ayrıca süreç havuzunda üretilir.
+    fragments / only_sections: content/sec_NN.tex parçaları ve \\includeonly seçimi.
+    """
+    lines: list[str] = []
+    timer = PhaseTimer() if profile else None
+    t0 = time.perf_counter()
+    error = None
+    ok = False
+    try:
+        ok = convert_docx_to_latex(docx_path, lang=lang, features=features, out_dir=out_dir,
+                                   log=lines.append, timer=timer, ir_cache=ir_cache,
+                                   section_jobs=section_jobs, fragments=fragments, only_sections=only_sections)
+        if not ok:
+            error = "not found"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    return {
+        "docx": docx_path,
+        "out_dir": out_dir,
+        "ok": bool(ok) and error is None,
+        "seconds": time.perf_counter() - t0,
+        "warnings": sum(1 for line in lines if line.startswith("⚠️")),
+        "log": "\n".join(lines),
+        "error": error,
+        "profile": timer.as_dict() if timer is not None else None,
+    }
+
+
+def _convert_merged(docx_paths: list[str], out_dir: str, lang: str, features: Features, jobs: int,
+                    profile: bool = False, ir_cache: bool = True, fragments: bool = False,
+                    only_sections: tuple[int, ...] = ()) -> dict:
+    """Tüm belgeleri sırayla tek rapora dönüştürür; sonuç _convert_one ile aynı biçimdedir."""
+    lines: list[str] = []
+    timer = PhaseTimer() if profile else None
+    t0 = time.perf_counter()
+    error = None
+    ok = False
+    try:
+        ok = convert_docx_files_to_latex(docx_paths, lang=lang, features=features, out_dir=out_dir,
+                                         log=lines.append, timer=timer, ir_cache=ir_cache, jobs=jobs,
+                                         fragments=fragments, only_sections=only_sections)
+        if not ok:
+            error = "not found"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    return {
+        "docx": ", ".join(os.path.basename(p) for p in docx_paths),
+        "out_dir": out_dir,
+        "ok": bool(ok) and error is None,
+        "seconds": time.perf_counter() - t0,
+        "warnings": sum(1 for line in lines if line.startswith("⚠️")),
+        "log": "\n".join(lines),
+        "error": error,
+        "profile": timer.as_dict() if timer is not None else None,
+    }
+
+
+def run_batch(docx_paths: list[str], out_dirs: list[str], lang: str, features: Features, jobs: int,
+              threads: bool = False, profile: bool = False, ir_cache: bool = True, section_jobs: int = 1,
+              fragments: bool = False, only_sections: tuple[int, ...] = ()):
+    """
+    Sonuçları girdi sırasıyla üretir (yield).
+    threads=True: tek süreç içinde thread havuzu (dönüşüm CWD'ye dokunmadığı için güvenli).
+    """
+    if jobs <= 1 or len(docx_paths) <= 1:
+        for p, o in zip(docx_paths, out_dirs):
+            yield _convert_one(p, o, lang, features, profile, ir_cache, section_jobs, fragments, only_sections)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    with executor(max_workers=jobs) as pool:
+        futures = [pool.submit(_convert_one, p, o, lang, features, profile, ir_cache, section_jobs, fragments, only_sections)
+                   for p, o in zip(docx_paths, out_dirs)]
+        for fut in futures:
+            yield fut.result()
+
+
+# ================== Profile ==================
+PROFILE_GROUPS = (
+    ("phase", "aşama / phase"),
+    ("block", "blok türü / block kind"),
+    ("tool", "harici araç / external tool"),
+    ("image", "görsel / image"),
+)
+
+
+def merge_profiles(profiles: list[dict]) -> dict:
+    merged: dict[str, dict] = {}
+    for prof in profiles:
+        for key, v in prof.items():
+            m = merged.setdefault(key, {"seconds": 0.0, "calls": 0})
+            m["seconds"] += v["seconds"]
+            m["calls"] += v["calls"]
+    return merged
+
+
+def format_profile_summary(profile: dict, top: int) -> list[str]:
+    """Her grup için en çok süren `top` kayıt (önek yoksa aşama sayılır)."""
+    groups: dict[str, list] = {g: [] for g, _ in PROFILE_GROUPS}
+    for key, v in profile.items():
+        group, sep, name = key.partition(":")
+        if not sep:
+            group, name = "phase", key
+        groups.setdefault(group, []).append((name, v["seconds"], v["calls"]))
+
+    lines = []
+    for group, title in PROFILE_GROUPS:
+        rows = sorted(groups.get(group, []), key=lambda r: r[1], reverse=True)
+        if not rows:
+            continue
+        lines.append(f"--- {title} ---")
+        lines.append(f"  {'ms':>10} {'calls':>7} {'ms/call':>9}  name")
+        for name, sec, calls in rows[:top]:
+            lines.append(f"  {sec * 1000:10.1f} {calls:7d} {sec * 1000 / max(1, calls):9.2f}  {name}")
+        if len(rows) > top:
+            rest = sum(r[1] for r in rows[top:])
+            lines.append(f"  {rest * 1000:10.1f} {'':7} {'':9}  ({len(rows) - top} more)")
+    return lines
+
+
+def write_profile(path: str, results: list[dict]):
+    data = {
+        "files": [
+            {"docx": r["docx"], "ok": r["ok"], "seconds": r["seconds"], "profile": r["profile"]}
+            for r in results
+        ],
+        "total": merge_profiles([r["profile"] for r in results if r["profile"]]),
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+# ================== Commands ==================
+def cmd_convert(args) -> int:
+    cfg = load_config(args.config) if args.config else {}
+    lang = args.lang or cfg.get("lang", "tr")
+    features = features_from_args(args, cfg)
+    jobs = args.jobs or int(cfg.get("jobs", 0)) or (os.cpu_count() or 1)
+    out_root = os.path.abspath(args.out_dir or cfg.get("out_dir", "paperx_out"))
+
+    docx_paths, unmatched = collect_docx_inputs(args.inputs)
+    for pat in unmatched:
+        print(_t(lang, f"❌ Eşleşen .docx yok: {pat}", f"❌ No .docx matched: {pat}"), file=sys.stderr)
+    if not docx_paths:
+        return 2
+
+    jobs = min(jobs, len(docx_paths))
+    profile = args.profile is not None
+    only_sections = tuple(args.only_section or ())
+    fragments = args.split_sections or bool(only_sections)
+    if args.merge:
+        batch = [_convert_merged(docx_paths, out_root, lang, features, jobs, profile, ir_cache=not args.no_cache,
+                                 fragments=fragments, only_sections=only_sections)]
+    else:
+        out_dirs = assign_output_dirs(docx_paths, out_root)
+        batch = run_batch(docx_paths, out_dirs, lang, features, jobs, threads=args.threads, profile=profile,
+                          ir_cache=not args.no_cache, section_jobs=args.section_jobs,
+                          fragments=fragments, only_sections=only_sections)
+
+    results = []
+    n_ok = 0
+    for res in batch:
+        results.append(res)
+        name = os.path.basename(res["docx"])
+        if args.verbose and res["log"]:
+            print(res["log"].rstrip())
+        if res["ok"]:
+            n_ok += 1
+            print(_t(
+                lang,
+                f"✅ {name} -> {res['out_dir']} ({res['seconds']:.2f} sn, {res['warnings']} uyarı)",
+                f"✅ {name} -> {res['out_dir']} ({res['seconds']:.2f} s, {res['warnings']} warnings)",
+            ))
+        else:
+            print(_t(lang, f"❌ {name}: {res['error']}", f"❌ {name}: {res['error']}"))
+
+    if profile:
+        merged = merge_profiles([r["profile"] for r in results if r["profile"]])
+        print(_t(lang, "=== Profil ===", "=== Profile ==="))
+        for line in format_profile_summary(merged, args.profile_top):
+            print(line)
+        write_profile(args.profile, results)
+        print(_t(lang, f"✅ Profil yazıldı: {args.profile}", f"✅ Profile written: {args.profile}"))
+
+    total = (1 if args.merge else len(docx_paths)) + len(unmatched)
+    print(_t(lang, f"=== {n_ok}/{total} belge dönüştürüldü ===", f"=== {n_ok}/{total} documents converted ==="))
+    return 0 if n_ok == total else 1
+
+
+def cmd_watch(args) -> int:
+    from PaperX_watch import WatchSession, WatchTargets
+
+    cfg = load_config(args.config) if args.config else {}
+    lang = args.lang or cfg.get("lang", "tr")
+    docx_path = os.path.abspath(args.docx)
+    if not os.path.isfile(docx_path):
+        print(_t(lang, f"❌ {args.docx} bulunamadı!", f"❌ {args.docx} not found!"), file=sys.stderr)
+        return 2
+    targets = WatchTargets(
+        docx=docx_path,
+        out_dir=os.path.abspath(args.out_dir or os.path.dirname(docx_path)),
+        plots_job=os.path.abspath(args.plots) if args.plots else None,
+    )
+    session = WatchSession(targets, lang, features_from_args(args, cfg), build=args.build,
+                           section_jobs=args.section_jobs)
+    session.run(debounce=args.debounce, poll=args.poll, interval=args.interval)
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from PaperX_server import serve
+
+    serve(host=args.host, port=args.port, unix_path=args.unix, workers=args.workers, queue_size=args.queue_size)
+    return 0
+
+
+def _print_server_log(events):
+    """log olaylarını basar, done olayını döndürür."""
+    done = {"ok": False, "error": "no response"}
+    for ev in events:
+        if ev.get("event") == "log":
+            print(ev["line"])
+        elif ev.get("event") == "done":
+            done = ev
+    return done
+
+
+def cmd_submit(args) -> int:
+    from PaperX_server import request_events
+
+    lang = args.lang or "tr"
+    docx_path = os.path.abspath(args.docx)
+    with open(docx_path, "rb") as f:
+        data = f.read()
+
+    out_dir = os.path.abspath(args.out_dir or os.path.dirname(docx_path))
+    query = {"lang": lang, "input_root": os.path.dirname(docx_path), "out_dir": out_dir}
+    for name in FEATURE_NAMES:
+        flag = getattr(args, name)
+        if flag is not None:
+            query[name.removeprefix("use_")] = "1" if flag else "0"
+
+    os.makedirs(out_dir, exist_ok=True)
+    content_path = os.path.join(out_dir, "content.tex")
+    done = {"ok": False, "error": "no response"}
+    with open(content_path + ".tmp", "w", encoding="utf-8") as content:
+        events = request_events("POST", "/convert?" + urlencode(query), body=data,
+                                host=args.host, port=args.port, unix_path=args.unix)
+        for ev in events:
+            kind = ev.get("event")
+            if kind == "toc":
+                with open(os.path.join(out_dir, "toc.tex"), "w", encoding="utf-8") as f:
+                    f.write(ev["data"])
+            elif kind == "content":
+                content.write(ev["data"])
+            elif kind == "log":
+                print(ev["line"])
+            elif kind == "done":
+                done = ev
+
+    if not done.get("ok"):
+        os.remove(content_path + ".tmp")
+        print(_t(lang, f"❌ {os.path.basename(docx_path)}: {done.get('error')}",
+                 f"❌ {os.path.basename(docx_path)}: {done.get('error')}"))
+        return 1
+    os.replace(content_path + ".tmp", content_path)
+    print(_t(lang, f"✅ {os.path.basename(docx_path)} -> {out_dir} ({done['seconds']:.2f} sn)",
+             f"✅ {os.path.basename(docx_path)} -> {out_dir} ({done['seconds']:.2f} s)"))
+    return 0
+
+
+def cmd_plots(args) -> int:
+    from PaperX_plots import load_plot_job, run_plot_job
+
+    run_plot_job(load_plot_job(args.spec), jobs=args.jobs)
+    return 0
+
+
+def cmd_submit_plots(args) -> int:
+    from PaperX_plots import load_plot_job
+    from PaperX_server import request_events
+
+    job = load_plot_job(args.job)
+
+    events = request_events("POST", "/plots", body=json.dumps(job).encode("utf-8"),
+                            host=args.host, port=args.port, unix_path=args.unix)
+    done = _print_server_log(events)
+    if not done.get("ok"):
+        print(f"❌ {done.get('error')}")
+        return 1
+    return 0
+
+
+def _add_feature_flags(p: argparse.ArgumentParser):
+    for name in FEATURE_NAMES:
+        flag = name.removeprefix("use_")
+        p.add_argument(f"--{flag}", dest=name, action=argparse.BooleanOptionalAction, default=None,
+                       help=f"enable/disable {flag} (default: enabled)")
+
+
+def _add_server_address(p: argparse.ArgumentParser):
+    from PaperX_server import DEFAULT_HOST, DEFAULT_PORT
+
+    p.add_argument("--host", default=DEFAULT_HOST, help=f"server host (default: {DEFAULT_HOST})")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"server port (default: {DEFAULT_PORT})")
+    p.add_argument("--unix", help="Unix socket path instead of TCP")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="paperx", description="PaperX: Word (.docx) -> LaTeX report automation.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("convert", help="convert .docx files to toc.tex/content.tex")
+    p.add_argument("inputs", nargs="+", help=".docx files, directories or glob patterns")
+    p.add_argument("--lang", choices=("tr", "en"), help="report language (default: tr)")
+    p.add_argument("--config", help="JSON/TOML file with lang, jobs, out_dir and features")
+    p.add_argument("-o", "--out-dir", help="root output directory (default: paperx_out)")
+    p.add_argument("-j", "--jobs", type=int, help="parallel workers (default: CPU count)")
+    p.add_argument("--threads", action="store_true", help="use a thread pool in this process instead of worker processes")
+    p.add_argument("-v", "--verbose", action="store_true", help="print each document's conversion log")
+    p.add_argument("--profile", nargs="?", const="paperx_profile.json", metavar="JSON",
+                   help="record time/call counts per phase, block kind, external tool and image "
+                        "(default file: paperx_profile.json)")
+    p.add_argument("--profile-top", type=int, default=10, metavar="N", help="rows per group in the profile summary")
+    p.add_argument("--section-jobs", type=int, default=1, metavar="N",
+                   help="convert the sections (headings) of each document in N processes; output is identical")
+    p.add_argument("--merge", action="store_true",
+                   help="merge all inputs, in the given order, into one report in --out-dir "
+                        "(numbering continues across documents)")
+    p.add_argument("--split-sections", action="store_true",
+                   help="write one fragment per heading (content/sec_NN.tex, only rewritten when changed); "
+                        "content.tex becomes their index")
+    p.add_argument("--only-section", type=int, action="append", metavar="N",
+                   help="with fragments: compile only section N via \\includeonly (paperx_only.tex); repeatable")
+    p.add_argument("--no-cache", action="store_true",
+                   help="always re-parse the .docx (do not read/write the parsed-document cache next to it)")
+    _add_feature_flags(p)
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser("watch", help="reconvert (and rebuild) whenever the .docx, assets/ or the Excel source changes")
+    p.add_argument("docx", help=".docx file to watch")
+    p.add_argument("--lang", choices=("tr", "en"), help="report language (default: tr)")
+    p.add_argument("--config", help="paperx.toml / .json with lang and features")
+    p.add_argument("-o", "--out-dir", help="output directory (default: next to the .docx)")
+    p.add_argument("--plots-job", dest="plots", metavar="JSON",
+                   help="plot job (same format as submit-plots); its Excel file is watched and plots regenerated")
+    p.add_argument("--build", nargs="?", const="auto", metavar="CMD",
+                   help="build after each change: latexmk/pdflatex on main.tex in --out-dir, or the given command")
+    p.add_argument("--debounce", type=float, default=0.5, metavar="SEC",
+                   help="wait until no file event arrived for SEC seconds (default: 0.5)")
+    p.add_argument("--poll", action="store_true", help="poll file stats instead of using inotify")
+    p.add_argument("--interval", type=float, default=1.0, metavar="SEC", help="polling interval (default: 1.0)")
+    p.add_argument("--section-jobs", type=int, default=1, metavar="N", help="convert sections in N processes")
+    _add_feature_flags(p)
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("serve", help="run the local conversion server with a warm worker pool")
+    _add_server_address(p)
+    p.add_argument("-w", "--workers", type=int, help="worker processes (default: CPU count)")
+    p.add_argument("--queue-size", type=int, default=16, help="max queued jobs before rejecting (default: 16)")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("submit", help="convert one .docx through a running server")
+    p.add_argument("docx", help=".docx file")
+    p.add_argument("--lang", choices=("tr", "en"), help="report language (default: tr)")
+    p.add_argument("-o", "--out-dir", help="output directory (default: next to the .docx)")
+    _add_server_address(p)
+    _add_feature_flags(p)
+    p.set_defaults(func=cmd_submit)
+
+    p = sub.add_parser("plots", help="render the plots of a JSON/TOML spec file without prompts")
+    p.add_argument("spec", help='plot spec: {"workbook": "data.xlsx", "lang": "tr", "plots": [{"degree": 1, "x": "A", "y": ["B"]}]}')
+    p.add_argument("-j", "--jobs", type=int, help="render processes (default: spec 'jobs' or CPU count)")
+    p.set_defaults(func=cmd_plots)
+
+    p = sub.add_parser("submit-plots", help="render plots through a running server")
+    p.add_argument("job", help='JSON/TOML plot spec, same as for the plots command')
+    _add_server_address(p)
+    p.set_defaults(func=cmd_submit_plots)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"paperx: error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+Akışlı (streaming) .docx okuyucu.
+
+python-docx tüm belgeyi nesne ağacı olarak belleğe alır. Burada zip açılır,
+word/document.xml lxml iterparse ile gövde bloğu bloğu okunur; her paragraf/tablo
+küçük bir kayda (DocxParagraph / DocxTable) çevrilir ve XML elemanı hemen bırakılır.
+İlişkiler (rels), stiller ve medya yalnızca gerektiğinde okunur.
+Kayıtlar PaperX_report.parse_docx_ir ile sınıflandırılıp ara gösterime (IR) aktarılır.
+
+Metin, liste ve tablo hücresi anlamları python-docx ile aynıdır:
+  - Paragraph.text: w:r ve w:hyperlink/w:r içindeki w:t, w:tab, w:ptab, w:br, w:cr, w:noBreakHyphen
+  - Table.rows[i].cells: gridSpan kadar tekrar, vMerge="continue" üstteki hücrenin metnini alır
+"""
+import posixpath
+import zipfile
+from functools import cached_property
+from typing import BinaryIO, Iterator
+
+# lxml burada import EDİLMEZ (açılış süresi); belge okunurken yüklenir.
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+M_NS = "http://schemas.openxmlformats.org/officeDocument/2006/math"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+V_NS = "urn:schemas-microsoft-com:vml"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+STYLES_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY, W_P, W_TBL, W_TR, W_TC = _w("body"), _w("p"), _w("tbl"), _w("tr"), _w("tc")
+W_R, W_HYPERLINK, W_T = _w("r"), _w("hyperlink"), _w("t")
+W_TAB, W_PTAB, W_BR, W_CR, W_NOBREAKHYPHEN = _w("tab"), _w("ptab"), _w("br"), _w("cr"), _w("noBreakHyphen")
+W_PPR, W_PSTYLE, W_NUMPR = _w("pPr"), _w("pStyle"), _w("numPr")
+W_TRPR, W_GRIDBEFORE, W_TCPR, W_GRIDSPAN, W_VMERGE = _w("trPr"), _w("gridBefore"), _w("tcPr"), _w("gridSpan"), _w("vMerge")
+W_VAL, W_TYPE = _w("val"), _w("type")
+W_STYLE, W_NAME, W_STYLE_ID, W_DEFAULT = _w("style"), _w("name"), _w("styleId"), _w("default")
+W_DRAWING, W_PICT = _w("drawing"), _w("pict")
+M_OMATH, M_OMATHPARA = f"{{{M_NS}}}oMath", f"{{{M_NS}}}oMathPara"
+V_IMAGEDATA = f"{{{V_NS}}}imagedata"
+A_BLIP = f"{{{A_NS}}}blip"
+R_EMBED = f"{{{R_NS}}}embed"
+
+_ON = ("1", "true", "on")
+
+
+# ================== Block records ==================
+class DocxParagraph:
+    """
+    Gövde paragrafı.
+    text:        python-docx Paragraph.text ile aynı
+    has_omml:    Word denklemi (m:oMath / m:oMathPara) içeriyor mu
+    has_image:   w:drawing / w:pict / v:imagedata içeriyor mu
+    is_list:     doğrudan w:numPr var mı (Word madde/numara listesi)
+    style_name:  yalnızca liste paragraflarında çözülür (yoksa "")
+    image_part:  ilk a:blip'in gösterdiği zip üyesi ("word/media/image1.png") veya None
+    xml:         yalnızca OMML paragraflarında paragrafın XML'i (pandoc için), yoksa None
+    """
+    __slots__ = ("text", "has_omml", "has_image", "is_list", "style_name", "image_part", "xml")
+
+    def __init__(self, text: str, has_omml: bool = False, has_image: bool = False, is_list: bool = False,
+                 style_name: str = "", image_part: str | None = None, xml: bytes | None = None):
+        self.text = text
+        self.has_omml = has_omml
+        self.has_image = has_image
+        self.is_list = is_list
+        self.style_name = style_name
+        self.image_part = image_part
+        self.xml = xml
+
+
+class DocxTable:
+    """Gövde tablosu; rows[i][j] hücre metni (yatay birleşik hücreler tekrarlı)."""
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: list[list[str]]):
+        self.rows = rows
+
+
+# ================== Package (lazy parts) ==================
+class DocxPackage:
+    """
+    .docx zip paketi. document.xml dışındaki parçalar (rels, [Content_Types], styles)
+    ilk kullanıldıklarında okunur; medya yalnızca read_part() ile istenince.
+    """
+
+    def __init__(self, source: str | BinaryIO):
+        self.zip = zipfile.ZipFile(source)
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_part(self, name: str) -> bytes:
+        return self.zip.read(name)
+
+    def _parse_part(self, name: str):
+        from lxml import etree
+
+        try:
+            data = self.zip.read(name)
+        except KeyError:
+            return None
+        return etree.fromstring(data, parser=etree.XMLParser(resolve_entities=False))
+
+    def _relationships(self, part_name: str) -> list[tuple[str, str, str | None]]:
+        """part_name'in ilişkileri: (rId, tür, hedef zip üyesi); harici hedefler None."""
+        base, name = posixpath.split(part_name)
+        root = self._parse_part(posixpath.join(base, "_rels", name + ".rels"))
+        if root is None:
+            return []
+        out = []
+        for rel in root.iter(f"{{{PKG_REL_NS}}}Relationship"):
+            target = rel.get("Target") or ""
+            if rel.get("TargetMode") == "External":
+                resolved = None
+            elif target.startswith("/"):
+                resolved = target.lstrip("/")
+            else:
+                resolved = posixpath.normpath(posixpath.join(base, target))
+            out.append((rel.get("Id"), rel.get("Type"), resolved))
+        return out
+
+    def _target_of_type(self, part_name: str, rel_type: str) -> str | None:
+        return next((t for _, typ, t in self._relationships(part_name) if typ == rel_type and t), None)
+
+    @cached_property
+    def document_part(self) -> str:
+        return self._target_of_type("", OFFICE_DOCUMENT_REL) or "word/document.xml"
+
+    @cached_property
+    def document_rels(self) -> dict[str, str | None]:
+        """rId -> hedef (ilk görsel paragrafında okunur)."""
+        return {rid: target for rid, _, target in self._relationships(self.document_part)}
+
+    @cached_property
+    def content_types(self) -> tuple[dict[str, str], dict[str, str]]:
+        """(override: "/word/media/x.png" -> tür, default: "png" -> tür)"""
+        root = self._parse_part("[Content_Types].xml")
+        overrides, defaults = {}, {}
+        if root is not None:
+            for el in root.iter(f"{{{CT_NS}}}Override"):
+                overrides[(el.get("PartName") or "").lower()] = el.get("ContentType") or ""
+            for el in root.iter(f"{{{CT_NS}}}Default"):
+                defaults[(el.get("Extension") or "").lower()] = el.get("ContentType") or ""
+        return overrides, defaults
+
+    def content_type(self, part_name: str) -> str:
+        overrides, defaults = self.content_types
+        ct = overrides.get("/" + part_name.lower())
+        if ct is not None:
+            return ct
+        return defaults.get(posixpath.splitext(part_name)[1].lstrip(".").lower(), "")
+
+    @cached_property
+    def paragraph_styles(self) -> tuple[dict[str, str], str]:
+        """(paragraf stil id -> ad, varsayılan paragraf stilinin adı)"""
+        names: dict[str, str] = {}
+        default_name = ""
+        styles_part = self._target_of_type(self.document_part, STYLES_REL)
+        root = self._parse_part(styles_part) if styles_part else None
+        if root is None:
+            return names, default_name
+        for st in root.iter(W_STYLE):
+            if st.get(W_TYPE) != "paragraph":
+                continue
+            name_el = st.find(W_NAME)
+            name = (name_el.get(W_VAL) if name_el is not None else None) or ""
+            sid = st.get(W_STYLE_ID)
+            if sid is not None and sid not in names:
+                names[sid] = name
+            if (st.get(W_DEFAULT) or "").lower() in _ON:
+                default_name = name     # spec: belge sırasındaki son varsayılan
+        return names, default_name
+
+    def style_name(self, style_id: str | None) -> str:
+        names, default_name = self.paragraph_styles
+        if style_id and style_id in names:
+            return names[style_id]
+        return default_name
+
+
+# ================== Parsing ==================
+def _run_text(r) -> str:
+    parts = []
+    for c in r:
+        tag = c.tag
+        if tag == W_T:
+            parts.append(c.text or "")
+        elif tag == W_TAB or tag == W_PTAB:
+            parts.append("\t")
+        elif tag == W_BR:
+            if c.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == W_CR:
+            parts.append("\n")
+        elif tag == W_NOBREAKHYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+
+def paragraph_text(p) -> str:
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            for r in child:
+                if r.tag == W_R:
+                    parts.append(_run_text(r))
+    return "".join(parts)
+
+
+def _paragraph_record(p, pkg: DocxPackage) -> DocxParagraph:
+    from lxml import etree
+
+    rec = DocxParagraph(paragraph_text(p))
+
+    ppr = p.find(W_PPR)
+    if ppr is not None and ppr.find(W_NUMPR) is not None:
+        rec.is_list = True
+        pstyle = ppr.find(W_PSTYLE)
+        rec.style_name = pkg.style_name(pstyle.get(W_VAL) if pstyle is not None else None)
+
+    for _ in p.iter(M_OMATH, M_OMATHPARA):
+        rec.has_omml = True
+        rec.xml = etree.tostring(p)
+        break
+
+    for _ in p.iter(W_DRAWING, W_PICT, V_IMAGEDATA):
+        rec.has_image = True
+        for blip in p.iter(A_BLIP):
+            rid = blip.get(R_EMBED)
+            if rid:
+                rec.image_part = pkg.document_rels.get(rid)
+            break
+        break
+
+    return rec
+
+
+def _int_val(parent, tag: str, default: int) -> int:
+    el = parent.find(tag) if parent is not None else None
+    if el is None:
+        return default
+    try:
+        return int(el.get(W_VAL))
+    except (TypeError, ValueError):
+        return default
+
+
+def _table_record(tbl) -> DocxTable:
+    rows = []
+    above: dict[int, str] = {}      # üst satırda başlangıç ızgara konumu -> hücre metni
+    for tr in tbl:
+        if tr.tag != W_TR:
+            continue
+        offset = _int_val(tr.find(W_TRPR), W_GRIDBEFORE, 0)
+        cells = []
+        current: dict[int, str] = {}
+        for tc in tr:
+            if tc.tag != W_TC:
+                continue
+            tcpr = tc.find(W_TCPR)
+            span = _int_val(tcpr, W_GRIDSPAN, 1)
+            vmerge = tcpr.find(W_VMERGE) if tcpr is not None else None
+            if vmerge is not None and vmerge.get(W_VAL, "continue") == "continue":
+                text = above.get(offset, "")
+            else:
+                text = "\n".join(paragraph_text(p) for p in tc if p.tag == W_P)
+            current[offset] = text
+            cells.extend([text] * span)
+            offset += span
+        rows.append(cells)
+        above = current
+    return DocxTable(rows)
+
+
+def iter_docx_blocks(pkg: DocxPackage) -> Iterator[tuple[str, DocxParagraph | DocxTable]]:
+    """
+    Gövdenin doğrudan çocuğu olan paragraf ve tabloları sırayla üretir:
+    ("p", DocxParagraph) / ("tbl", DocxTable). İşlenen elemanlar hemen serbest bırakılır.
+    """
+    from lxml import etree
+
+    with pkg.zip.open(pkg.document_part) as f:
+        for _event, el in etree.iterparse(f, events=("end",), tag=(W_P, W_TBL), resolve_entities=False):
+            parent = el.getparent()
+            if parent is None or parent.tag != W_BODY:
+                continue        # tablo hücresi / metin kutusu içindeki paragraf
+
+            if el.tag == W_P:
+                yield "p", _paragraph_record(el, pkg)
+            else:
+                yield "tbl", _table_record(el)
+
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
+
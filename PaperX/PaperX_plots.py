@@ -2,13 +2,29 @@
 import os
 import re
 import json
-import shutil
+import hashlib
+from contextlib import nullcontext
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
 
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
+# numpy / pandas / matplotlib burada import EDİLMEZ: dil sorusu ve girdi toplama
+# anında açılsın diye ağır modüller yalnızca ihtiyaç duyan aşamada yüklenir.
+
+
+def _new_figure():
+    """
+    Agg tuvalli yeni Figure. pyplot'un global durumu (aktif figür, backend) kullanılmaz;
+    böylece grafikler ayrı süreçlerde/bağımsız olarak çizilebilir.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig
 
 
 # ================== Language (ASK IN ENGLISH FIRST) ==================
@@ -23,47 +39,49 @@ def ask_language() -> str:
 def T(lang: str):
     """Tiny translation helper."""
     tr = {
-        "excel_name": "Excel dosyası adı (uzantı yazmana gerek yok): ",
+        "excel_name": "Excel dosyası adı (uzantı yazmana gerek yok; .csv/.npy de olur): ",
         "n_plots": "Kaç grafik çizmek istiyorsunuz?: ",
         "plot_i": "{i}. grafik için:",
-        "degree": "Polinom derecesi kaç olsun? (örn: 2): ",
+        "degree": "Polinom derecesi kaç olsun? (örn: 2, otomatik için auto): ",
         "curves": "Kaç eğri çizilecek? (1/2): ",
         "x_col": "X ekseni sütunu (örnek: A): ",
         "y1_col": "1. eğri için Y sütunu (örnek: B): ",
         "y2_col": "2. eğri için Y sütunu (örnek: C): ",
         "bad_int": "❌ Lütfen geçerli bir sayı girin.",
-        "bad_degree": "❌ Derece en az 1 olmalı.",
+        "bad_degree": "❌ Derece en az 1 (veya auto) olmalı.",
         "bad_curves": "❌ Sadece 1 veya 2 girin.",
         "bad_n": "❌ Grafik sayısı 1 veya daha büyük olmalı.",
         "no_numeric_50": "İlk 50 satırda sayısal veri bulunamadı.",
         "no_numeric_cols": "Seçilen sütunlarda sayısal veri bulunamadı.",
         "insufficient_points": "Polinom fit için yetersiz veri: {n} nokta var, en az {need} gerekir.",
         "insufficient_unique_x": "Polinom fit için X değerleri yeterince farklı değil (unique X: {u}).",
-        "done": "✅ Grafikler üretildi: {k} adet PNG -> assets/plots/",
-        "warn_exists": "ℹ️ assets/plots klasörü temizlendi (eski grafikler silindi).",
+        "done": "✅ Grafikler üretildi: {k} adet -> assets/plots/",
+        "unchanged": "ℹ️ Değişmeyen {k} grafik yeniden çizilmedi.",
+        "stale_removed": "ℹ️ Artık kullanılmayan {k} grafik dosyası silindi.",
         "meta_written": "✅ plots_meta.json yazıldı.",
         "file_not_found": "❌ Dosya bulunamadı: {p}",
         "slope_label": "Eğim",  # plot üstünde gösterilecek metin
     }
     en = {
-        "excel_name": "Excel file name (no need to type .xlsx): ",
+        "excel_name": "Excel file name (no need to type .xlsx; .csv/.npy also work): ",
         "n_plots": "How many plots do you want to generate?: ",
         "plot_i": "For plot #{i}:",
-        "degree": "Polynomial degree? (e.g., 2): ",
+        "degree": "Polynomial degree? (e.g., 2, or auto): ",
         "curves": "How many curves on the same plot? (1/2): ",
         "x_col": "X-axis column (e.g., A): ",
         "y1_col": "Y column for curve 1 (e.g., B): ",
         "y2_col": "Y column for curve 2 (e.g., C): ",
         "bad_int": "❌ Please enter a valid number.",
-        "bad_degree": "❌ Degree must be at least 1.",
+        "bad_degree": "❌ Degree must be at least 1 (or auto).",
         "bad_curves": "❌ Please type only 1 or 2.",
         "bad_n": "❌ Number of plots must be >= 1.",
         "no_numeric_50": "No numeric data found in the first 50 rows.",
         "no_numeric_cols": "No numeric data found in the selected columns.",
         "insufficient_points": "Not enough points for polynomial fit: {n} points, need at least {need}.",
         "insufficient_unique_x": "X values are not diverse enough for the polynomial degree (unique X: {u}).",
-        "done": "✅ Plots generated: {k} PNG files -> assets/plots/",
-        "warn_exists": "ℹ️ Cleaned assets/plots folder (old plots deleted).",
+        "done": "✅ Plots generated: {k} files -> assets/plots/",
+        "unchanged": "ℹ️ {k} unchanged plots were not re-rendered.",
+        "stale_removed": "ℹ️ Removed {k} plot files that are no longer used.",
         "meta_written": "✅ plots_meta.json written.",
         "file_not_found": "❌ File not found: {p}",
         "slope_label": "Slope",
@@ -97,105 +115,580 @@ def col_letter_to_index(col: str) -> int:
     return n - 1
 
 
-def prepare_plots_folder() -> str:
-    plots_dir = os.path.join("assets", "plots")
-    if os.path.exists(plots_dir):
-        shutil.rmtree(plots_dir)
-        os.makedirs(plots_dir, exist_ok=True)
-        return plots_dir
+def prepare_plots_folder(base_dir: str = os.curdir) -> str:
+    """assets/plots klasörünü oluşturur; eski grafikler silinmez (bkz. remove_stale_plots)."""
+    plots_dir = os.path.join(base_dir, "assets", "plots")
     os.makedirs(plots_dir, exist_ok=True)
     return plots_dir
 
 
-def _first_numeric_row(df: pd.DataFrame, col_indices: list[int], max_rows: int = 50) -> int | None:
-    scan = min(max_rows, len(df))
-    for r in range(scan):
-        ok = True
-        for c in col_indices:
-            if c >= df.shape[1]:
-                ok = False
-                break
-            v = df.iat[r, c]
-            if v is None or (isinstance(v, str) and v.strip() == ""):
-                ok = False
-                break
-            try:
-                f = float(v)
-                if np.isnan(f):
-                    ok = False
-                    break
-            except Exception:
-                ok = False
-                break
-        if ok:
-            return r
-    return None
+# ================== Grafik önbelleği ==================
+# plots_meta.json her grafiğin anahtarını ("hash") tutar: çıkarılmış veri, derece, etiketler,
+# dil ve çizim ayarları. Anahtarı aynı kalan ve dosyası duran grafik yeniden çizilmez.
+# Çizimi etkileyen bir ayar değişirse PLOT_STYLE_VERSION artırılmalı.
+PLOT_DPI = 200
+PLOT_STYLE_VERSION = 1
+_PLOT_FILE_RE = re.compile(r"plot\d+\.(png|pdf)")
 
+# Çıktı biçimi -> uzantı.
+#   png        : PLOT_DPI'da PNG (varsayılan)
+#   png-opt    : aynı görüntü 256 renge indirilmiş, optimize edilmiş PNG (çok daha küçük)
+#   pdf        : tamamen vektör PDF (doğru/fit grafikleri için küçük ve keskin)
+#   pdf-raster : vektör PDF, yalnızca nokta/yoğunluk katmanı PLOT_DPI'da resim (büyük veriler)
+PLOT_FORMATS = {"png": "png", "png-opt": "png", "pdf": "pdf", "pdf-raster": "pdf"}
 
-def _safe_str(v) -> str:
-    return "" if v is None else str(v).strip()
 
+@lru_cache(maxsize=1)
+def _matplotlib_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
 
-def read_multi_columns_with_headers(excel_path: str, x_col: str, y_cols: list[str], max_scan_rows: int = 50, msg=None):
-    df = pd.read_excel(excel_path, header=None, engine="openpyxl")
+    try:
+        return version("matplotlib")
+    except PackageNotFoundError:
+        return ""
 
-    x_idx = col_letter_to_index(x_col)
-    y_idx_list = [col_letter_to_index(c) for c in y_cols]
-    needed = [x_idx] + y_idx_list
 
-    start_row = _first_numeric_row(df, needed, max_rows=max_scan_rows)
-    if start_row is None:
-        raise ValueError(msg["no_numeric_50"] if msg else "No numeric data found in first 50 rows.")
+def plot_cache_key(xs, ys_list, degree, xlabel: str, ylabels: list[str], lang: str,
+                   render: str = "all", ylabel: str | None = None, fmt: str = "png") -> str:
+    import numpy as np
+
+    h = hashlib.sha256()
+    h.update(json.dumps([PLOT_STYLE_VERSION, PLOT_DPI, _matplotlib_version(), degree, xlabel, ylabels, lang,
+                         render, ylabel, fmt, len(ys_list)], ensure_ascii=False).encode("utf-8"))
+    for values in [xs, *ys_list]:
+        arr = np.ascontiguousarray(values, dtype=float)
+        h.update(len(arr).to_bytes(8, "little"))
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
 
-    header_row = start_row - 1
+def load_plot_entries(plots_dir: str) -> dict[str, dict]:
+    """Önceki plots_meta.json'dan anahtarlı kayıtlar: dosya -> kayıt (yoksa/bozuksa boş)."""
+    try:
+        with open(os.path.join(plots_dir, "plots_meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return {p["file"]: p for p in meta.get("plots", []) if p.get("hash")}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return {}
 
-    xlabel = _safe_str(df.iat[header_row, x_idx]) if header_row >= 0 and x_idx < df.shape[1] else x_col
-    ylabels = []
-    for c, idx in zip(y_cols, y_idx_list):
-        lab = _safe_str(df.iat[header_row, idx]) if header_row >= 0 and idx < df.shape[1] else c
-        ylabels.append(lab)
 
-    xs = []
-    ys_list = [[] for _ in y_idx_list]
+def remove_stale_plots(plots_dir: str, keep: set[str], previous=()) -> int:
+    """
+    Bu çalıştırmada üretilmeyen plotN dosyalarını ve önceki meta'daki (previous) adlı çıktıları
+    siler; kullanıcı dosyalarına dokunulmaz.
+    """
+    previous = {f for f in previous if os.path.basename(f) == f}
+    removed = 0
+    for name in os.listdir(plots_dir):
+        if (_PLOT_FILE_RE.fullmatch(name) or name in previous) and name not in keep:
+            os.remove(os.path.join(plots_dir, name))
+            removed += 1
+    return removed
+
+
+# Veri bloğunun sonu: seçili sütunların hepsi art arda MAX_EMPTY satır boşsa okuma biter.
+MAX_EMPTY = 3
+
+
+class ProjectedSheet:
+    """
+    Çalışma kitabının bir sayfasından (varsayılan: ilk) yalnızca istenen sütunlar (openpyxl read_only).
+    Satırlar istendikçe akıtılır ve saklanır: her satır bir kez ayrıştırılır, okuma en uzak
+    istenen satırda durur. Hücreler ham değerdir (boş: None); sayıya çevirme _coerce_floats'ta.
+    """
+
+    def __init__(self, excel_path: str, col_indices, sheet: str | None = None):
+        import openpyxl
+
+        self.cols = sorted(set(col_indices))
+        self._pos = {c: i for i, c in enumerate(self.cols)}
+        self._wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True, keep_links=False)
+        if sheet is None:
+            ws = self._wb.worksheets[0]
+        elif sheet in self._wb.sheetnames:
+            ws = self._wb[sheet]
+        else:
+            self._wb.close()
+            raise ValueError(f"Sheet {sheet!r} not found in {os.path.basename(excel_path)} "
+                             f"(sheets: {', '.join(self._wb.sheetnames)}).")
+        ws.reset_dimensions()  # bazı araçlar yanlış <dimension> yazar; pandas da sıfırlar
+        lo, hi = self.cols[0], self.cols[-1]
+        take = [c - lo for c in self.cols]
+        # aralık tam doluysa satır olduğu gibi saklanır; değilse istenen sütunlar seçilir
+        if take == list(range(hi - lo + 1)):
+            self._project = None
+        elif len(take) == 1:
+            self._project = lambda vals, i=take[0]: (vals[i],)
+        else:
+            self._project = itemgetter(*take)
+        self._rows_iter = ws.iter_rows(min_col=lo + 1, max_col=hi + 1, values_only=True)
+        self.rows: list[tuple] = []
+
+    def covers(self, col_indices) -> bool:
+        return all(c in self._pos for c in col_indices)
+
+    def _fill(self, n: int):
+        if len(self.rows) >= n or self._rows_iter is None:
+            return
+        rows = islice(self._rows_iter, n - len(self.rows))
+        before = len(self.rows)
+        self.rows.extend(rows if self._project is None else map(self._project, rows))
+        if len(self.rows) - before < n - before:
+            self.close()
+
+    def row(self, r: int) -> tuple | None:
+        """r. satır (0 tabanlı, self.cols sırasıyla) veya sayfa bittiyse None."""
+        if r >= len(self.rows):
+            self._fill(r + 1)
+        return self.rows[r] if r < len(self.rows) else None
+
+    def block(self, r0: int, r1: int) -> list[tuple]:
+        """[r0, r1) satırları (sayfa önce biterse daha az)."""
+        self._fill(r1)
+        return self.rows[r0:r1]
+
+    def values(self, r0: int, r1: int, pos: list[int]) -> "np.ndarray":
+        """[r0, r1) satırlarının pos sütunları, _to_float değerleriyle."""
+        return _numeric_matrix(self.block(r0, r1), pos)
+
+    def column_positions(self, col_indices) -> list[int]:
+        return [self._pos[c] for c in col_indices]
+
+    def close(self):
+        if self._rows_iter is not None:
+            self._rows_iter = None
+            self._wb.close()
+
+
+# ================== CSV / ikili girdiler ==================
+# Excel dışında: CSV (parça parça, yalnızca seçili sütunlar) ve NumPy .npy / ham ikili sütunlar
+# (bellek eşlemeli; yalnızca okunan satırlar diskten gelir). Hepsi ProjectedSheet arayüzünü
+# (covers, row, values, column_positions, close) sağlar; başlık/boş satır kuralları aynıdır.
+# Sütunlar yine harfle seçilir: A ilk sütun (ikili dosyada ilk alan/sütun).
+CSV_EXTS = (".csv", ".tsv", ".txt")
+RAW_EXTS = (".bin", ".raw", ".dat")
+CSV_HEAD_ROWS = 64          # ham (metin) saklanan ilk satırlar: başlık hücresi bunlardan okunur
+CSV_CHUNK_ROWS = 1 << 16
+
+
+def _sniff_delimiter(path: str) -> str:
+    import csv
+
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        sample = f.read(1 << 16)
+    if "\n" in sample:
+        sample = sample[:sample.rindex("\n")]
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        return ","
+
+
+class CsvSheet:
+    """
+    CSV dosyasından yalnızca istenen sütunlar, istendikçe ve parça parça. İlk CSV_HEAD_ROWS satır
+    csv modülüyle ham okunur (başlık etiketi); gerisi pandas'ın C ayrıştırıcısıyla (usecols,
+    chunksize) doğrudan float'a çevrilir. Düzensiz satırlar (sütun sayısı değişen başlık blokları
+    vb.) yüzünden pandas okuyamazsa kalan satırlar csv modülüyle okunur.
+    Saklanan yalnızca seçili sütunların float64 değerleridir; hücre kuralları Excel'deki gibi
+    (_coerce_floats: boş/metin NaN; kısa ve boş satırlarda eksik hücreler boş).
+    delimiter verilmezse .tsv için sekme, diğerlerinde dosyanın başından tahmin edilir.
+    decimal="," ondalık virgüllü dosyalar içindir (örn. "1,5;2,25").
+    """
+
+    def __init__(self, path: str, col_indices, delimiter: str | None = None, decimal: str = "."):
+        import csv
+        import numpy as np
+
+        self.path = path
+        self.cols = sorted(set(col_indices))
+        self._pos = {c: i for i, c in enumerate(self.cols)}
+        if delimiter is None:
+            delimiter = "\t" if path.lower().endswith(".tsv") else _sniff_delimiter(path)
+        self.delimiter = delimiter
+        self.decimal = decimal
+
+        self._data = np.empty((0, len(self.cols)))
+        self._n = 0
+        self._f = open(path, "r", encoding="utf-8-sig", errors="replace", newline="")
+        # readline ile: csv okuyucusu ileriyi tamponlamaz, pandas tam kalınan yerden devam eder
+        reader = csv.reader(iter(self._f.readline, ""), delimiter=delimiter)
+        self._head = [self._project(r) for r in islice(reader, CSV_HEAD_ROWS)]
+        self._append(self._text_floats(self._head))
+        self._chunks = self._body() if len(self._head) == CSV_HEAD_ROWS else None
+        if self._chunks is None:
+            self.close()
+
+    def _project(self, fields: list[str]) -> tuple:
+        return tuple(fields[c] if c < len(fields) else None for c in self.cols)
+
+    def _text_floats(self, rows: list[tuple]) -> "np.ndarray":
+        if self.decimal != "." and rows:
+            rows = [tuple(v.replace(self.decimal, ".") if isinstance(v, str) else v for v in r) for r in rows]
+        return _numeric_matrix(rows, list(range(len(rows[0]) if rows else len(self.cols))))
+
+    def _frame_floats(self, df) -> "np.ndarray":
+        import numpy as np
+
+        out = np.empty((len(df), len(self.cols)))
+        for j, c in enumerate(self.cols):
+            s = df[c]
+            if s.dtype.kind in "fiu":
+                out[:, j] = s.to_numpy(dtype=float)
+            elif s.dtype.kind == "b":
+                out[:, j] = np.nan      # true/false metni; csv modülü yolunda da NaN
+            else:
+                out[:, j] = self._text_floats([(v,) for v in s.to_numpy(dtype=object)])[:, 0]
+        return out
+
+    def _body(self):
+        """CSV_HEAD_ROWS'tan sonraki satırlar, CSV_CHUNK_ROWS'luk float parçalar halinde."""
+        import csv
+        import pandas as pd
 
-    def to_float(v):
         try:
-            return float(v)
-        except Exception:
-            return np.nan
+            for df in pd.read_csv(self._f, header=None, sep=self.delimiter, usecols=self.cols,
+                                  decimal=self.decimal, skip_blank_lines=False, chunksize=CSV_CHUNK_ROWS,
+                                  float_precision="round_trip"):    # float() ile aynı değerler
+                if not set(self.cols).issubset(df.columns):
+                    break       # ilk satır kısaysa pandas sütun sayısını ondan alır
+                yield self._frame_floats(df)
+            else:
+                return
+        except ValueError:      # ParserError dahil: usecols dışında kalan kısa satırlar vb.
+            pass
+
+        # kalan satırlar csv modülüyle: okunmuş self._n satır atlanır
+        self._f.close()
+        self._f = open(self.path, "r", encoding="utf-8-sig", errors="replace", newline="")
+        reader = csv.reader(self._f, delimiter=self.delimiter)
+        for _ in islice(reader, self._n):
+            pass
+        while True:
+            rows = [self._project(r) for r in islice(reader, CSV_CHUNK_ROWS)]
+            if not rows:
+                return
+            yield self._text_floats(rows)
+
+    def _append(self, vals):
+        import numpy as np
+
+        end = self._n + len(vals)
+        if end > len(self._data):
+            grown = np.empty((max(end, 2 * len(self._data)), len(self.cols)))
+            grown[:self._n] = self._data[:self._n]
+            self._data = grown
+        self._data[self._n:end] = vals
+        self._n = end
+
+    def _fill(self, n: int):
+        while self._n < n and self._chunks is not None:
+            vals = next(self._chunks, None)
+            if vals is None:
+                self.close()
+            else:
+                self._append(vals)
+
+    def covers(self, col_indices) -> bool:
+        return all(c in self._pos for c in col_indices)
+
+    def row(self, r: int) -> tuple | None:
+        """r. satır: ilk CSV_HEAD_ROWS satırda ham metin (boş alan ""), sonrasında float."""
+        if r < len(self._head):
+            return self._head[r]
+        self._fill(r + 1)
+        return tuple(self._data[r].tolist()) if r < self._n else None
+
+    def values(self, r0: int, r1: int, pos: list[int]) -> "np.ndarray":
+        self._fill(r1)
+        return self._data[r0:min(r1, self._n)][:, pos]
+
+    def column_positions(self, col_indices) -> list[int]:
+        return [self._pos[c] for c in col_indices]
+
+    def close(self):
+        self._chunks = None
+        if not self._f.closed:
+            self._f.close()
+
+
+class MemmapSheet:
+    """
+    NumPy .npy (np.load mmap_mode="r") veya ham ikili dosya (np.memmap; dtype ve sütun sayısı
+    ncols verilir, satır sırasıyla yazılmış C düzeni) üzerinde aynı arayüz. Dosya belleğe
+    alınmaz: values yalnızca istenen satır aralığı ve sütunları float'a kopyalar.
+    1 boyutlu dizi tek sütundur; alanlı (structured) .npy'de her alan bir sütundur.
+    Dosyada olmayan sütunlar boştur (NaN). Başlık satırı yoktur; NaN satırlar boş satırdır.
+    """
 
-    empty_streak = 0
-    MAX_EMPTY = 3
+    def __init__(self, path: str, col_indices, dtype: str | None = None, ncols: int | None = None):
+        import numpy as np
 
-    r = start_row
-    while r < len(df):
-        vals = []
-        for idx in needed:
-            v = df.iat[r, idx] if idx < df.shape[1] else None
-            vals.append(to_float(v))
+        self.cols = sorted(set(col_indices))
+        self._pos = {c: i for i, c in enumerate(self.cols)}
+        if path.lower().endswith(".npy"):
+            if dtype is not None or ncols is not None:
+                raise ValueError(f"{os.path.basename(path)}: 'dtype'/'ncols' are read from the .npy header.")
+            arr = np.load(path, mmap_mode="r")
+        else:
+            if dtype is None:
+                raise ValueError(f"{os.path.basename(path)}: raw binary input needs 'dtype' (e.g. \"float32\").")
+            ncols = ncols or 1
+            arr = np.memmap(path, dtype=np.dtype(dtype), mode="r")
+            if arr.size % ncols:
+                raise ValueError(f"{os.path.basename(path)}: {arr.size} values do not fill {ncols} columns.")
+            arr = arr.reshape(-1, ncols)
+
+        if arr.dtype.names:
+            if arr.ndim != 1:
+                raise ValueError(f"{os.path.basename(path)}: structured arrays must be 1-D.")
+            self._columns = [arr[name] for name in arr.dtype.names]
+        elif arr.ndim == 1:
+            self._columns = [arr]
+        elif arr.ndim == 2:
+            self._columns = [arr[:, j] for j in range(arr.shape[1])]
+        else:
+            raise ValueError(f"{os.path.basename(path)}: expected a 1-D or 2-D array, got {arr.ndim}-D.")
+        self._n = len(arr)
 
-        all_empty = all(not np.isfinite(v) for v in vals)
+    def covers(self, col_indices) -> bool:
+        return all(c in self._pos for c in col_indices)
+
+    def row(self, r: int) -> tuple | None:
+        if r >= self._n:
+            return None
+        return tuple(self.values(r, r + 1, list(range(len(self.cols))))[0].tolist())
+
+    def values(self, r0: int, r1: int, pos: list[int]) -> "np.ndarray":
+        import numpy as np
+
+        r0, r1 = min(r0, self._n), min(r1, self._n)
+        out = np.full((r1 - r0, len(pos)), np.nan)
+        for j, p in enumerate(pos):
+            c = self.cols[p]
+            if c < len(self._columns):
+                out[:, j] = self._columns[c][r0:r1]
+        return out
+
+    def column_positions(self, col_indices) -> list[int]:
+        return [self._pos[c] for c in col_indices]
+
+    def close(self):
+        self._columns = []      # eşlemeler son başvuruyla kapanır
 
-        if all_empty:
-            empty_streak += 1
-            if empty_streak >= MAX_EMPTY:
-                break
-            r += 1
-            continue
 
-        empty_streak = 0
+def open_table(path: str, col_indices, sheet: str | None = None, **opts):
+    """
+    Uzantıya göre okuyucu: .csv/.tsv/.txt -> CsvSheet (delimiter, decimal), .npy ve
+    .bin/.raw/.dat (ya da dtype verilmişse) -> MemmapSheet (dtype, ncols), diğerleri -> ProjectedSheet.
+    Dosya türüne uymayan seçenek hatadır.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in CSV_EXTS:
+        kind, allowed = CsvSheet, {"delimiter", "decimal"}
+    elif ext == ".npy" or ext in RAW_EXTS or opts.get("dtype") is not None:
+        kind, allowed = MemmapSheet, {"dtype", "ncols"}
+    else:
+        kind, allowed = ProjectedSheet, set()
+    bad = sorted(k for k, v in opts.items() if v is not None and k not in allowed)
+    if sheet is not None and kind is not ProjectedSheet:
+        bad.insert(0, "sheet")
+    if bad:
+        raise ValueError(f"{os.path.basename(path)}: option(s) not valid for this file type: {', '.join(bad)}")
+    opts = {k: v for k, v in opts.items() if v is not None}
+    if kind is ProjectedSheet:
+        return ProjectedSheet(path, col_indices, sheet)
+    return kind(path, col_indices, **opts)
+
+
+class WorkbookCache:
+    """
+    Bir çalıştırma (generate_plots) boyunca her girdi dosyası bir kez okunur;
+    aynı dosyayı kullanan tüm PlotSpec'ler (ortak X sütunları dahil) buradan beslenir.
+    Yalnızca want() ile bildirilen sütunların birleşimi okunur (sayfa genişliği önemsizdir).
+    Anahtar mutlak yol + sayfa + okuma seçenekleri (open_table) + (mtime, boyut): dosya çalıştırma
+    sırasında değişirse yeniden okunur. sheet=None ilk sayfadır.
+    """
+
+    def __init__(self):
+        self._wanted: dict[tuple, set[int]] = {}
+        self._sheets: dict[tuple, ProjectedSheet] = {}
+
+    @staticmethod
+    def _source(excel_path: str, sheet: str | None, opts: dict) -> tuple:
+        return (os.path.abspath(excel_path), sheet,
+                tuple(sorted((k, v) for k, v in opts.items() if v is not None)))
+
+    def want(self, excel_path: str, col_indices, sheet: str | None = None, **opts):
+        self._wanted.setdefault(self._source(excel_path, sheet, opts), set()).update(col_indices)
+
+    def sheet(self, excel_path: str, col_indices, sheet: str | None = None, **opts) -> ProjectedSheet:
+        source = self._source(excel_path, sheet, opts)
+        st = os.stat(source[0])
+        key = (*source, st.st_mtime_ns, st.st_size)
+        sh = self._sheets.get(key)
+        if sh is None or not sh.covers(col_indices):
+            self.want(excel_path, col_indices, sheet, **opts)
+            for k in [k for k in self._sheets if k[:3] == source]:
+                self._sheets.pop(k).close()     # eski sürüm / dar sütun kümesi
+            sh = self._sheets[key] = open_table(source[0], self._wanted[source], sheet, **opts)
+        return sh
+
+    def close(self):
+        for sh in self._sheets.values():
+            sh.close()
+        self._sheets.clear()
+
+
+def _to_float(v) -> float:
+    try:
+        return float(v)
+    except Exception:
+        return float("nan")
+
 
-        if any(not np.isfinite(v) for v in vals):
+_PLAIN_NUMBER_TYPES = (float, int, type(None))
+
+
+def _coerce_floats(values) -> "np.ndarray":
+    """
+    Her hücre için _to_float(v) (float() olmuyorsa NaN), sütun toplu olarak çevrilir:
+    pd.to_numeric(errors="coerce") sayı/boş hücreleri C'de çevirir; float() ile farklı
+    yorumlanabilecek hücreler (metin, bool, tarih) ayrıca _to_float'tan geçer.
+    """
+    import numpy as np
+    import pandas as pd
+
+    col = np.empty(len(values), dtype=object)
+    col[:] = values
+    out = np.asarray(pd.to_numeric(col, errors="coerce"), dtype=float)
+    odd = np.flatnonzero([type(v) not in _PLAIN_NUMBER_TYPES for v in values])
+    for i in odd:
+        out[i] = _to_float(values[i])
+    return out
+
+
+def _numeric_matrix(rows: list[tuple], pos: list[int]) -> "np.ndarray":
+    """Satırlar x seçili sütunlar, _to_float değerleriyle (n x len(pos))."""
+    import numpy as np
+
+    if not rows:
+        return np.empty((0, len(pos)))
+    columns = list(zip(*rows))
+    return np.column_stack([_coerce_floats(columns[i]) for i in pos])
+
+
+def _first_numeric_row(sheet, col_indices: list[int], max_rows: int = 50) -> int | None:
+    """
+    İlk max_rows satırda seçili sütunların hepsinin sayı olduğu ilk satır.
+    Boş, boşluklu metin, sayıya çevrilemeyen ve NaN hücreler sayı değildir (inf sayıdır).
+    """
+    import numpy as np
+
+    vals = sheet.values(0, max_rows, sheet.column_positions(col_indices))
+    hits = np.flatnonzero(~np.isnan(vals).any(axis=1))
+    return int(hits[0]) if hits.size else None
+
+
+def _numeric_block(sheet, pos: list[int], start_row: int) -> "np.ndarray":
+    """
+    start_row'dan veri bloğunun satırları (n x len(pos)), parça parça ve toplu:
+    - seçili sütunların hiçbiri sonlu değilse satır boştur ve atlanır;
+      art arda MAX_EMPTY boş satırda blok biter,
+    - yalnızca bazıları sonluysa (geçersiz satır) blok o satırdan önce biter,
+    - sayfa biterse blok biter.
+    """
+    import numpy as np
+
+    parts = []
+    streak = 0          # önceki parçanın sonundaki boş satır sayısı
+    r = start_row
+    chunk = 256
+    while True:
+        vals = sheet.values(r, r + chunk, pos)
+        if not len(vals):
+            break
+        finite = np.isfinite(vals)
+        good = finite.all(axis=1)
+        empty = ~finite.any(axis=1)
+
+        # bitişte biten boş dizi uzunluğu: son dolu satırdan bu yana (parça başında önceki dizi sürer)
+        idx = np.arange(len(vals))
+        last_filled = np.maximum.accumulate(np.where(~empty, idx, -1))
+        run = np.where(last_filled < 0, idx + 1 + streak, idx - last_filled)
+        stops = np.flatnonzero((empty & (run >= MAX_EMPTY)) | (~good & ~empty))
+        stop = int(stops[0]) if stops.size else len(vals)
+
+        parts.append(vals[:stop][good[:stop]])
+        if stops.size:
             break
+        streak = int(run[-1]) if empty[-1] else 0
+        r += len(vals)
+        if len(vals) < chunk:
+            break
+        chunk = min(chunk * 2, 65536)
+
+    return np.concatenate(parts) if parts else np.empty((0, len(pos)))
+
 
-        xs.append(vals[0])
-        for j in range(len(y_idx_list)):
-            ys_list[j].append(vals[1 + j])
-        r += 1
+def _safe_str(v) -> str:
+    return "" if v is None else str(v).strip()
+
+
+def _header_label(v) -> str:
+    # boş başlık hücresi pd.read_excel ile NaN okunuyordu; etiket aynı kalsın ("nan")
+    # sayısal başlık hücresi yazıldığı gibi (31, True); pd.read_excel sütun tipine göre 31.0 / 1.0 yazıyordu
+    return _safe_str(float("nan") if v is None else v)
+
+
+def read_multi_columns_with_headers(excel_path: str, x_col: str, y_cols: list[str], max_scan_rows: int = 50, msg=None,
+                                    cache: WorkbookCache | None = None, sheet: str | None = None,
+                                    as_arrays: bool = False, **opts):
+    """
+    X ve Y sütunlarını başlıklarıyla okur: ilk max_scan_rows satırda seçili sütunların hepsinin
+    sayısal olduğu ilk satır verinin başı, bir üstü başlıktır. Veri, seçili sütunlar art arda
+    MAX_EMPTY satır boş kalınca ya da bir satırda yalnızca bazıları doluysa biter.
+    Yalnızca seçili sütunlar okunur ve okuma bitiş satırında durur; denetimler toplu (NumPy).
+    excel_path CSV/.npy/ikili de olabilir (open_table; opts: delimiter, decimal, dtype, ncols).
+    as_arrays=True: xs ve ys listeler yerine float dizileri (büyük veride Python nesnesi üretilmez).
+    """
+    x_idx = col_letter_to_index(x_col)
+    y_idx_list = [col_letter_to_index(c) for c in y_cols]
+    needed = [x_idx] + y_idx_list
 
-    if len(xs) == 0:
+    own_cache = cache is None
+    cache = cache or WorkbookCache()
+    try:
+        ws = cache.sheet(excel_path, needed, sheet, **opts)
+        pos = ws.column_positions(needed)
+
+        start_row = _first_numeric_row(ws, needed, max_rows=max_scan_rows)
+        if start_row is None:
+            raise ValueError(msg["no_numeric_50"] if msg else "No numeric data found in first 50 rows.")
+
+        header_row = start_row - 1
+        header = ws.row(header_row) if header_row >= 0 else None
+
+        xlabel = _header_label(header[pos[0]]) if header is not None else x_col
+        ylabels = []
+        for j, c in enumerate(y_cols):
+            lab = _header_label(header[pos[1 + j]]) if header is not None else c
+            ylabels.append(lab)
+
+        block = _numeric_block(ws, pos, start_row)
+    finally:
+        if own_cache:
+            cache.close()
+
+    if len(block) == 0:
         raise ValueError(msg["no_numeric_cols"] if msg else "No numeric data in selected columns.")
 
+    if as_arrays:
+        xs = block[:, 0].copy()
+        ys_list = [block[:, 1 + j].copy() for j in range(len(y_idx_list))]
+    else:
+        xs = block[:, 0].tolist()
+        ys_list = [block[:, 1 + j].tolist() for j in range(len(y_idx_list))]
     return xs, ys_list, xlabel, ylabels
 
 
@@ -224,46 +717,258 @@ def _legend_labels(ylabels: list[str], fallback_prefix: str = "Y"):
     cleaned = [_clean_label(x) for x in (ylabels or [])]
     # Eğer iki label aynıysa, legend yine gerekir mi?
     # Kullanıcı iki eğriyi ayırt etmek isteyecek -> aynıysa Curve 1/2 gibi ayır.
+    n = len(cleaned)
     nonempty = [x for x in cleaned if x]
     if not nonempty:
-        return [f"{fallback_prefix}1", f"{fallback_prefix}2"]
+        return [f"{fallback_prefix}{i}" for i in range(1, n + 1)]
     uniq = sorted(set(nonempty))
     if len(uniq) == 1:
         base = uniq[0]
-        return [f"{base} (1)", f"{base} (2)"]
-    # farklıysa direkt kullan
-    # (sayısı 2'den fazla olursa gene işler)
+        return [f"{base} ({i})" for i in range(1, n + 1)]
+    # farklıysa direkt kullan; 2'den fazla eğride tekrar eden etiketler sırayla numaralanır
     out = []
     for i, lab in enumerate(cleaned, start=1):
         out.append(lab if lab else f"{fallback_prefix}{i}")
+    counts = {lab: out.count(lab) for lab in out}
+    seen: dict[str, int] = {}
+    for i, lab in enumerate(out):
+        if counts[lab] > 1:
+            seen[lab] = seen.get(lab, 0) + 1
+            out[i] = f"{lab} ({seen[lab]})"
     return out
 
 
-def _slope_text_from_poly(coeffs: np.ndarray, x_eval: float, msg: dict) -> str:
+def _slope_text(fit: "CurveFit", x_eval: float, msg: dict) -> str:
     """
-    coeffs: np.polyfit sonucu (derece d)
     d=1 ise sabit eğim.
-    d>1 ise türev polinomunu alıp x_eval'de eğimi hesapla.
+    d>1 ise türev polinomunun x_eval'deki değeri.
     """
-    coeffs = np.asarray(coeffs, dtype=float)
-    deg = len(coeffs) - 1
-    if deg <= 0:
+    if fit.degree <= 0:
         return ""
-    if deg == 1:
-        m = coeffs[0]
+    m = float(fit.poly.deriv()(x_eval))
+    if fit.degree == 1:
         return f"{msg['slope_label']} = {m:.4g}"
-    # türev:
-    dcoeffs = np.polyder(coeffs)
-    m = np.polyval(dcoeffs, x_eval)
     return f"{msg['slope_label']}≈ {m:.4g} (x={x_eval:.4g})"
 
 
-def make_plot_png(xs, ys_list, degree: int, out_path: str,
-                 xlabel: str = "", ylabels: list[str] | None = None, msg=None, lang: str = "tr"):
+# ================== Polinom fit ==================
+# X, [min, max] -> [-1, 1] ölçeklenir ve Chebyshev tabanında QR ile çözülür: ham X üzerindeki
+# Vandermonde matrisinin (np.polyfit) yüksek derecede kötü koşullanması olmaz.
+# Aynı X'i (ve aynı boş satırları) paylaşan eğriler tek taban, tek QR, çok sağ taraf ile çözülür.
+# "auto" derece: en yüksek aday derecenin QR'ı tüm adayları verir (ilk d+1 sütun = derece d);
+# her eğri için BIC'i en küçük derece seçilir.
+AUTO_DEGREE = "auto"
+AUTO_MAX_DEGREE = 8
+
+
+@dataclass
+class CurveFit:
+    poly: "np.polynomial.Chebyshev"     # domain = [min X, max X]
+    degree: int
+    rss: float
+
+
+def _min_points(degree) -> int:
+    return 2 if degree == AUTO_DEGREE else degree + 1
+
+
+def fit_polynomials(x, ys: list, degree) -> list[CurveFit]:
+    """
+    x: ortak X (her y ile aynı uzunlukta), ys: Y dizileri; her eğri kendi sonlu (x, y) çiftleriyle
+    fit edilir. degree: int >= 1 veya AUTO_DEGREE. Nokta/benzersiz X sayısı çağıran tarafından
+    denetlenmiş olmalı.
+    """
+    import numpy as np
+
+    x = np.asarray(x, dtype=float)
+    masks = [np.isfinite(x) & np.isfinite(np.asarray(y, dtype=float)) for y in ys]
+    fits: list[CurveFit | None] = [None] * len(ys)
+    for i, mask in enumerate(masks):
+        if fits[i] is not None:
+            continue
+        group = [j for j in range(i, len(ys)) if fits[j] is None and np.array_equal(masks[j], mask)]
+        Y = np.column_stack([np.asarray(ys[j], dtype=float)[mask] for j in group])
+        for j, fit in zip(group, _fit_shared_x(x[mask], Y, degree)):
+            fits[j] = fit
+    return fits
+
+
+def _fit_shared_x(x, Y, degree) -> list[CurveFit]:
+    import numpy as np
+    from numpy.polynomial import Chebyshev, chebyshev
+
+    n = len(x)
+    lo, hi = float(np.min(x)), float(np.max(x))
+    if degree == AUTO_DEGREE:
+        top = min(AUTO_MAX_DEGREE, np.unique(x).size - 1, n - 1)
+    else:
+        top = degree
+    t = (2.0 * x - (lo + hi)) / (hi - lo)
+    Q, R = np.linalg.qr(chebyshev.chebvander(t, top))
+    B = Q.T @ Y                                         # (top+1, eğri)
+    rss_top = np.sum((Y - Q @ B) ** 2, axis=0)
+    # derece d'nin artığı: rss_top + atılan sütunların katkısı
+    tail = np.concatenate([np.cumsum((B ** 2)[::-1], axis=0)[::-1][1:], np.zeros((1, Y.shape[1]))])
+    rss_by_degree = rss_top + tail                      # satır d: derece d
+
+    out = []
+    for k in range(Y.shape[1]):
+        if degree == AUTO_DEGREE:
+            floor = 1e-300 + 1e-15 * float(np.sum(Y[:, k] ** 2))
+            ds = np.arange(1, top + 1)
+            bic = n * np.log(np.maximum(rss_by_degree[ds, k], floor) / n) + (ds + 1) * np.log(n)
+            d = int(ds[np.argmin(bic)])
+        else:
+            d = top
+        coef = np.linalg.solve(R[:d + 1, :d + 1], B[:d + 1, k])
+        out.append(CurveFit(Chebyshev(coef, domain=[lo, hi]), d, float(rss_by_degree[d, k])))
+    return out
+
+
+def _as_array(values) -> "np.ndarray":
+    import numpy as np
+
+    return np.asarray(values, dtype=float)
+
+
+# ================== Büyük veri çizimi ==================
+# Fit her zaman tüm veriyle yapılır; yalnızca çizilen noktalar azaltılır.
+#   all     : her nokta (varsayılan)
+#   minmax  : x ekseninin her piksel sütununda en küçük ve en büyük y'li nokta
+#   lttb    : Largest-Triangle-Three-Buckets ile piksel sütunu başına ~2 nokta
+#   density : noktalar yerine yoğunluk görüntüsü (log ölçekli, eğri rengiyle)
+# minmax/lttb sinyalin zarfını/şeklini korur (zaman serileri); gürültülü bulutlar için density.
+# minmax/lttb, nokta sayısı çıktı çözünürlüğünden azsa hiçbir şey atmaz.
+RENDER_MODES = ("all", "minmax", "lttb", "density")
+DENSITY_CELL_PX = 3
+
+
+def _axes_pixels(fig, ax) -> tuple[int, int]:
+    """Eksen alanının PLOT_DPI'da kaç piksel (genişlik, yükseklik) tuttuğu."""
+    pos = ax.get_position()
+    w_in, h_in = fig.get_size_inches()
+    return max(1, int(pos.width * w_in * PLOT_DPI)), max(1, int(pos.height * h_in * PLOT_DPI))
+
+
+def _bin_index(x, n_bins: int) -> "np.ndarray":
+    import numpy as np
+
+    lo, hi = float(np.min(x)), float(np.max(x))
+    if hi <= lo:
+        return np.zeros(len(x), dtype=np.intp)
+    b = ((x - lo) * (n_bins / (hi - lo))).astype(np.intp)
+    return np.minimum(b, n_bins - 1, out=b)
+
+
+def decimate_minmax(x, y, n_bins: int) -> "np.ndarray":
+    """
+    x aralığını n_bins eşit sütuna böler; her sütunda en küçük ve en büyük y'li
+    noktanın (eşitlikte ilkinin) indeksleri, artan sırada. x sıralı olmak zorunda değil.
+    """
+    import numpy as np
+
+    b = _bin_index(x, n_bins)
+    lo = np.full(n_bins, np.inf)
+    hi = np.full(n_bins, -np.inf)
+    np.minimum.at(lo, b, y)
+    np.maximum.at(hi, b, y)
+    keep = np.zeros(len(x), dtype=bool)
+    for hit in (y == lo[b], y == hi[b]):
+        idx = np.flatnonzero(hit)
+        _, first = np.unique(b[idx], return_index=True)
+        keep[idx[first]] = True
+    return np.flatnonzero(keep)
+
+
+def decimate_lttb(x, y, n_out: int) -> "np.ndarray":
+    """
+    Largest-Triangle-Three-Buckets: ilk/son nokta + her kovadan, önceki seçilen nokta ve
+    sonraki kovanın ortalamasıyla en büyük üçgeni kuran nokta. Seçilen indeksler (x sırasıyla).
+    """
+    import numpy as np
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    order = None
+    if np.any(np.diff(x) < 0):
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)     # n_out-2 kova: [edges[i], edges[i+1])
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        s, e = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[s:e] - y[a]) - (x[a] - x[s:e]) * (cy - y[a]))
+        a = s + int(np.argmax(area))
+        out[i + 1] = a
+    return out if order is None else np.sort(order[out])
+
+
+def _draw_density(ax, x, y, color: str, px: tuple[int, int], **kwargs):
+    """Nokta yoğunluğunu DENSITY_CELL_PX'lik hücrelerle tek görüntü olarak çizer (boş hücre saydam)."""
+    import numpy as np
+    from matplotlib.colors import LinearSegmentedColormap, LogNorm, to_rgb
+
+    def _span(v):
+        lo, hi = float(np.min(v)), float(np.max(v))
+        return (lo - 0.5, hi + 0.5) if hi <= lo else (lo, hi)
+
+    bins = (max(1, px[0] // DENSITY_CELL_PX), max(1, px[1] // DENSITY_CELL_PX))
+    counts, xe, ye = np.histogram2d(x, y, bins=bins, range=(_span(x), _span(y)))
+    rgb = to_rgb(color)
+    cmap = LinearSegmentedColormap.from_list("density", [(*rgb, 0.25), (*rgb, 1.0)])
+    ax.imshow(np.ma.masked_equal(counts.T, 0), extent=(xe[0], xe[-1], ye[0], ye[-1]),
+              origin="lower", aspect="auto", interpolation="nearest",
+              cmap=cmap, norm=LogNorm(vmin=1, vmax=max(1.0, float(counts.max()))), **kwargs)
+
+
+def _save_figure(fig, out_path: str, fmt: str):
+    if fmt == "png":
+        fig.savefig(out_path, dpi=PLOT_DPI)
+    elif fmt == "png-opt":
+        import numpy as np
+        from PIL import Image
+
+        # savefig(dpi=...) ile aynı görüntü; PNG'ye bir kez, palet ile yazılır
+        fig.set_dpi(PLOT_DPI)
+        fig.canvas.draw()
+        rgb = np.asarray(fig.canvas.buffer_rgba())[..., :3]
+        img = Image.fromarray(rgb).quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+        img.save(out_path, optimize=True, dpi=(PLOT_DPI, PLOT_DPI))
+    else:
+        # CreationDate yazılmaz: aynı grafik aynı baytları üretir
+        fig.savefig(out_path, format="pdf", dpi=PLOT_DPI, metadata={"CreationDate": None})
+
+
+def make_plot_png(xs, ys_list, degree, out_path: str,
+                 xlabel: str = "", ylabels: list[str] | None = None, msg=None, lang: str = "tr",
+                 render: str = "all", ylabel: str | None = None, fmt: str = "png") -> list[int]:
+    """
+    Grafiği çizer ve her eğri için kullanılan fit derecesini döndürür (degree="auto" için seçilen).
+    ylabel verilmezse eksen etiketi ylabels'tan seçilir (_pick_ylabel).
+    fmt: PLOT_FORMATS'tan biri (adına rağmen PDF de yazar); uzantı çağıranın sorumluluğunda.
+    """
+    import numpy as np
+
+    if render not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode: {render!r} (use one of {', '.join(RENDER_MODES)}).")
+    if fmt not in PLOT_FORMATS:
+        raise ValueError(f"Unknown plot format: {fmt!r} (use one of {', '.join(PLOT_FORMATS)}).")
+    raster = {"rasterized": True} if fmt == "pdf-raster" else {}
     xs_arr = np.asarray(xs, dtype=float)
     ylabels = ylabels or [""] * len(ys_list)
 
-    plt.figure()
+    fig = _new_figure()
+    ax = fig.add_subplot()
+    px = _axes_pixels(fig, ax)
 
     # legend isimleri (2 eğri vs.)
     leg_labels = _legend_labels(ylabels) if len(ys_list) > 1 else [(_clean_label(ylabels[0]) or "Y")]
@@ -271,74 +976,115 @@ def make_plot_png(xs, ys_list, degree: int, out_path: str,
     # eğim yazıları üstte biriktirilecek
     slope_lines = []
 
-    for idx, ys in enumerate(ys_list):
-        ys_arr = np.asarray(ys, dtype=float)
-        mask = np.isfinite(xs_arr) & np.isfinite(ys_arr)
-        x = xs_arr[mask]
-        y = ys_arr[mask]
+    need = _min_points(degree)
+    ys_arrs = [np.asarray(ys, dtype=float) for ys in ys_list]
+    for ys_arr in ys_arrs:
+        x = xs_arr[np.isfinite(xs_arr) & np.isfinite(ys_arr)]
 
         if len(x) == 0:
             raise ValueError(msg["no_numeric_cols"] if msg else "No numeric data.")
 
-        if len(x) < degree + 1:
+        if len(x) < need:
             raise ValueError((msg["insufficient_points"] if msg else "Not enough points.")
-                             .format(n=len(x), need=degree + 1))
+                             .format(n=len(x), need=need))
 
         uniq = np.unique(x).size
-        if uniq < degree + 1:
+        if uniq < need:
             raise ValueError((msg["insufficient_unique_x"] if msg else "Not enough unique X.")
                              .format(u=uniq))
 
+    fits = fit_polynomials(xs_arr, ys_arrs, degree)
+
+    for idx, (ys_arr, fit) in enumerate(zip(ys_arrs, fits)):
+        mask = np.isfinite(xs_arr) & np.isfinite(ys_arr)
+        x = xs_arr[mask]
+        y = ys_arr[mask]
+
         xs_line = np.linspace(np.min(x), np.max(x), 400)
 
-        # scatter + fit
-        plt.scatter(x, y, label=f"{leg_labels[idx]} data" if len(ys_list) > 1 else None)
-        coeffs = np.polyfit(x, y, degree)
-        ys_fit = np.polyval(coeffs, xs_line)
-        plt.plot(xs_line, ys_fit, label=f"{leg_labels[idx]} fit" if len(ys_list) > 1 else None)
+        # scatter + fit (fit tüm veriyle; çizim render moduna göre)
+        data_label = f"{leg_labels[idx]} data" if len(ys_list) > 1 else None
+        fit_kwargs = {}
+        if render == "density":
+            # imshow renk döngülerini ilerletmez; "all" modundaki renkler (CN) açıkça verilir
+            _draw_density(ax, x, y, f"C{idx}", px, **raster)
+            ax.scatter([], [], color=f"C{idx}", label=data_label)
+            fit_kwargs["color"] = f"C{idx}"
+        else:
+            keep = None
+            if render == "minmax" and len(x) > 2 * px[0]:
+                keep = decimate_minmax(x, y, px[0])
+            elif render == "lttb" and len(x) > 2 * px[0]:
+                keep = decimate_lttb(x, y, 2 * px[0])
+            ax.scatter(x if keep is None else x[keep], y if keep is None else y[keep], label=data_label, **raster)
+        ys_fit = fit.poly(xs_line)
+        ax.plot(xs_line, ys_fit, label=f"{leg_labels[idx]} fit" if len(ys_list) > 1 else None, **fit_kwargs)
 
         # eğim hesapla (x ortasında)
         x_mid = float(np.mean([np.min(x), np.max(x)]))
         st = ""
-        if degree == 1:
-            st = _slope_text_from_poly(coeffs, x_mid, msg or {"slope_label": "Slope"})
+        if fit.degree == 1:
+            st = _slope_text(fit, x_mid, msg or {"slope_label": "Slope"})
         if st:
             # legend label ile birlikte yazalım ki hangi eğri belli olsun
             prefix = leg_labels[idx]
             slope_lines.append(f"{prefix}: {st}")
 
     # Eksensel etiketler
-    plt.xlabel(xlabel if xlabel else "X")
+    ax.set_xlabel(xlabel if xlabel else "X")
 
-    ylabel_final = _pick_ylabel(ylabels)
-    plt.ylabel(ylabel_final)
+    ylabel_final = ylabel or _pick_ylabel(ylabels)
+    ax.set_ylabel(ylabel_final)
 
-    # Legend: 2 eğri varsa göster (fit & data karmaşık olmasın diye sadece fitleri göstermek istersen sadeleştiririz)
+    # Legend: birden çok eğri varsa göster (fit & data karmaşık olmasın diye sadece fitleri göstermek istersen sadeleştiririz)
     if len(ys_list) > 1:
-        plt.legend()
+        ax.legend()
 
     # Eğimleri grafik üstünde göster (sol üst, data kapatmasın diye eksen koordinatıyla)
-    if degree == 1 and slope_lines:
+    if slope_lines:
         txt = "\n".join(slope_lines)
-        plt.gca().text(
+        ax.text(
             0.02, 0.98, txt,
-            transform=plt.gca().transAxes,
+            transform=ax.transAxes,
             va="top", ha="left",
             bbox=dict(boxstyle="round", alpha=0.2)  # renk belirtmiyorum
         )
 
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=200)
-    plt.close()
+    fig.tight_layout()
+    _save_figure(fig, out_path, fmt)
+    return [fit.degree for fit in fits]
 
 
 # ================== User Input ==================
 @dataclass
 class PlotSpec:
-    degree: int
+    degree: int | str       # >= 1 veya AUTO_DEGREE
     curves: int
     x: str
     y: list[str]
+    render: str = "all"     # RENDER_MODES'tan biri
+    format: str = "png"     # PLOT_FORMATS'tan biri
+    # spec dosyası alanları (None: varsayılan davranış)
+    name: str | None = None             # çıktı adı (uzantısız); yoksa plotN
+    workbook: str | None = None         # generate_plots'un excel_path'i yerine
+    sheet: str | None = None            # yoksa ilk sayfa
+    xlabel: str | None = None           # başlık hücresi yerine
+    ylabels: list[str] | None = None    # eğri (legend) adları
+    ylabel: str | None = None           # Y ekseni etiketi
+    # CSV / ikili girdi seçenekleri (bkz. open_table)
+    delimiter: str | None = None
+    decimal: str | None = None
+    dtype: str | None = None
+    ncols: int | None = None
+
+    def file_name(self, i: int) -> str:
+        """i. grafiğin (1 tabanlı) assets/plots altındaki dosya adı."""
+        return f"{self.name or f'plot{i}'}.{PLOT_FORMATS[self.format]}"
+
+    def read_opts(self) -> dict:
+        """Verilen okuma seçenekleri (WorkbookCache / read_multi_columns_with_headers için)."""
+        opts = dict(delimiter=self.delimiter, decimal=self.decimal, dtype=self.dtype, ncols=self.ncols)
+        return {k: v for k, v in opts.items() if v is not None}
 
 
 def ask_excel_path(lang: str, msg: dict) -> str:
@@ -365,8 +1111,8 @@ def ask_plot_specs(lang: str, msg: dict) -> list[PlotSpec]:
 
         while True:
             try:
-                degree = int(input(msg["degree"]).strip())
-                if degree < 1:
+                degree = _parse_degree(input(msg["degree"]))
+                if degree != AUTO_DEGREE and degree < 1:
                     print(msg["bad_degree"])
                     continue
                 break
@@ -395,57 +1141,327 @@ def ask_plot_specs(lang: str, msg: dict) -> list[PlotSpec]:
     return specs
 
 
-def main():
-    lang = ask_language()
-    msg = T(lang)
+def _parse_degree(value) -> int | str:
+    if isinstance(value, str) and value.strip().lower() == AUTO_DEGREE:
+        return AUTO_DEGREE
+    return int(str(value).strip())
 
-    excel_path = ask_excel_path(lang, msg)
-    if not os.path.exists(excel_path):
-        print(msg["file_not_found"].format(p=excel_path))
-        return
 
-    specs = ask_plot_specs(lang, msg)
+_PLOT_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+PLOT_READ_KEYS = {"delimiter", "decimal", "dtype", "ncols"}
+PLOT_ITEM_KEYS = {"degree", "x", "y", "render", "format", "name", "workbook", "sheet", "xlabel", "ylabels", "ylabel",
+                  *PLOT_READ_KEYS}
+
+
+def _check_read_opts(item: dict, i: int):
+    for key in ("delimiter", "decimal"):
+        v = item.get(key)
+        if v is not None and (not isinstance(v, str) or len(v) != 1):
+            raise ValueError(f"Plot {i}: {key!r} must be a single character.")
+    ncols = item.get("ncols")
+    if ncols is not None and (isinstance(ncols, bool) or not isinstance(ncols, int) or ncols < 1):
+        raise ValueError(f"Plot {i}: 'ncols' must be a positive integer.")
+    if item.get("dtype") is not None:
+        import numpy as np
+
+        try:
+            np.dtype(item["dtype"])
+        except TypeError:
+            raise ValueError(f"Plot {i}: unknown dtype {item['dtype']!r} (e.g. \"float32\", \"<f8\").") from None
+
+
+def plot_specs_from_dicts(items: list[dict]) -> list[PlotSpec]:
+    """
+    Etkileşimsiz kullanım (sunucu işleri, spec dosyaları) için:
+      [{"degree": 2, "x": "A", "y": ["B", "C"], "render": "minmax"}, ...] -> list[PlotSpec]
+    ("degree": "auto" -> derece her eğri için veriden seçilir)
+    İsteğe bağlı: format (PLOT_FORMATS), name, workbook, sheet, xlabel, ylabels (Y sayısı kadar), ylabel;
+    CSV için delimiter, decimal; ham ikili dosya için dtype, ncols (bkz. open_table).
+    ask_plot_specs ile aynı kurallar; Y sütunu sayısı serbesttir (en az 1).
+    """
+    specs: list[PlotSpec] = []
+    files: set[str] = set()
+    for i, item in enumerate(items, start=1):
+        unknown = set(item) - PLOT_ITEM_KEYS
+        if unknown:
+            raise ValueError(f"Plot {i}: unknown keys: {', '.join(sorted(unknown))}")
+        degree = _parse_degree(item["degree"])
+        if degree != AUTO_DEGREE and degree < 1:
+            raise ValueError("Degree must be at least 1.")
+        y = item["y"]
+        y_cols = [y] if isinstance(y, str) else list(y)
+        if not y_cols:
+            raise ValueError(f"Plot {i}: at least one Y column is required.")
+        render = item.get("render", "all")
+        if render not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode: {render!r} (use one of {', '.join(RENDER_MODES)}).")
+        fmt = item.get("format", "png")
+        if fmt not in PLOT_FORMATS:
+            raise ValueError(f"Unknown plot format: {fmt!r} (use one of {', '.join(PLOT_FORMATS)}).")
+        ylabels = item.get("ylabels")
+        if ylabels is not None and len(ylabels) != len(y_cols):
+            raise ValueError(f"Plot {i}: 'ylabels' needs one label per Y column ({len(y_cols)}).")
+        name = item.get("name")
+        if name is not None and (not _PLOT_NAME_RE.fullmatch(name) or name == "plots_meta"):
+            raise ValueError(f"Plot {i}: invalid output name {name!r} (letters, digits, '_', '-', '.').")
+        _check_read_opts(item, i)
+        spec = PlotSpec(
+            degree=degree,
+            curves=len(y_cols),
+            x=col_letter_ok(item["x"]),
+            y=[col_letter_ok(c) for c in y_cols],
+            render=render,
+            format=fmt,
+            name=name,
+            workbook=item.get("workbook"),
+            sheet=item.get("sheet"),
+            xlabel=item.get("xlabel"),
+            ylabels=[str(v) for v in ylabels] if ylabels is not None else None,
+            ylabel=item.get("ylabel"),
+            delimiter=item.get("delimiter"),
+            decimal=item.get("decimal"),
+            dtype=item.get("dtype"),
+            ncols=item.get("ncols"),
+        )
+        file_name = spec.file_name(i)
+        if file_name in files:
+            raise ValueError(f"Plot {i}: output {file_name} is used twice.")
+        files.add(file_name)
+        specs.append(spec)
+    return specs
+
 
-    plots_dir = prepare_plots_folder()
-    if os.path.isdir(plots_dir):
-        print(msg["warn_exists"])
+PLOT_JOB_KEYS = {"workbook", "excel", "sheet", "format", "lang", "out_dir", "jobs", "plots", *PLOT_READ_KEYS}
+
+
+def load_plot_job(path: str) -> dict:
+    """
+    JSON veya TOML grafik spec dosyası (sunucu/izleme iş dosyasıyla aynı biçim):
+      workbook = "data.xlsx"       # ("excel" de olur) grafikte workbook yoksa bu kullanılır; .csv/.npy/.bin da olur
+      sheet = "Run1"               # isteğe bağlı, grafiklerin varsayılanı
+      format = "pdf"               # isteğe bağlı, grafiklerin varsayılanı (PLOT_FORMATS)
+      lang = "en"                  # isteğe bağlı, varsayılan "tr"
+      out_dir = "."                # assets/plots bunun altına
+      jobs = 4                     # isteğe bağlı çizim süreç sayısı
+      delimiter / decimal / dtype / ncols   # isteğe bağlı, workbook'un okuma seçenekleri (open_table)
+      [[plots]]
+      name = "sicaklik"; degree = 2; x = "A"; y = ["B", "C", "D"]; ylabels = ["T1", "T2", "T3"]
+    Yollar dosyanın klasörüne göredir; dönen sözlükte mutlaktır ("excel", "out_dir", grafiklerin "workbook"u).
+    """
+    if path.lower().endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            job = tomllib.load(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            job = json.load(f)
+
+    if not isinstance(job, dict):
+        raise ValueError(f"Plot spec must be a table/object: {path}")
+    unknown = set(job) - PLOT_JOB_KEYS
+    if unknown:
+        raise ValueError(f"Unknown plot spec keys: {', '.join(sorted(unknown))}")
+    if job.get("lang", "tr") not in ("tr", "en"):
+        raise ValueError("'lang' must be 'tr' or 'en'")
+    plots = job.get("plots")
+    if not isinstance(plots, list) or not plots:
+        raise ValueError("'plots' must be a non-empty list")
+
+    base = os.path.dirname(os.path.abspath(path))
+    workbook = job.pop("workbook", None) or job.get("excel")
+    job["excel"] = os.path.join(base, workbook) if workbook else None
+    job["out_dir"] = os.path.join(base, job.get("out_dir") or ".")
+    default_sheet = job.pop("sheet", None)
+    default_format = job.pop("format", None)
+    default_read = {k: job.pop(k) for k in PLOT_READ_KEYS & set(job)}
+    items = []
+    for i, item in enumerate(plots, start=1):
+        if not isinstance(item, dict):
+            raise ValueError(f"Plot {i} must be a table/object")
+        item = dict(item)
+        if item.get("workbook"):
+            item["workbook"] = os.path.join(base, item["workbook"])
+        elif job["excel"] is None:
+            raise ValueError(f"Plot {i}: no workbook (set 'workbook' for the plot or the file)")
+        else:
+            for k, v in default_read.items():   # üst düzey okuma seçenekleri üst düzey dosyaya aittir
+                item.setdefault(k, v)
+        if default_sheet is not None:
+            item.setdefault("sheet", default_sheet)
+        if default_format is not None:
+            item.setdefault("format", default_format)
+        items.append(item)
+    job["plots"] = items
+    plot_specs_from_dicts(items)    # hatalar dosya okunurken çıksın
+    return job
+
+
+def _write_meta_subset(meta_path: str, old_entries: dict[str, dict], valid: set[str]):
+    """Yalnızca hâlâ geçerli (atlanan) grafiklerin kayıtlarını taşıyan ara meta."""
+    plots = [entry for f, entry in old_entries.items() if f in valid]
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"plots": plots}, f, ensure_ascii=False, indent=2)
+
+
+def generate_plots(excel_path: str | None, specs: list[PlotSpec], lang: str,
+                   base_dir: str = os.curdir, log=print, timer=None,
+                   cache: WorkbookCache | None = None, jobs: int = 1) -> dict:
+    """
+    specs'teki her grafiği base_dir/assets/plots/plotN.<png|pdf> (spec.name varsa <name>.<uzantı>) olarak
+    üretir, plots_meta.json yazar ve meta sözlüğünü döndürür. spec.workbook verilen grafikler
+    excel_path yerine o dosyadan (spec.sheet sayfasından) okunur.
+    timer (PaperX_report.PhaseTimer gibi .span(ad) sağlayan nesne) verilirse
+    "read", "render", "write" aşamaları ölçülür.
+    Her girdi (Excel, CSV, .npy/ikili) bu çalıştırmada bir kez ve yalnızca grafiklerin kullandığı sütunlar okunur
+    (cache verilmezse yeni WorkbookCache, çalıştırma sonunda kapatılır).
+    jobs > 1: okunan diziler süreç havuzunda çizilir (okuma sıralı sürer); dosyalar ve
+    plots_meta.json sırası jobs=1 ile aynıdır.
+    """
+    msg = T(lang)
+    own_cache = cache is None
+    cache = cache or WorkbookCache()
+    for spec in specs:
+        cache.want(spec.workbook or excel_path, [col_letter_to_index(c) for c in [spec.x] + spec.y], spec.sheet,
+                   **spec.read_opts())
+    span = timer.span if timer is not None else (lambda phase: nullcontext())
+
+    plots_dir = prepare_plots_folder(base_dir)
+    meta_path = os.path.join(plots_dir, "plots_meta.json")
+    old_entries = load_plot_entries(plots_dir)
+    dirty_meta = False      # eski meta henüz çizilmemiş grafikleri geçerli gösteriyor mu
+    unchanged = 0
 
     meta = {
         "created_at": datetime.now().isoformat(timespec="seconds"),
-        "excel": os.path.basename(excel_path),
+        "excel": os.path.basename(excel_path) if excel_path else None,
         "plots": []
     }
 
-    for i, spec in enumerate(specs, start=1):
-        rel = os.path.join("assets", "plots", f"plot{i}.png").replace("\\", "/")
-        abs_path = os.path.abspath(rel)
+    pool = None
+    if jobs > 1 and len(specs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(specs)))
+    renders = []
+    try:
+        for i, spec in enumerate(specs, start=1):
+            file_name = spec.file_name(i)
+            abs_path = os.path.abspath(os.path.join(plots_dir, file_name))
+
+            with span("read"):
+                xs, ys_list, xlabel, ylabels = read_multi_columns_with_headers(
+                    spec.workbook or excel_path, spec.x, spec.y, max_scan_rows=50, msg=msg, cache=cache,
+                    sheet=spec.sheet, as_arrays=True, **spec.read_opts(),
+                )
+            if spec.xlabel is not None:
+                xlabel = spec.xlabel
+            if spec.ylabels is not None:
+                ylabels = list(spec.ylabels)
+
+            key = plot_cache_key(xs, ys_list, spec.degree, xlabel, ylabels, lang, spec.render, spec.ylabel,
+                                 spec.format)
+            entry = {
+                "file": file_name,
+                "degree": spec.degree,
+                "x": spec.x,
+                "y": spec.y,
+                "xlabel": xlabel,
+                "ylabels": ylabels,
+                "ylabel_final": spec.ylabel or _pick_ylabel(ylabels),
+                "render": spec.render,
+                "format": spec.format,
+                "hash": key,
+            }
+            if spec.workbook:
+                entry["excel"] = os.path.basename(spec.workbook)
+            if spec.sheet:
+                entry["sheet"] = spec.sheet
+            meta["plots"].append(entry)
+            old = old_entries.get(file_name, {})
+            if old.get("hash") == key and os.path.exists(abs_path):
+                meta["plots"][-1]["fit_degree"] = old.get("fit_degree")
+                unchanged += 1
+                continue
 
-        xs, ys_list, xlabel, ylabels = read_multi_columns_with_headers(
-            excel_path, spec.x, spec.y, max_scan_rows=50, msg=msg
-        )
+            if not dirty_meta:
+                # çizim yarıda kalırsa bir sonraki çalıştırma bu dosyaları eski anahtarla atlamasın
+                if old_entries:
+                    with span("write"):
+                        _write_meta_subset(meta_path, old_entries, {p["file"] for p in meta["plots"][:-1]})
+                dirty_meta = True
+
+            render_kwargs = dict(xlabel=xlabel, ylabels=ylabels, msg=msg, lang=lang, render=spec.render,
+                                 ylabel=spec.ylabel, fmt=spec.format)
+            if pool is None:
+                with span("render"):
+                    meta["plots"][-1]["fit_degree"] = make_plot_png(xs, ys_list, spec.degree, abs_path,
+                                                                    **render_kwargs)
+            else:
+                # işçiye yalnızca çıkarılmış diziler gider; çizim okumayla örtüşür
+                renders.append((meta["plots"][-1], pool.submit(
+                    make_plot_png, _as_array(xs), [_as_array(y) for y in ys_list],
+                    spec.degree, abs_path, **render_kwargs)))
+
+        with span("render") if pool is not None else nullcontext():
+            for entry, fut in renders:
+                entry["fit_degree"] = fut.result()  # hata varsa ilk başarısız grafiğin (spec sırası) hatası
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if own_cache:
+            cache.close()
+
+    with span("write"):
+        removed = remove_stale_plots(plots_dir, {p["file"] for p in meta["plots"]}, old_entries)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+    log(msg["meta_written"])
+    if unchanged:
+        log(msg["unchanged"].format(k=unchanged))
+    if removed:
+        log(msg["stale_removed"].format(k=removed))
+
+    log(msg["done"].format(k=len(specs)))
+    return meta
+
+
+def run_plot_job(job: dict, log=print, timer=None, jobs: int | None = None) -> dict:
+    """load_plot_job sözlüğünü soru sormadan üretir (tek okuma önbelleği, paralel çizim)."""
+    specs = plot_specs_from_dicts(job["plots"])
+    lang = job.get("lang", "tr")
+    for path in dict.fromkeys(spec.workbook or job["excel"] for spec in specs):
+        if not os.path.exists(path):
+            raise FileNotFoundError(T(lang)["file_not_found"].format(p=path))
+    jobs = jobs or job.get("jobs") or os.cpu_count() or 1
+    return generate_plots(job["excel"], specs, lang, base_dir=job["out_dir"], log=log, timer=timer, jobs=jobs)
+
+
+def main(argv=None):
+    import argparse
+
+    p = argparse.ArgumentParser(description="Excel/CSV/.npy -> assets/plots/ (spec dosyası verilmezse sorarak)")
+    p.add_argument("spec", nargs="?", help="JSON/TOML plot spec file (see load_plot_job)")
+    p.add_argument("-j", "--jobs", type=int, help="render processes (default: spec 'jobs' or CPU count)")
+    args = p.parse_args(argv)
+    if args.spec:
+        try:
+            run_plot_job(load_plot_job(args.spec), jobs=args.jobs)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ {e}")
+            return 1
+        return 0
 
-        make_plot_png(
-            xs, ys_list, spec.degree, abs_path,
-            xlabel=xlabel, ylabels=ylabels, msg=msg, lang=lang
-        )
+    lang = ask_language()
+    msg = T(lang)
 
-        meta["plots"].append({
-            "file": f"plot{i}.png",
-            "degree": spec.degree,
-            "x": spec.x,
-            "y": spec.y,
-            "xlabel": xlabel,
-            "ylabels": ylabels,
-            "ylabel_final": _pick_ylabel(ylabels),
-        })
-
-    meta_path = os.path.join("assets", "plots", "plots_meta.json")
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, ensure_ascii=False, indent=2)
-    print(msg["meta_written"])
+    excel_path = ask_excel_path(lang, msg)
+    if not os.path.exists(excel_path):
+        print(msg["file_not_found"].format(p=excel_path))
+        return
 
-    print(msg["done"].format(k=len(specs)))
+    specs = ask_plot_specs(lang, msg)
+    generate_plots(excel_path, specs, lang, jobs=os.cpu_count() or 1)
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
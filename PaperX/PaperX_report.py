@@ -1,44 +1,132 @@
-from email.mime import text
 import os
 import re
 import unicodedata
 import shutil
-from dataclasses import dataclass
-from docx import Document
+from dataclasses import dataclass, field, replace
+from typing import BinaryIO, Callable
 
+import io
+import json
 import tempfile
-from copy import deepcopy
+import time
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from itertools import islice
 from shutil import which
 
 import subprocess
 from pathlib import Path
 
-from docx.oxml.ns import qn
-import uuid
+import hashlib
+import marshal
+import sys
+from array import array
+
+# python-docx (ve lxml) burada import EDİLMEZ; belge açılana kadar yüklenmez.
+# Böylece dil/özellik soruları anında gelir ve CLI/sunucu açılışı hafif kalır.
+# Belge PaperX_docx ile akışlı okunur; python-docx yalnızca OMML -> pandoc için gerekir.
+from PaperX_docx import DocxPackage, DocxParagraph, iter_docx_blocks
+
+# ================== Aşama ölçümü (PaperX_bench) ==================
+class PhaseTimer:
+    """
+    Dönüşüm aşamalarının (load, classify, text, tables, equations, images, write)
+    toplam süresini (s) ve çağrı sayısını biriktirir.
+    Profil (--profile) anahtarları önekli tutulur: "block:<tür>", "tool:<program>", "image:<ad>".
+    """
+    enabled = True
+
+    def __init__(self):
+        self.seconds: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self._lap_start = time.perf_counter()
+
+    def add(self, phase: str, dt: float):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + dt
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    @contextmanager
+    def span(self, phase: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - t0)
+
+    def lap(self, key: str | None = None):
+        """Son lap'ten bu yana geçen süreyi key'e yazar (key None ise yalnızca saati başlatır)."""
+        now = time.perf_counter()
+        if key is not None:
+            self.add(key, now - self._lap_start)
+        self._lap_start = now
+
+    def as_dict(self) -> dict[str, dict]:
+        return {k: {"seconds": self.seconds[k], "calls": self.calls[k]} for k in self.seconds}
+
+    def merge(self, other: dict[str, dict]):
+        """Başka bir süreçte ölçülmüş as_dict() çıktısını ekler (paralel bölümler)."""
+        for k, v in other.items():
+            self.seconds[k] = self.seconds.get(k, 0.0) + v["seconds"]
+            self.calls[k] = self.calls.get(k, 0) + v["calls"]
+
+    def wrap(self, phase: str, fn):
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - t0)
+        return timed
+
+class _NullTimer:
+    """Ölçüm kapalı: span boş bağlam, wrap fonksiyonun kendisini döner (ek maliyet yok)."""
+    enabled = False
+    _span = nullcontext()
+
+    def add(self, phase: str, dt: float):
+        pass
+
+    def span(self, phase: str):
+        return self._span
+
+    def wrap(self, phase: str, fn):
+        return fn
+
+NULL_TIMER = _NullTimer()
 
 # ======================================================================
 # Word OMML (Equation Editor) support: OMML -> LaTeX (pandoc) -> image fallback
 # ======================================================================
 
-def has_omml(paragraph) -> bool:
+@lru_cache(maxsize=None)
+def find_tool(name: str) -> str | None:
+    """
+    Harici araç (pandoc, xelatex, magick ...) PATH'te aranır; sonuç süreç boyunca saklanır.
+    Uzun ömürlü süreçlerde (sunucu işçileri) her denklemde tekrar aranmaz.
+    """
+    return which(name)
+
+def has_omml(paragraph: DocxParagraph) -> bool:
     """
     Word 'Insert Equation' creates OMML nodes (m:oMath / m:oMathPara).
-    python-docx paragraph.text does NOT include them.
+    paragraph.text does NOT include them.
     """
-    xml = paragraph._element.xml
-    return ("<m:oMath" in xml) or ("<m:oMathPara" in xml)
+    return paragraph.has_omml
 
-def write_single_paragraph_docx(src_paragraph, out_docx_path: str):
+def write_single_paragraph_docx(paragraph_xml: bytes, out_docx_path: str):
     """
-    src_paragraph._element (including OMML) is deep-copied into a new docx.
+    The paragraph XML (including OMML, kept in the IR) is copied into a new docx.
     This preserves the equation XML so pandoc can see it.
     """
+    from docx import Document
+    from docx.oxml import parse_xml
+
     d = Document()
     # remove default empty paragraph
     if d.paragraphs:
         p0 = d.paragraphs[0]._element
         p0.getparent().remove(p0)
-    d._body._element.append(deepcopy(src_paragraph._element))
+    d._body._element.append(parse_xml(paragraph_xml))
     d.save(out_docx_path)
 
 def extract_math_from_pandoc_latex(latex_fragment: str) -> str | None:
@@ -76,25 +164,26 @@ def extract_math_from_pandoc_latex(latex_fragment: str) -> str | None:
     # if no wrapper found, return as-is (sometimes pandoc outputs bare math)
     return s if s else None
 
-def pandoc_docx_paragraph_to_latex_math(src_paragraph) -> str | None:
+def pandoc_docx_paragraph_to_latex_math(paragraph_xml: bytes, timer=NULL_TIMER) -> str | None:
     """
     Converts a single paragraph docx (with OMML) to LaTeX using pandoc,
     and extracts the math content.
     """
-    if which("pandoc") is None:
+    if find_tool("pandoc") is None:
         return None
 
     with tempfile.TemporaryDirectory() as td:
         mini_docx = os.path.join(td, "mini.docx")
-        write_single_paragraph_docx(src_paragraph, mini_docx)
+        write_single_paragraph_docx(paragraph_xml, mini_docx)
 
         try:
-            res = subprocess.run(
-                ["pandoc", mini_docx, "-f", "docx", "-t", "latex", "--wrap=none"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+            with timer.span("tool:pandoc"):
+                res = subprocess.run(
+                    ["pandoc", mini_docx, "-f", "docx", "-t", "latex", "--wrap=none"],
+                    capture_output=True,
+                    text=True,
+                    check=False
+                )
         except Exception:
             return None
 
@@ -104,17 +193,17 @@ def pandoc_docx_paragraph_to_latex_math(src_paragraph) -> str | None:
         frag = (res.stdout or "").strip()
         return extract_math_from_pandoc_latex(frag)
 
-def latex_math_to_png(math_latex: str, out_png_path: str) -> bool:
+def latex_math_to_png(math_latex: str, out_png_path: str, timer=NULL_TIMER) -> bool:
     """
     Renders display math to PNG using LaTeX -> PDF -> PNG.
     Uses xelatex/pdflatex and either magick or pdftocairo.
     """
-    latex_engine = "xelatex" if which("xelatex") else ("pdflatex" if which("pdflatex") else None)
+    latex_engine = "xelatex" if find_tool("xelatex") else ("pdflatex" if find_tool("pdflatex") else None)
     if latex_engine is None:
         return False
 
-    magick = which("magick")
-    pdftocairo = which("pdftocairo")
+    magick = find_tool("magick")
+    pdftocairo = find_tool("pdftocairo")
 
     # ensure output dir
     os.makedirs(os.path.dirname(out_png_path), exist_ok=True)
@@ -137,33 +226,36 @@ def latex_math_to_png(math_latex: str, out_png_path: str) -> bool:
             f.write(tex)
 
         # compile to pdf
-        res = subprocess.run(
-            [latex_engine, "-interaction=nonstopmode", "-halt-on-error", tex_path],
-            cwd=td,
-            capture_output=True,
-            text=True
-        )
+        with timer.span(f"tool:{latex_engine}"):
+            res = subprocess.run(
+                [latex_engine, "-interaction=nonstopmode", "-halt-on-error", tex_path],
+                cwd=td,
+                capture_output=True,
+                text=True
+            )
         if res.returncode != 0 or (not os.path.exists(pdf_path)):
             return False
 
         # pdf -> png
         if magick:
             # ImageMagick: magick -density 300 eq.pdf -trim +repage out.png
-            res2 = subprocess.run(
-                ["magick", "-density", "300", pdf_path, "-trim", "+repage", out_png_path],
-                capture_output=True,
-                text=True
-            )
+            with timer.span("tool:magick"):
+                res2 = subprocess.run(
+                    ["magick", "-density", "300", pdf_path, "-trim", "+repage", out_png_path],
+                    capture_output=True,
+                    text=True
+                )
             return res2.returncode == 0 and os.path.exists(out_png_path)
 
         if pdftocairo:
             # pdftocairo -png -r 300 eq.pdf outprefix  => outprefix-1.png
             outprefix = os.path.splitext(out_png_path)[0]
-            res2 = subprocess.run(
-                ["pdftocairo", "-png", "-r", "300", pdf_path, outprefix],
-                capture_output=True,
-                text=True
-            )
+            with timer.span("tool:pdftocairo"):
+                res2 = subprocess.run(
+                    ["pdftocairo", "-png", "-r", "300", pdf_path, outprefix],
+                    capture_output=True,
+                    text=True
+                )
             produced = outprefix + "-1.png"
             if res2.returncode == 0 and os.path.exists(produced):
                 # rename to target name
@@ -218,6 +310,94 @@ class Features:
     use_bibliography: bool = True
     use_plots: bool = True   # sadece assets/plots'tan ekleme (üretim yok)
 
+# ================== Conversion Context ==================
+@dataclass
+class ConversionContext:
+    """
+    Tek bir dönüşümün yolları ve log çıkışı.
+    Süreç geneli durum (CWD) kullanılmaz; böylece aynı süreçte birden fazla
+    dönüşüm (ör. thread havuzunda) güvenle aynı anda çalışabilir.
+
+    input_root: assets/imageN ve assets/plots/plotN burada aranır (None: aranmaz)
+    out_dir:    toc.tex, content.tex, assets/temp ve assets/equations buraya yazılır.
+                None ise diske hiçbir şey yazılmaz; üretilen dosyalar `assets`
+                sözlüğünde ("assets/temp/x.png" -> bytes) tutulur.
+    timer:      aşama ölçümü (PhaseTimer); varsayılan NULL_TIMER hiçbir şey ölçmez.
+    ir_cache:   True ise ayrıştırılmış belge (IR) .docx'in yanındaki önbellekten okunur/yazılır.
+    section_jobs: >1 ise content.tex bölüm bölüm süreç havuzunda üretilir (çıktı aynıdır).
+    keep_assets: True ise dosyalar out_dir'e yazılmaz, `assets`te tutulur (LaTeX yolu yine
+                out_dir'e göredir); paralel bölüm işçileri kullanır, ana süreç yazar.
+    fragments:  True ise content.tex başlık başına content/sec_NN.tex parçalarına bölünür.
+    only_sections: parça modunda yalnızca bu bölümleri derleyen \\includeonly (paperx_only.tex).
+    image_base / plot_base: birleştirmede (--merge) bu belgeden önceki belgelerin görsel/grafik sayısı;
+                imageN/plotN belgenin kendi klasöründe yerel numarayla (N - base) aranır.
+    """
+    input_root: str | None = None
+    out_dir: str | None = None
+    log: Callable[[str], None] = field(default=print)
+    assets: dict[str, bytes] = field(default_factory=dict)
+    timer: PhaseTimer | _NullTimer = field(default=NULL_TIMER, repr=False)
+    ir_cache: bool = False
+    section_jobs: int = 1
+    keep_assets: bool = False
+    fragments: bool = False
+    only_sections: tuple[int, ...] = ()
+    image_base: int = 0
+    plot_base: int = 0
+
+    def __post_init__(self):
+        if self.input_root is not None:
+            self.input_root = os.path.abspath(self.input_root)
+        if self.out_dir is not None:
+            self.out_dir = os.path.abspath(self.out_dir)
+
+    def input_path(self, *parts: str) -> str | None:
+        if self.input_root is None:
+            return None
+        return os.path.join(self.input_root, *parts)
+
+    def output_path(self, *parts: str) -> str:
+        return os.path.join(self.out_dir, *parts)
+
+    def latex_path(self, path: str) -> str:
+        """LaTeX'e yazılacak yol: content.tex'in bulunduğu out_dir'e göreli."""
+        if self.out_dir is None:
+            return os.path.abspath(path).replace("\\", "/")
+        return latex_rel_path(path, self.out_dir)
+
+    def write_asset(self, rel_path: str, data: bytes) -> str:
+        """
+        Üretilen dosyayı (çıkarılan görsel, denklem PNG'si) kaydeder.
+        rel_path out_dir'e göreli ("assets/temp/x.png"); LaTeX yolu döner.
+        """
+        rel_path = rel_path.replace("\\", "/")
+        if self.out_dir is None:
+            self.assets[rel_path] = data
+            return rel_path
+
+        out_path = self.output_path(*rel_path.split("/"))
+        if self.keep_assets:
+            self.assets[rel_path] = data
+            return self.latex_path(out_path)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, "wb") as f:
+            f.write(data)
+        return self.latex_path(out_path)
+
+@dataclass
+class ConversionResult:
+    """
+    Bellek içi dönüşüm sonucu.
+    content: content.tex metni (writer'a akıtıldıysa None)
+    toc:     toc.tex metni
+    assets:  "assets/..." -> bytes (LaTeX içinde bu yollarla anılır)
+    """
+    content: str | None
+    toc: str
+    toc_entries: list[tuple[int, str]]
+    assets: dict[str, bytes]
+    log: list[str]
+
 def ask_feature(prompt: str, lang: str) -> bool:
     """
     TR:
@@ -358,7 +538,7 @@ def format_table_caption_with_section(raw: str, lang: str, section_no: int, tbl_
     return out
 
 # ================== TOC Writer (WITH PAGE NUMBERS) ==================
-def write_toc_tex_with_pagenum(toc_entries, lang: str, out_path="toc.tex"):
+def render_toc_tex_with_pagenum(toc_entries, lang: str) -> str:
     title = "İçindekiler" if lang == "tr" else "Index"
 
     lines = []
@@ -378,9 +558,128 @@ def write_toc_tex_with_pagenum(toc_entries, lang: str, out_path="toc.tex"):
 
     lines.append(r"\endgroup")
     lines.append("")
+    return "\n".join(lines)
 
+def write_toc_tex_with_pagenum(toc_entries, lang: str, out_path="toc.tex"):
     with open(out_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+        f.write(render_toc_tex_with_pagenum(toc_entries, lang))
+
+# ================== Bölüm parçaları (content/sec_NN.tex) ==================
+# content.tex tek dosya yerine başlık başına bir parçaya bölünebilir (ctx.fragments):
+# content.tex yalnızca \include{content/sec_NN} dizini olur, sec_00 ilk başlıktan önceki kısımdır.
+# İçeriği değişmeyen parça yeniden yazılmaz (mtime korunur, LaTeX araçları değişmemiş görür).
+# \include kullanılır ki main.tex'teki \includeonly (paperx_only.tex) yalnızca seçilen
+# bölümleri derleyebilsin; bölümler zaten \clearpage ile bittiği için sayfa düzeni aynıdır.
+FRAGMENT_DIR = "content"
+INCLUDE_ONLY_FILE = "paperx_only.tex"
+_SECTION_START = "\\phantomsection\n\\label{sec:"
+
+def fragment_name(section_no: int) -> str:
+    return f"{FRAGMENT_DIR}/sec_{section_no:02d}"
+
+def write_if_changed(path: str, text: str) -> bool:
+    """Dosyanın içerik özeti aynıysa dokunmaz; değiştiyse atomik yazar. Yazıldıysa True."""
+    data = text.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                return False
+    except OSError:
+        pass
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+class SectionFragmentWriter:
+    """
+    content akışını (emit_section_range parçaları) başlık sınırlarında böler.
+    Başlık satırları her zaman yeni bir parçayla başlar (close_section önce akıtır);
+    böylece seri, --section-jobs ve birleştirilmiş (--merge) akışlar aynı parçaları verir.
+    """
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.names: list[str] = []       # yazılma sırasıyla parça adları
+        self.changed: list[str] = []     # yeniden yazılanlar
+        self._name: str | None = None
+        self._buf: list[str] = []
+        os.makedirs(os.path.join(out_dir, FRAGMENT_DIR), exist_ok=True)
+
+    def write(self, chunk: str):
+        if chunk.startswith(_SECTION_START) or chunk.startswith("\n" + _SECTION_START):
+            body = chunk[1:] if chunk.startswith("\n") else chunk
+            close = body.index("}", len(_SECTION_START))
+            self._finish()
+            self._name = fragment_name(int(body[len(_SECTION_START):close]))
+            chunk = body
+        elif self._name is None:
+            self._name = fragment_name(0)
+        self._buf.append(chunk)
+
+    def _finish(self):
+        if self._name is None:
+            return
+        if write_if_changed(os.path.join(self.out_dir, *self._name.split("/")) + ".tex", "".join(self._buf) + "\n"):
+            self.changed.append(self._name)
+        self.names.append(self._name)
+        self._name = None
+        self._buf = []
+
+    def close(self) -> bool:
+        """Son parçayı, dizini (content.tex) yazar ve artık üretilmeyen eski parçaları siler."""
+        self._finish()
+        index = "".join(f"\\include{{{name}}}\n" for name in self.names)
+        index_changed = write_if_changed(os.path.join(self.out_dir, "content.tex"), index)
+        keep = {name.rsplit("/", 1)[1] + ".tex" for name in self.names}
+        frag_dir = os.path.join(self.out_dir, FRAGMENT_DIR)
+        for fname in os.listdir(frag_dir):
+            if re.fullmatch(r"sec_\d+\.tex", fname) and fname not in keep:
+                os.remove(os.path.join(frag_dir, fname))
+        return index_changed
+
+def write_include_only(ctx: "ConversionContext", lang: str, available: list[str] | None) -> None:
+    """
+    --only-section: paperx_only.tex'e \\includeonly yazar (main.tex onu varsa okur).
+    Seçim yoksa dosya silinir; tam derleme yeniden her şeyi içerir.
+    """
+    path = ctx.output_path(INCLUDE_ONLY_FILE)
+    if not ctx.only_sections or available is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    chosen = []
+    for n in ctx.only_sections:
+        name = fragment_name(n)
+        if name in available:
+            chosen.append(name)
+        else:
+            ctx.log(_t(lang, f"⚠️ UYARI: {n}. bölüm yok; --only-section yok sayıldı.",
+                             f"⚠️ WARNING: There is no section {n}; --only-section ignored for it."))
+    write_if_changed(path, f"\\includeonly{{{','.join(chosen)}}}\n")
+
+@contextmanager
+def content_writer(ctx: "ConversionContext", lang: str):
+    """
+    content.tex yazıcısı: tek dosya (geçici dosyaya akıtılıp yerine konur)
+    veya ctx.fragments ise bölüm parçaları. Gövde yazıcıya write(str) ile akıtır.
+    """
+    if ctx.fragments:
+        writer = SectionFragmentWriter(ctx.out_dir)
+        yield writer.write
+        writer.close()
+        write_include_only(ctx, lang, writer.names)
+        ctx.log(_t(lang, f"ℹ️ Bölüm parçaları: {len(writer.names)} ({len(writer.changed)} değişti)",
+                         f"ℹ️ Section fragments: {len(writer.names)} ({len(writer.changed)} changed)"))
+        return
+
+    content_path = ctx.output_path("content.tex")
+    tmp_path = content_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        yield f.write
+    os.replace(tmp_path, content_path)
+    write_include_only(ctx, lang, None)
 
 # ======================================================================
 # $$ ... $$ equation parsing
@@ -524,42 +823,26 @@ def parse_figure_marker_line(text: str, lang: str) -> bool:
 
 
 
-def is_word_list_paragraph(paragraph) -> tuple[bool, str]:
+def is_word_list_paragraph(paragraph: DocxParagraph) -> tuple[bool, str]:
     """
     Returns (is_list, list_env) where list_env is 'itemize' or 'enumerate'.
     Uses Word numbering properties and (best-effort) style name to guess numbered lists.
     """
-    try:
-        ppr = paragraph._p.pPr
-        numpr = ppr.numPr if ppr is not None else None
-        is_list = numpr is not None
-    except Exception:
-        is_list = False
-
-    if not is_list:
+    if not paragraph.is_list:
         return False, "itemize"
 
     # Best-effort: infer enumerate vs itemize from style name
-    style_name = ""
-    try:
-        style_name = (paragraph.style.name or "")
-    except Exception:
-        style_name = ""
-    sn = style_name.casefold()
+    sn = (paragraph.style_name or "").casefold()
     if "number" in sn or "numara" in sn or "enumer" in sn:
         return True, "enumerate"
     return True, "itemize"
 
-def has_inline_image(paragraph) -> bool:
+def has_inline_image(paragraph: DocxParagraph) -> bool:
     """
     Paragraph içinde inline görsel var mı?
-    - python-docx: InlineShape erişimi her zaman kolay değil; XML'den kontrol ediyoruz.
+    (okuyucu XML'de w:drawing / w:pict / v:imagedata arar)
     """
-    try:
-        xml = paragraph._element.xml
-    except Exception:
-        return False
-    return ("<w:drawing" in xml) or ("<w:pict" in xml) or ("<v:imagedata" in xml)
+    return paragraph.has_image
 
 def parse_near_caption_line(text: str, lang: str):
     """
@@ -598,36 +881,37 @@ def parse_near_caption_line(text: str, lang: str):
 
     return None, None
 
-def collect_caption_below(blocks, i: int, lang: str, want_kind: str, skip_elems: set):
+CAPTION_LOOKAHEAD = 8
+
+def collect_caption_below(ir: "DocumentIR", i: int, lang: str, want_kind: str, skip_blocks: set):
     """
     SADECE aşağı bakar.
     Boş satırları atlar.
     İlk anlamlı satır:
       --- ... ---  veya
       Şekil 1: ... / Tablo 2: ...
+    Caption olarak kullanılan blok indeksi skip_blocks'a eklenir.
     """
-    max_look = 8  # boşluk toleransı
+    max_look = CAPTION_LOOKAHEAD  # boşluk toleransı
+    near_flag = lang_flag(L_NEAR_FIGURE if want_kind == "figure" else L_NEAR_TABLE, lang)
 
-    for j in range(i + 1, min(len(blocks), i + 1 + max_look)):
-        k, obj = blocks[j]
-
-        if k != "p":
+    for j in range(i + 1, min(len(ir), i + 1 + max_look)):
+        if ir.kinds[j] != BLOCK_PARA:
             continue
 
-        t = strip_invisible(obj.text or "").strip()
+        t = ir.texts[j].strip()
         if not t:
             continue
 
         # --- marker caption
-        cap_marker = parse_caption_marker(t)
-        if cap_marker:
-            skip_elems.add(obj._element)
-            return cap_marker.strip()
+        if ir.flags[j] & F_CAPTION_MARKER:
+            skip_blocks.add(j)
+            return parse_caption_marker(t).strip()
 
         # Şekil 1: / Tablo 1:
-        kind2, cap = parse_near_caption_line(t, lang=lang)
-        if kind2 == want_kind:
-            skip_elems.add(obj._element)
+        if ir.flags[j] & near_flag:
+            skip_blocks.add(j)
+            _, cap = parse_near_caption_line(t, lang=lang)
             return (cap or "").strip()
 
         # anlamlı ama caption değil → bırak
@@ -635,7 +919,23 @@ def collect_caption_below(blocks, i: int, lang: str, want_kind: str, skip_elems:
 
     return None
 
-def resolve_image_path(img_idx: int) -> tuple[str | None, str | None]:
+def latex_rel_path(path: str, out_dir: str) -> str:
+    """
+    LaTeX'e yazılacak yolu çıktı klasörüne (content.tex'in yanı) göre göreli yapar.
+    Farklı sürücü gibi göreli yol üretilemeyen durumlarda mutlak yol döner.
+    """
+    try:
+        rel = os.path.relpath(path, out_dir)
+    except ValueError:
+        rel = os.path.abspath(path)
+    return rel.replace("\\", "/")
+
+def resolve_image_path(img_idx: int, ctx: ConversionContext) -> tuple[str | None, str | None]:
+    """
+    input_root/assets/imageX veya input_root/imageX dosyasını bulur (X = img_idx - ctx.image_base).
+    (LaTeX yolu (out_dir'e göreli), mutlak yol) döner.
+    """
+    img_idx -= ctx.image_base
     exts = ["png", "jpg", "jpeg"]
     candidates = []
     for ext in exts:
@@ -643,32 +943,31 @@ def resolve_image_path(img_idx: int) -> tuple[str | None, str | None]:
     for ext in exts:
         candidates.append(f"image{img_idx}.{ext}")
 
-    for rel in candidates:
-        if os.path.exists(rel):
-            return rel.replace("\\", "/"), os.path.abspath(rel)
+    if ctx.input_root is None:
+        return None, None
+    with ctx.timer.span(f"image:image{img_idx}"):
+        for rel in candidates:
+            abs_path = ctx.input_path(rel)
+            if os.path.exists(abs_path):
+                return ctx.latex_path(abs_path), abs_path
     return None, None
 
 
 
-def extract_inline_image_temp(paragraph) -> str | None:
+def extract_inline_image_temp(part_name: str | None, pkg: DocxPackage, ctx: ConversionContext) -> str | None:
     """
-    Word inline görseli geçici dosyaya yazar.
-    extracted klasörü KULLANILMAZ.
+    Word inline görselini (IR'deki zip üyesi) assets/temp altına kaydeder (ctx.write_asset).
+    extracted klasörü KULLANILMAZ. Dönen yol out_dir'e görelidir.
+    Görsel baytları yalnızca burada, paketten okunur.
     """
-
+    t0 = time.perf_counter()
     try:
-        blips = paragraph._element.xpath('.//a:blip')
-        if not blips:
-            return None
-
-        rid = blips[0].get(qn('r:embed'))
-        if not rid:
+        if not part_name:
             return None
 
-        image_part = paragraph.part.related_parts[rid]
-        image_bytes = image_part.blob
+        image_bytes = pkg.read_part(part_name)
 
-        content_type = (getattr(image_part, "content_type", "") or "").lower()
+        content_type = (pkg.content_type(part_name) or "").lower()
 
         if "png" in content_type:
             ext = "png"
@@ -677,16 +976,11 @@ def extract_inline_image_temp(paragraph) -> str | None:
         else:
             ext = "png"
 
-        temp_dir = os.path.join("assets", "temp")
-        os.makedirs(temp_dir, exist_ok=True)
-
-        unique_name = f"{uuid.uuid4().hex}.{ext}"
-        out_path = os.path.join(temp_dir, unique_name)
-
-        with open(out_path, "wb") as f:
-            f.write(image_bytes)
-
-        return out_path.replace("\\", "/")
+        # içerik özeti: aynı görsel her çalıştırmada aynı adı alır (değişmeyen bölüm parçası yeniden yazılmaz)
+        unique_name = f"{hashlib.sha256(image_bytes).hexdigest()[:32]}.{ext}"
+        latex_path = ctx.write_asset(f"assets/temp/{unique_name}", image_bytes)
+        ctx.timer.add(f"image:{part_name} ({len(image_bytes)} B)", time.perf_counter() - t0)
+        return latex_path
 
     except Exception:
         return None
@@ -702,21 +996,47 @@ def parse_plot_marker_line(text: str) -> bool:
     inner = t[1:-1].strip().casefold()
     return inner in ("plot", "grafik")
 
-def resolve_plot_path(plot_idx: int) -> tuple[str | None, str | None]:
+@lru_cache(maxsize=64)
+def _plots_meta_files(meta_path: str, sig: tuple) -> tuple[str, ...]:
+    """plots_meta.json'daki çıktı dosyaları, grafik sırasıyla (sig: mtime/boyut, önbellek anahtarı)."""
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            plots = json.load(f).get("plots", [])
+        return tuple(p["file"] if isinstance(p.get("file"), str) else "" for p in plots)
+    except (OSError, ValueError, TypeError, AttributeError, KeyError):
+        return ()
+
+
+def resolve_plot_path(plot_idx: int, ctx: ConversionContext) -> tuple[str | None, str | None]:
     """
-    assets/plots/plot1.png, plot2.png ... dosyalarını bulur.
-    (plots.py buraya yazıyor.)
+    input_root/assets/plots/ altındaki N. grafiği bulur (plots.py buraya yazıyor):
+    önce plots_meta.json'un N. kaydı (biçimi/adı ne olursa olsun: plotN.pdf, sicaklik.png ...),
+    yoksa plotN.png/.jpg/.jpeg/.pdf. N = plot_idx - ctx.plot_base.
     """
-    exts = ["png", "jpg", "jpeg"]
+    plot_idx -= ctx.plot_base
+    exts = ["png", "jpg", "jpeg", "pdf"]
     candidates = []
     for ext in exts:
         candidates.append(os.path.join("assets", "plots", f"plot{plot_idx}.{ext}"))
     for ext in exts:
         candidates.append(f"plot{plot_idx}.{ext}")
 
-    for rel in candidates:
-        if os.path.exists(rel):
-            return rel.replace("\\", "/"), os.path.abspath(rel)
+    if ctx.input_root is None:
+        return None, None
+    with ctx.timer.span(f"image:plot{plot_idx}"):
+        meta_path = ctx.input_path("assets", "plots", "plots_meta.json")
+        try:
+            st = os.stat(meta_path)
+            files = _plots_meta_files(meta_path, (st.st_mtime_ns, st.st_size))
+        except OSError:
+            files = ()
+        name = files[plot_idx - 1] if 0 < plot_idx <= len(files) else ""
+        if name and os.path.basename(name) == name:
+            candidates.insert(0, os.path.join("assets", "plots", name))
+        for rel in candidates:
+            abs_path = ctx.input_path(rel)
+            if os.path.exists(abs_path):
+                return ctx.latex_path(abs_path), abs_path
     return None, None
 
 # ======================================================================
@@ -768,25 +1088,11 @@ def is_tight_list_item(text: str) -> bool:
     ]
     return any(re.match(p, t) for p in patterns)
 
-def iter_block_items(doc: Document):
-    from docx.oxml.text.paragraph import CT_P
-    from docx.oxml.table import CT_Tbl
-    from docx.text.paragraph import Paragraph
-    from docx.table import Table
-
-    parent = doc.element.body
-    for child in parent.iterchildren():
-        if isinstance(child, CT_P):
-            yield ("p", Paragraph(child, doc))
-        elif isinstance(child, CT_Tbl):
-            yield ("tbl", Table(child, doc))
-
-def table_to_latex_lines(table) -> list[str]:
-    rows = table.rows
+def table_to_latex_lines(rows: list[list[str]]) -> list[str]:
     if not rows:
         return []
 
-    ncols = len(rows[0].cells) if rows[0].cells else 0
+    ncols = len(rows[0]) if rows[0] else 0
     if ncols <= 0:
         return []
 
@@ -799,11 +1105,10 @@ def table_to_latex_lines(table) -> list[str]:
     lines.append(r"\begin{tabularx}{\textwidth}{" + colspec + r"}")
     lines.append(r"\hline")
 
-    for r_idx, row in enumerate(rows):
-        cells = row.cells
+    for r_idx, cells in enumerate(rows):
         cell_texts = []
         for c in cells[:ncols]:
-            raw = strip_invisible(c.text or "").replace("\n", " ").strip()
+            raw = strip_invisible(c or "").replace("\n", " ").strip()
             esc = escape_latex(raw)
             esc = replace_greek_unicode_after_escape(esc)
             if r_idx == 0:
@@ -829,67 +1134,488 @@ def is_bibliography_heading(text: str, lang: str, norm_heading_fn) -> bool:
     cleaned_norm = norm_heading_fn(cleaned)
     return cleaned_norm == target_norm
 
+# ================== Ara gösterim (IR) ==================
+# Ayrıştırma (parse_docx_ir) ile LaTeX üretimi (emit_content_latex) ayrı aşamalardır;
+# üretim yalnızca IR'ye bakar, .docx paketi yalnızca inline görsel baytları için açık kalır.
+BLOCK_PARA, BLOCK_TABLE = 0, 1
+
+# Dilden bağımsız paragraf bayrakları
+F_OMML = 1 << 0             # Word denklemi (OMML)
+F_IMAGE = 1 << 1            # inline görsel
+F_LIST = 1 << 2             # Word madde/numara listesi
+F_LIST_ENUM = 1 << 3        # ... numaralı (enumerate)
+F_CAPTION_MARKER = 1 << 4   # --- caption ---
+F_PLOT_MARKER = 1 << 5      # $plot$ / $grafik$
+F_DOLLAR_EQ = 1 << 6        # $$ ... $$ denklem satırı
+F_TIGHT_TRIGGER = 1 << 7    # tight-list başlatan satır
+F_TIGHT_ITEM = 1 << 8       # tight-list maddesi
+
+# Dile bağlı bayraklar: her dil kendi bit grubunda (lang_flag ile kaydırılır)
+L_HEADING = 1 << 0
+L_BIB_HEADING = 1 << 1
+L_FIG_MARKER = 1 << 2
+L_NEAR_FIGURE = 1 << 3      # "Şekil 1: ..." / "Figure 1: ..."
+L_NEAR_TABLE = 1 << 4       # "Tablo 1: ..." / "Table 1: ..."
+LANG_SHIFT = {"tr": 16, "en": 24}
+
+def lang_flag(flag: int, lang: str) -> int:
+    return flag << LANG_SHIFT[lang]
+
+class DocumentIR:
+    """
+    Belgenin sınıflandırılmış blokları (dil ve Features'tan bağımsız).
+    Blok i için: kinds[i] (BLOCK_*), flags[i] (F_* | dil bitleri),
+    texts[i] (strip_invisible uygulanmış ham metin; tablolarda "").
+    Seyrek alanlar blok indeksiyle: media (görselin zip üyesi), omml (paragraf XML'i), cells (tablo hücreleri).
+    content_start: '---' sonrası ilk paragrafın bloğu ('---' yoksa ilk paragraf; ardında paragraf yoksa None).
+    """
+    __slots__ = ("kinds", "flags", "texts", "media", "omml", "cells", "content_start")
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.flags = array("L")
+        self.texts: list[str] = []
+        self.media: dict[int, str] = {}
+        self.omml: dict[int, bytes] = {}
+        self.cells: dict[int, list[list[str]]] = {}
+        self.content_start: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def slice(self, start: int, end: int) -> "DocumentIR":
+        """[start, end) blokları; seyrek alanların indeksleri start'a göre kaydırılır."""
+        part = DocumentIR()
+        part.kinds = self.kinds[start:end]
+        part.flags = self.flags[start:end]
+        part.texts = self.texts[start:end]
+        part.media = {i - start: v for i, v in self.media.items() if start <= i < end}
+        part.omml = {i - start: v for i, v in self.omml.items() if start <= i < end}
+        part.cells = {i - start: v for i, v in self.cells.items() if start <= i < end}
+        part.content_start = 0
+        return part
+
+    def dump(self) -> tuple:
+        """Yalnızca yerleşik tiplerden oluşan biçim (marshal ile önbelleğe yazılır)."""
+        return (self.kinds.tobytes(), self.flags.tobytes(), self.texts,
+                self.media, self.omml, self.cells, self.content_start)
+
+    @classmethod
+    def load(cls, data: tuple) -> "DocumentIR":
+        kinds, flags, texts, media, omml, cells, content_start = data
+        ir = cls()
+        ir.kinds.frombytes(kinds)
+        ir.flags.frombytes(flags)
+        ir.texts, ir.media, ir.omml, ir.cells = texts, media, omml, cells
+        ir.content_start = content_start
+        if not (len(ir.kinds) == len(ir.flags) == len(ir.texts)):
+            raise ValueError("inconsistent IR")
+        return ir
+
+def classify_paragraph_text(text: str, detectors: dict) -> int:
+    """Boş olmayan (strip edilmiş) paragraf metninin F_* ve tüm dillerin L_* bayrakları."""
+    f = 0
+    if parse_caption_marker(text):
+        f |= F_CAPTION_MARKER
+    if parse_plot_marker_line(text):
+        f |= F_PLOT_MARKER
+    if parse_dollars_equation_line(text) is not None:
+        f |= F_DOLLAR_EQ
+    if is_tight_list_trigger(text):
+        f |= F_TIGHT_TRIGGER
+    if is_tight_list_item(text):
+        f |= F_TIGHT_ITEM
+
+    for lang, (is_heading, norm_heading) in detectors.items():
+        lf = 0
+        if is_heading(text):
+            lf |= L_HEADING
+            if is_bibliography_heading(text, lang=lang, norm_heading_fn=norm_heading):
+                lf |= L_BIB_HEADING
+        if parse_figure_marker_line(text, lang):
+            lf |= L_FIG_MARKER
+        near_kind, _ = parse_near_caption_line(text, lang=lang)
+        if near_kind == "figure":
+            lf |= L_NEAR_FIGURE
+        elif near_kind == "table":
+            lf |= L_NEAR_TABLE
+        f |= lf << LANG_SHIFT[lang]
+    return f
+
+PARSE_BATCH_BLOCKS = 256
+
+
+def parse_docx_ir(pkg: DocxPackage, timer=NULL_TIMER) -> DocumentIR:
+    """
+    Parse aşaması: gövde akışlı okunur; PARSE_BATCH_BLOCKS kayıtlık parçalar "load" aşamasında
+    okunur, "classify" aşamasında IR'ye aktarılıp bırakılır (bellekte en fazla bir parça kayıt).
+    """
+    detectors = {lang: make_heading_detector(lang) for lang in LANG_SHIFT}
+    ir = DocumentIR()
+    kinds, flags, texts = ir.kinds, ir.flags, ir.texts
+
+    first_para = None
+    after_sep = None        # None: '---' görülmedi, False: görüldü ama ardından paragraf yok
+
+    blocks = iter_docx_blocks(pkg)
+    while True:
+        with timer.span("load"):
+            batch = list(islice(blocks, PARSE_BATCH_BLOCKS))
+        if not batch:
+            break
+        with timer.span("classify"):
+            for kind, rec in batch:
+                i = len(kinds)
+                if kind == "tbl":
+                    kinds.append(BLOCK_TABLE)
+                    flags.append(0)
+                    texts.append("")
+                    ir.cells[i] = rec.rows
+                    continue
+
+                raw = strip_invisible(rec.text or "")
+                t = raw.strip()
+                f = classify_paragraph_text(t, detectors) if t else 0
+                if has_omml(rec):
+                    f |= F_OMML
+                    ir.omml[i] = rec.xml
+                if has_inline_image(rec):
+                    f |= F_IMAGE
+                    if rec.image_part:
+                        ir.media[i] = rec.image_part
+                is_list, list_env = is_word_list_paragraph(rec)
+                if is_list:
+                    f |= F_LIST | (F_LIST_ENUM if list_env == "enumerate" else 0)
+
+                kinds.append(BLOCK_PARA)
+                flags.append(f)
+                texts.append(raw)
+
+                if first_para is None:
+                    first_para = i
+                if after_sep is False:
+                    after_sep = i
+                elif after_sep is None and t == "---":
+                    after_sep = False
+        del batch
+
+    ir.content_start = first_para if after_sep is None else (after_sep or None)
+    return ir
+
+# ================== IR önbelleği ==================
+# Aynı belge farklı Features/dil ile yeniden dönüştürülünce ayrıştırma atlanır.
+# Önbellek .docx'in yanında gizli bir dosyadır; anahtar belge içeriğinin SHA-256'sıdır.
+# marshal yalnızca yerleşik tipleri yükler (pickle gibi kod çalıştırmaz); biçimi Python
+# sürümüne ve dizi eleman boyuna bağlı olduğundan bunlar da anahtara girer.
+IR_CACHE_VERSION = 1
+
+def ir_cache_path(docx_filename: str) -> str:
+    folder, name = os.path.split(os.path.abspath(docx_filename))
+    return os.path.join(folder, f".{name}.paperx-ir")
+
+def ir_cache_key(docx_filename: str) -> str:
+    h = hashlib.sha256()
+    with open(docx_filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    abi = f"py{sys.version_info[0]}.{sys.version_info[1]}-L{array('L').itemsize}"
+    return f"{IR_CACHE_VERSION}:{abi}:{h.hexdigest()}"
+
+def load_ir_cache(path: str, key: str) -> DocumentIR | None:
+    """Anahtar tutmazsa veya dosya bozuksa None (sessizce yeniden ayrıştırılır)."""
+    try:
+        with open(path, "rb") as f:
+            cached_key, data = marshal.load(f)
+        if cached_key != key:
+            return None
+        return DocumentIR.load(data)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+def save_ir_cache(path: str, key: str, ir: DocumentIR):
+    """Yazılamazsa (salt okunur klasör vb.) önbelleksiz devam edilir."""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            marshal.dump((key, ir.dump()), f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+def load_or_parse_ir(docx_filename: str, pkg: DocxPackage, ctx: ConversionContext, lang: str) -> DocumentIR:
+    """ctx.ir_cache açıksa önbellekteki IR'yi kullanır; yoksa ayrıştırır ve önbelleğe yazar."""
+    if not ctx.ir_cache:
+        return parse_docx_ir(pkg, ctx.timer)
+
+    cache_path = ir_cache_path(docx_filename)
+    with ctx.timer.span("load"):
+        key = ir_cache_key(docx_filename)
+        ir = load_ir_cache(cache_path, key)
+    if ir is not None:
+        ctx.log(_t(lang, "ℹ️ Belge önbellekten okundu (ayrıştırma atlandı).",
+                         "ℹ️ Document read from cache (parsing skipped)."))
+        return ir
+
+    ir = parse_docx_ir(pkg, ctx.timer)
+    with ctx.timer.span("write"):
+        save_ir_cache(cache_path, key, ir)
+    return ir
+
 # ================== Main Conversion ==================
-def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
+def convert_docx_to_latex(docx_filename: str, lang: str, features: Features,
+                          out_dir: str | None = None, input_root: str | None = None,
+                          log: Callable[[str], None] = print,
+                          timer: PhaseTimer | None = None,
+                          ir_cache: bool = True,
+                          section_jobs: int = 1,
+                          fragments: bool = False,
+                          only_sections: tuple[int, ...] = ()) -> bool:
+    """
+    docx -> toc.tex + content.tex.
+    out_dir / input_root verilmezse .docx'in klasörü kullanılır (eski davranış).
+    timer verilirse (PhaseTimer) aşama/blok/araç süreleri ona yazılır (--profile).
+    ir_cache: ayrıştırılmış belge .docx'in yanında önbelleklenir; yalnızca Features/dil
+    değişen tekrarlarda ayrıştırma atlanır (belge değişince anahtar tutmaz).
+    section_jobs > 1: bölümler (başlıklar) süreç havuzunda paralel üretilir; çıktı seri ile aynıdır.
+    fragments: content.tex, content/sec_NN.tex parçalarının dizini olur (yalnızca değişenler yazılır);
+    only_sections verilirse paperx_only.tex ile yalnızca o bölümler derlenir (\\includeonly).
+    CWD değiştirilmez; tüm yollar ConversionContext üzerinden gider.
+    Başarılıysa True, dosya bulunamazsa False döner.
+    """
     docx_filename = os.path.abspath(docx_filename)
     base_dir = os.path.dirname(docx_filename) or "."
-    os.chdir(base_dir)
+    ctx = ConversionContext(
+        input_root=input_root or base_dir,
+        out_dir=out_dir or base_dir,
+        log=log,
+        timer=timer or NULL_TIMER,
+        ir_cache=ir_cache,
+        section_jobs=section_jobs,
+        fragments=fragments or bool(only_sections),
+        only_sections=tuple(only_sections),
+    )
+    return convert_docx_with_context(docx_filename, lang, features, ctx)
+
+def convert_docx_with_context(docx_filename: str, lang: str, features: Features, ctx: ConversionContext) -> bool:
+    """Asıl dönüşüm; girdi/çıktı yolları ve mesajlar yalnızca ctx'ten gelir."""
+    log = ctx.log
 
     docx_name = os.path.basename(docx_filename)
-    if not os.path.exists(docx_name):
-        print(_t(lang, f"❌ {docx_name} bulunamadı! (Klasör: {base_dir})", f"❌ {docx_name} not found! (Folder: {base_dir})"))
-        return
+    if not os.path.exists(docx_filename):
+        base_dir = os.path.dirname(docx_filename)
+        log(_t(lang, f"❌ {docx_name} bulunamadı! (Klasör: {base_dir})", f"❌ {docx_name} not found! (Folder: {base_dir})"))
+        return False
 
-    is_heading, norm_heading = make_heading_detector(lang)
+    os.makedirs(ctx.out_dir, exist_ok=True)
+
+    with DocxPackage(docx_filename) as pkg:
+        ir = load_or_parse_ir(docx_filename, pkg, ctx, lang)
+        return _convert_parsed_docx(ir, pkg, lang, features, ctx, docx_filename)
+
+def _convert_parsed_docx(ir: DocumentIR, pkg: DocxPackage, lang: str, features: Features,
+                         ctx: ConversionContext, docx_filename: str) -> bool:
+    """Emisyon aşaması: IR'den toc.tex ve content.tex (paket yalnızca inline görseller için)."""
+    log = ctx.log
+    timer = ctx.timer
+    with timer.span("classify"):
+        toc_entries = collect_toc_entries(ir, lang)
+
+    with timer.span("write"):
+        write_toc_tex_with_pagenum(toc_entries, lang=lang, out_path=ctx.output_path("toc.tex"))
+    log(_t(lang, "\n === Sonuçlar ===", "\n=== Results ==="))
+    log(_t(lang, f"✅ Dil = {lang}", f"✅ Lang = {lang}"))
+    log(_t(lang, "✅ toc.tex yazıldı.", "✅ toc.tex written."))
+    log(_t(lang, f"✅ Başlık sayısı: {len(toc_entries)}", f"✅ Title number: {len(toc_entries)}"))
+    log(_t(
+        lang,
+        f"✅ Özellikler: görsel={features.use_figures}, tablo={features.use_tables}, denklem={features.use_equations}, kaynakça={features.use_bibliography}, grafik={features.use_plots}",
+        f"✅ Features: figures={features.use_figures}, tables={features.use_tables}, equations={features.use_equations}, bib={features.use_bibliography}, plots={features.use_plots}"
+    ))
 
-    doc = Document(docx_name)
-    all_paragraphs = doc.paragraphs
+    with content_writer(ctx, lang) as write:
+        if ctx.section_jobs > 1:
+            emit_content_latex_parallel(ir, docx_filename, pkg, lang, features, ctx, write, ctx.section_jobs)
+        else:
+            emit_content_latex(ir, pkg, lang, features, ctx, write)
 
-    # içerik başlangıcı için --- marker
-    content_start_index = 0
-    for idx, p in enumerate(all_paragraphs):
-        t = strip_invisible(p.text or "").strip()
-        if t == "---":
-            content_start_index = idx + 1
-            break
+    log("✅ " + _t(lang, "content.tex yazıldı.", "content.tex written."))
+    log("ℹ️ " + _t(lang, "Sayfa numaraları için PDF'yi en az 2 kez derlemen gerekebilir (ilkinde ?? çıkabilir).",
+                      "You may need to compile the PDF at least twice for page numbers (?? may appear the first time)."))
+    return True
+
+def convert_docx_in_memory(source: bytes | BinaryIO, lang: str, features: Features,
+                           input_root: str | None = None,
+                           writer: Callable[[str], None] | None = None,
+                           out_dir: str | None = None) -> ConversionResult:
+    """
+    Bellek içi API: .docx içeriği (bytes veya ikili akış) -> ConversionResult.
+    - Diske hiçbir şey yazılmaz; çıkarılan görseller/denklem PNG'leri result.assets'te döner.
+      (out_dir verilirse assets oraya yazılır ve LaTeX yolları ona göre olur.)
+    - input_root verilirse $fig$ / $plot$ için assets/imageN, assets/plots/plotN burada aranır.
+    - writer verilirse content parça parça (başlık sınırlarında) writer'a akıtılır
+      ve result.content None olur.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    messages: list[str] = []
+    ctx = ConversionContext(input_root=input_root, out_dir=out_dir, log=messages.append)
+
+    with DocxPackage(source) as pkg:
+        ir = parse_docx_ir(pkg, ctx.timer)
+        with ctx.timer.span("classify"):
+            toc_entries = collect_toc_entries(ir, lang)
+
+        chunks: list[str] = []
+        emit_content_latex(ir, pkg, lang, features, ctx,
+                           writer if writer is not None else chunks.append)
+
+    return ConversionResult(
+        content=None if writer is not None else "".join(chunks),
+        toc=render_toc_tex_with_pagenum(toc_entries, lang),
+        toc_entries=toc_entries,
+        assets=ctx.assets,
+        log=messages,
+    )
+
+def collect_toc_entries(ir: DocumentIR, lang: str) -> list[tuple[int, str]]:
+    """İçerik başlangıcından (ilk '---' paragrafından sonra) itibaren başlıklar."""
+    _, norm_heading = make_heading_detector(lang)
+    heading_flag = lang_flag(L_HEADING, lang)
 
-    # TOC
     toc_entries = []
+    if ir.content_start is None:
+        return toc_entries
     counter = 0
-    for p in all_paragraphs[content_start_index:]:
-        t = strip_invisible(p.text or "").strip()
-        if is_heading(t):
-            tight_list_mode = False
+    for i in range(ir.content_start, len(ir)):
+        if ir.kinds[i] == BLOCK_PARA and ir.flags[i] & heading_flag:
             counter += 1
-            toc_entries.append((counter, norm_heading(t)))
-
-    write_toc_tex_with_pagenum(toc_entries, lang=lang, out_path="toc.tex")
-    print(_t(lang, "\n === Sonuçlar ===", "\n=== Results ==="))
-    print(_t(lang, f"✅ Dil = {lang}", f"✅ Lang = {lang}"))
-    print(_t(lang, "✅ toc.tex yazıldı.", "✅ toc.tex written."))
-    print(_t(lang, f"✅ Başlık sayısı: {len(toc_entries)}", f"✅ Title number: {len(toc_entries)}"))
-    print(_t(
-        lang,
-        f"✅ Özellikler: görsel={features.use_figures}, tablo={features.use_tables}, denklem={features.use_equations}, kaynakça={features.use_bibliography}, grafik={features.use_plots}",
-        f"✅ Features: figures={features.use_figures}, tables={features.use_tables}, equations={features.use_equations}, bib={features.use_bibliography}, plots={features.use_plots}"
-    ))
+            toc_entries.append((counter, norm_heading(ir.texts[i].strip())))
+    return toc_entries
+
+# emit_content_latex içinde ctx.timer ile sarılan yardımcılar -> aşama adı
+_HELPER_PHASES = {
+    "parse_caption_marker": "classify",
+    "parse_dollars_equation_line": "classify",
+    "parse_near_caption_line": "classify",
+    "collect_caption_below": "classify",
+    "escape_latex": "text",
+    "replace_greek_unicode_after_escape": "text",
+    "split_manual_linebreak_paragraph": "text",
+    "table_to_latex_lines": "tables",
+    "pandoc_docx_paragraph_to_latex_math": "equations",
+    "normalize_equation_for_latex": "equations",
+    "latex_math_to_png": "equations",
+    "extract_inline_image_temp": "images",
+    "resolve_image_path": "images",
+    "resolve_plot_path": "images",
+}
+
+def _timed_helpers(timer) -> dict:
+    g = globals()
+    return {name: timer.wrap(phase, g[name]) for name, phase in _HELPER_PHASES.items()}
+
+@dataclass
+class SectionState:
+    """Bölüm sınırında (başlıkta) bir sonraki bölüme taşınan durum."""
+    heading: int = 0        # heading_counter
+    eq: int = 0             # eq_counter
+    img: int = 0            # img_counter_global
+    plot: int = 0           # plot_counter_global
+    tight: bool = False     # tight_list_mode
+    first: bool = True      # belge başı: \color{black} satırı, henüz hiçbir şey yazılmadı
+    # bölüm içi sayaçlar: yalnızca aralık başlıktan önce içerikle başlıyorsa önemlidir
+    section_no: int = 0     # current_section_no
+    fig_in_section: int = 0
+    plot_in_section: int = 0
+    tbl_in_section: int = 0
+
+    def matches(self, other: "SectionState", local: bool = False) -> bool:
+        """Başlangıç durumu olarak aynı çıktıyı verir mi (tight-list modu ayrıca denetlenir)."""
+        same = (self.heading, self.eq, self.img, self.plot, self.first) == \
+               (other.heading, other.eq, other.img, other.plot, other.first)
+        if local:
+            same = same and (self.section_no, self.fig_in_section, self.plot_in_section, self.tbl_in_section) == \
+                            (other.section_no, other.fig_in_section, other.plot_in_section, other.tbl_in_section)
+        return same
+
+    def shifted(self, dh: int, de: int, di: int, dp: int) -> "SectionState":
+        return replace(self, heading=self.heading + dh, eq=self.eq + de, img=self.img + di, plot=self.plot + dp,
+                       section_no=self.section_no + dh if self.section_no else 0)
+
+def emit_content_latex(ir: DocumentIR, pkg: DocxPackage | None, lang: str, features: Features,
+                       ctx: ConversionContext, write: Callable[[str], None]) -> None:
+    """
+    content.tex gövdesini IR'den üretir ve parça parça write()'a verir
+    (pkg yalnızca inline görsel baytları için okunur).
+    Her başlıkta o ana kadarki satırlar kesinleşir (geri dönüp düzeltilmez) ve akıtılır;
+    parçaların birleşimi "\\n".join(tüm_satırlar) ile birebir aynıdır.
+    """
+    emit_section_range(ir, pkg, lang, features, ctx, write, ir.content_start or 0, len(ir), SectionState())
+
+def emit_section_range(ir: DocumentIR, pkg: DocxPackage | None, lang: str, features: Features,
+                       ctx: ConversionContext, write: Callable[[str], None],
+                       start: int, end: int, state: SectionState,
+                       section_break: bool | None = None) -> tuple[SectionState, bool | None]:
+    """
+    [start, end) bloklarını state'ten başlayarak üretir.
+    section_break (varsayılan: end < len(ir)) ise aralık bir bölüm başlığından hemen önce biter
+    (split_sections ya da sıradaki belge) ve bölüm, o başlığın yapacağı gibi burada kapatılır;
+    sonraki aralık dönen durumla aynı çıktıyı sürdürür. Aksi halde belge sonu kapanışı yapılır.
+    Döner: (bitiş durumu, tight-list kullanımı): None = mod hiç okunmadı (bitişte başlangıç
+    değeri geçerli), True = ilk okuyan satır madde (çıktı başlangıç moduna bağlı), False = bağımsız.
+    """
+    log = ctx.log
+    _, norm_heading = make_heading_detector(lang)
+    norm_heading = ctx.timer.wrap("classify", norm_heading)
+
+    # Bu dilin IR bayrakları
+    heading_flag = lang_flag(L_HEADING, lang)
+    bib_heading_flag = lang_flag(L_BIB_HEADING, lang)
+    fig_marker_flag = lang_flag(L_FIG_MARKER, lang)
+    near_figure_flag = lang_flag(L_NEAR_FIGURE, lang)
+    near_table_flag = lang_flag(L_NEAR_TABLE, lang)
+    near_flags = near_figure_flag | near_table_flag
+
+    # Aşama ölçümü: ctx.timer kapalıyken (NULL_TIMER) aynı fonksiyonlar döner.
+    timed = _timed_helpers(ctx.timer)
+    parse_caption_marker = timed["parse_caption_marker"]
+    parse_dollars_equation_line = timed["parse_dollars_equation_line"]
+    parse_near_caption_line = timed["parse_near_caption_line"]
+    collect_caption_below = timed["collect_caption_below"]
+    escape_latex = timed["escape_latex"]
+    replace_greek_unicode_after_escape = timed["replace_greek_unicode_after_escape"]
+    split_manual_linebreak_paragraph = timed["split_manual_linebreak_paragraph"]
+    table_to_latex_lines = timed["table_to_latex_lines"]
+    pandoc_docx_paragraph_to_latex_math = timed["pandoc_docx_paragraph_to_latex_math"]
+    normalize_equation_for_latex = timed["normalize_equation_for_latex"]
+    latex_math_to_png = timed["latex_math_to_png"]
+    extract_inline_image_temp = timed["extract_inline_image_temp"]
+    resolve_image_path = timed["resolve_image_path"]
+    resolve_plot_path = timed["resolve_plot_path"]
+    write = ctx.timer.wrap("write", write)
 
     latex_output = []
-    latex_output.append(r"\color{black}")
+    if state.first:
+        latex_output.append(r"\color{black}")
 
-    img_counter_global = 0
-    plot_counter_global = 0
-    eq_counter = 0
+    img_counter_global = state.img
+    plot_counter_global = state.plot
+    eq_counter = state.eq
     last_kind = "none"
 
-    heading_counter = 0
-    current_section_no = 0
+    heading_counter = state.heading
+    current_section_no = state.section_no
 
-    fig_in_section = 0
-    plot_in_section = 0
-    tbl_in_section = 0
+    fig_in_section = state.fig_in_section
+    plot_in_section = state.plot_in_section
+    tbl_in_section = state.tbl_in_section
 
-    tight_list_mode = False
+    tight_list_mode = state.tight
+    tight_use = None
 
     pending_caption_for_table = None
     pending_caption_for_inline_figure = None  # 'Tablo 1: ...' / 'Şekil 2: ...' satırlarını yutmak için
@@ -902,7 +1628,15 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
     in_bib_section = False
     bib_counter = 0
 
-    content_start_para = all_paragraphs[content_start_index] if content_start_index < len(all_paragraphs) else None
+    wrote_any = not state.first
+
+    def flush_output():
+        nonlocal wrote_any
+        if not latex_output:
+            return
+        write(("\n" if wrote_any else "") + "\n".join(latex_output))
+        wrote_any = True
+        latex_output.clear()
 
     def flush_pending_media_without_caption():
         nonlocal pending_media_after_marker, latex_output, last_kind
@@ -912,7 +1646,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
         pending_media_after_marker = None
 
         if m["type"] == "figure":
-            print(_t(lang, "⚠️ UYARI: $fig$ bulundu ama altında --- caption --- yok. Görsel captionsız basıldı.",
+            log(_t(lang, "⚠️ UYARI: $fig$ bulundu ama altında --- caption --- yok. Görsel captionsız basıldı.",
                        "⚠️ WARNING: Found $fig$ marker but no --- caption --- below it. Inserted without caption."))
             if last_kind == "heading":
                 latex_output.append(r"\vspace{\baselineskip}")
@@ -923,7 +1657,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
             last_kind = "figure"
 
         elif m["type"] == "plot":
-            print(_t(lang, "⚠️ UYARI: $plot$ bulundu ama altında --- caption --- yok. Grafik captionsız basıldı.",
+            log(_t(lang, "⚠️ UYARI: $plot$ bulundu ama altında --- caption --- yok. Grafik captionsız basıldı.",
                        "⚠️ WARNING: Found $plot$ marker but no --- caption --- below it. Inserted without caption."))
             latex_output = ensure_prev_sentence_ends_with_period(latex_output, last_kind)
             if last_kind == "heading":
@@ -934,18 +1668,11 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
             latex_output.append("\\end{figure}\n")
             last_kind = "figure"
 
-    blocks = list(iter_block_items(doc))
-
-    # içerik başlangıcına kadar olan blokları atla
-    start_block_index = 0
-    if content_start_para is not None:
-        for bi, (k, o) in enumerate(blocks):
-            if k == "p" and o._element is content_start_para._element:
-                start_block_index = bi
-                break
+    kinds, flags, texts = ir.kinds, ir.flags, ir.texts
+    n_blocks = len(ir)      # ileriye bakışlar (caption arama) end'in ötesini okuyabilir
 
-    # Görsel/Tablo caption satırlarını output'a basmamak için
-    skip_elems: set = set()
+    # Görsel/Tablo caption satırlarını output'a basmamak için (blok indeksleri)
+    skip_blocks: set = set()
 
     # Word bullet/numbered list support (preserve • / numbering as LaTeX itemize/enumerate)
     word_list_open = False
@@ -960,24 +1687,51 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
             word_list_env = "itemize"
             last_kind = "text"
 
+    def close_section():
+        """Başlık öncesi kapanış: bekleyen medya/caption, son cümlenin noktası, \\clearpage."""
+        nonlocal pending_caption_for_table, latex_output
+        flush_pending_media_without_caption()
 
-    for bi in range(start_block_index, len(blocks)):
-        kind, obj = blocks[bi]
+        if pending_caption_for_table is not None:
+            log(_t(lang,
+                     f"⚠️ UYARI: Başlık geldi ama bekleyen tablo caption vardı (kullanılmadı): '{pending_caption_for_table}'",
+                     f"⚠️ WARNING: A heading appeared but there was a pending table caption (not used): '{pending_caption_for_table}'"))
+            pending_caption_for_table = None
 
-        if kind == "p":
-            if obj._element in skip_elems:
+        latex_output = ensure_prev_sentence_ends_with_period(latex_output, last_kind)
+        if latex_output:
+            latex_output.append("\n\\clearpage\n")
+        # buraya kadarki satırlar artık değişmez
+        flush_output()
+
+
+    # --profile: blok başına süre, bloğun ürettiği türe ("text", "table", ...) yazılır.
+    # Çıktı üretmeyen bloklar (boş satır, yutulan caption) bir önceki türe sayılır.
+    profile_blocks = ctx.timer.enabled
+    if profile_blocks:
+        ctx.timer.lap()
+
+    kind = None
+    for bi in range(start, end):
+        if profile_blocks and kind is not None:
+            ctx.timer.lap("block:" + ("table" if kind == BLOCK_TABLE else last_kind))
+        kind = kinds[bi]
+        f = flags[bi]
+
+        if kind == BLOCK_PARA:
+            if bi in skip_blocks:
                 continue
 
-            raw_text = strip_invisible(obj.text or "")
+            raw_text = texts[bi]
             text = raw_text.strip()
 
             # --- NEW: OMML equation paragraphs may have empty text ---
             if text == "":
-                if (not in_bib_section) and features.use_equations and has_omml(obj):
+                if (not in_bib_section) and features.use_equations and f & F_OMML:
                     flush_pending_media_without_caption()
 
                     # Try: OMML -> LaTeX math via pandoc
-                    math_latex = pandoc_docx_paragraph_to_latex_math(obj)
+                    math_latex = pandoc_docx_paragraph_to_latex_math(ir.omml[bi], timer=ctx.timer)
 
                     eq_counter += 1
                     latex_output = ensure_prev_sentence_ends_with_period(latex_output, last_kind)
@@ -995,14 +1749,16 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                         last_kind = "equation"
                     else:
                         # Fallback: render to image and embed
-                        eq_dir = os.path.join("assets", "equations")
-                        os.makedirs(eq_dir, exist_ok=True)
                         png_name = f"eq_{eq_counter:03d}.png"
-                        png_path = os.path.join(eq_dir, png_name).replace("\\", "/")
 
                         # If pandoc failed, we can still try to get something printable:
                         # render a placeholder (or empty) if no math available
-                        ok = latex_math_to_png(r"\text{[Equation]}", os.path.join(eq_dir, png_name))
+                        with tempfile.TemporaryDirectory() as td:
+                            tmp_png = os.path.join(td, png_name)
+                            ok = latex_math_to_png(r"\text{[Equation]}", tmp_png, timer=ctx.timer)
+                            if ok:
+                                with open(tmp_png, "rb") as fh:
+                                    png_path = ctx.write_asset(f"assets/equations/{png_name}", fh.read())
 
                         latex_output.append(r"\begin{equation}")
                         latex_output.append(rf"\tag{{{eq_counter}}}")
@@ -1015,7 +1771,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                         latex_output.append(r"\par")
                         last_kind = "equation"
 
-                elif (not in_bib_section) and features.use_figures and has_inline_image(obj):
+                elif (not in_bib_section) and features.use_figures and f & F_IMAGE:
 
                     flush_pending_media_without_caption()
 
@@ -1025,23 +1781,23 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                         current_section_no = 1
 
                     # 1️⃣ Önce assets/imageX dene (marker sistemi için)
-                    latex_img_path, _ = resolve_image_path(img_counter_global)
+                    latex_img_path, _ = resolve_image_path(img_counter_global, ctx)
 
                     # 2️⃣ Yoksa Word içinden extract et
                     if latex_img_path is None:
-                        latex_img_path = extract_inline_image_temp(obj)
+                        latex_img_path = extract_inline_image_temp(ir.media.get(bi), pkg, ctx)
                     
                     if latex_img_path is None:
-                        print(_t(lang,
+                        log(_t(lang,
                                 f"⚠️ UYARI: Inline görsel extract edilemedi. Figür atlandı.",
                                 f"⚠️ WARNING: Could not extract inline image. Figure skipped."))
                         continue
 
                     # 3️⃣ Caption SADECE alttan ara
                     cap_text = collect_caption_below(
-                        blocks, bi, lang=lang,
+                        ir, bi, lang=lang,
                         want_kind="figure",
-                        skip_elems=skip_elems
+                        skip_blocks=skip_blocks
                     )
 
                     if cap_text:
@@ -1051,7 +1807,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                             fig_no=fig_in_section
                         )
                     else:
-                        print(_t(lang,
+                        log(_t(lang,
                                 "⚠️ UYARI: Görsel bulundu ama caption yok. Captionsız basıldı.",
                                 "⚠️ WARNING: Image found but no caption below. Inserted without caption."))
                         cap_line = None
@@ -1075,9 +1831,8 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
 
 
             # Word bullet/numbered lists (•) -> LaTeX itemize/enumerate
-            is_list_para, list_env = (False, "itemize")
-            if (not in_bib_section) and text and text != "---":
-                is_list_para, list_env = is_word_list_paragraph(obj)
+            is_list_para = bool(f & F_LIST) and (not in_bib_section) and text and text != "---"
+            list_env = "enumerate" if f & F_LIST_ENUM else "itemize"
 
             if is_list_para:
                 flush_pending_media_without_caption()
@@ -1099,7 +1854,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 close_word_list()
 
             # CAPTION MARKER (--- ... ---)
-            cap_inner = parse_caption_marker(text)
+            cap_inner = parse_caption_marker(text) if f & F_CAPTION_MARKER else None
             if cap_inner:
                 # Eğer bir önceki satır $fig$ / $plot$ ise => bu caption o medyaya ait
                 if pending_media_after_marker is not None:
@@ -1139,14 +1894,14 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 if not features.use_tables:
                     continue
                 if pending_caption_for_table is not None:
-                    print(_t(lang,
+                    log(_t(lang,
                              f"⚠️ UYARI: Önceki tablo caption kullanılmadan yenisi geldi. Önceki atlandı: '{pending_caption_for_table}'",
                              f"⚠️ WARNING: New table caption came before the previous one was used. Skipped: '{pending_caption_for_table}'"))
                 pending_caption_for_table = cap_inner
                 continue
 
             # PLOT MARKER ($plot$ / $grafik$) => SADECE assets/plots'tan EKLE
-            if parse_plot_marker_line(text):
+            if f & F_PLOT_MARKER:
                 if not features.use_plots or in_bib_section:
                     flush_pending_media_without_caption()
                     continue
@@ -1158,12 +1913,14 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 if current_section_no == 0:
                     current_section_no = 1
 
-                latex_plot_path, _ = resolve_plot_path(plot_counter_global)
+                latex_plot_path, _ = resolve_plot_path(plot_counter_global, ctx)
                 if latex_plot_path is None:
-                    print(_t(
+                    log(_t(
                         lang,
-                        f"⚠️ UYARI: plot{plot_counter_global}.png bulunamadı (assets/plots/). Grafik atlandı.",
-                        f"⚠️ WARNING: plot{plot_counter_global}.png not found (assets/plots/). Plot skipped."
+                        f"⚠️ UYARI: plot{plot_counter_global - ctx.plot_base} (.png/.pdf) bulunamadı (assets/plots/). "
+                        f"Grafik atlandı.",
+                        f"⚠️ WARNING: plot{plot_counter_global - ctx.plot_base} (.png/.pdf) not found (assets/plots/). "
+                        f"Plot skipped."
                     ))
                     continue
 
@@ -1176,7 +1933,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 continue
 
             # FIGURE MARKER ($fig$ / $şekil$)
-            if parse_figure_marker_line(text, lang):
+            if f & fig_marker_flag:
                 if not features.use_figures or in_bib_section:
                     flush_pending_media_without_caption()
                     continue
@@ -1188,10 +1945,11 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 if current_section_no == 0:
                     current_section_no = 1
 
-                latex_img_path, _ = resolve_image_path(img_counter_global)
+                latex_img_path, _ = resolve_image_path(img_counter_global, ctx)
                 if latex_img_path is None:
-                    print(_t(lang, f"⚠️ UYARI: image{img_counter_global} bulunamadı (assets/ veya kök). Figür atlandı.",
-                               f"⚠️ WARNING: image{img_counter_global} not found (assets/ or root). Figure skipped."))
+                    img_no = img_counter_global - ctx.image_base
+                    log(_t(lang, f"⚠️ UYARI: image{img_no} bulunamadı (assets/ veya kök). Figür atlandı.",
+                               f"⚠️ WARNING: image{img_no} not found (assets/ or root). Figure skipped."))
                     continue
 
                 pending_media_after_marker = {
@@ -1203,7 +1961,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 continue
 
             # EQUATION
-            parsed = parse_dollars_equation_line(text)
+            parsed = parse_dollars_equation_line(text) if f & F_DOLLAR_EQ else None
             if parsed is not None:
                 if in_bib_section or (not features.use_equations):
                     flush_pending_media_without_caption()
@@ -1239,26 +1997,16 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 continue
 
             # HEADINGS
-            if is_heading(text):
-                flush_pending_media_without_caption()
-
-                if pending_caption_for_table is not None:
-                    print(_t(lang,
-                             f"⚠️ UYARI: Başlık geldi ama bekleyen tablo caption vardı (kullanılmadı): '{pending_caption_for_table}'",
-                             f"⚠️ WARNING: A heading appeared but there was a pending table caption (not used): '{pending_caption_for_table}'"))
-                    pending_caption_for_table = None
+            if f & heading_flag:
+                close_section()
 
                 if features.use_bibliography:
-                    in_bib_section = is_bibliography_heading(text, lang=lang, norm_heading_fn=norm_heading)
+                    in_bib_section = bool(f & bib_heading_flag)
                     if in_bib_section:
                         bib_counter = 0
                 else:
                     in_bib_section = False
 
-                latex_output = ensure_prev_sentence_ends_with_period(latex_output, last_kind)
-                if latex_output:
-                    latex_output.append("\n\\clearpage\n")
-
                 heading_counter += 1
                 current_section_no = heading_counter
 
@@ -1283,38 +2031,35 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
             # Bu satırları normal metin olarak basma; ilgili tablo/görsele caption olarak bağla.
             # ----------------------------------------------------------
             if (not in_bib_section):
-                auto_kind, auto_cap = parse_near_caption_line(text, lang=lang)
+                auto_kind, auto_cap = parse_near_caption_line(text, lang=lang) if f & near_flags else (None, None)
 
                 # Tablo caption satırı
                 if auto_kind == "table" and features.use_tables:
                     # Yakında bir tablo var mı? (boş paragrafları atlayarak bak)
                     has_next_table = False
-                    for nb in range(bi + 1, min(len(blocks), bi + 5)):
-                        nk, no = blocks[nb]
-                        if nk == "p":
-                            nt = strip_invisible(no.text or "").strip()
+                    for nb in range(bi + 1, min(n_blocks, bi + 5)):
+                        if kinds[nb] == BLOCK_PARA:
+                            nt = texts[nb].strip()
                             if nt == "":
                                 continue
                             # tablo gelmeden normal bir metin başladıysa aramayı kes
                             break
-                        if nk == "tbl":
+                        if kinds[nb] == BLOCK_TABLE:
                             has_next_table = True
                             break
 
                     if has_next_table:
                         # Bu caption satırını output'a basma
-                        skip_elems.add(obj._element)
+                        skip_blocks.add(bi)
 
                         cap_text = (auto_cap or "").strip()
                         if not cap_text:
                             # Başlık devamı bir sonraki paragraf olabilir
-                            if bi + 1 < len(blocks) and blocks[bi + 1][0] == "p":
-                                cont_p = blocks[bi + 1][1]
-                                cont = strip_invisible(cont_p.text or "").strip()
-                                ck, _ = parse_near_caption_line(cont, lang=lang)
-                                if cont and (ck is None):
+                            if bi + 1 < n_blocks and kinds[bi + 1] == BLOCK_PARA:
+                                cont = texts[bi + 1].strip()
+                                if cont and not (flags[bi + 1] & near_flags):
                                     cap_text = cont
-                                    skip_elems.add(cont_p._element)
+                                    skip_blocks.add(bi + 1)
 
                         # pending_caption_for_table varsa üstüne yazma (marker öncelikli)
                         if cap_text and pending_caption_for_table is None:
@@ -1326,11 +2071,10 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 if auto_kind == "figure" and features.use_figures:
                     # Yakında inline görsel paragrafı var mı?
                     has_next_image = False
-                    for nb in range(bi + 1, min(len(blocks), bi + 5)):
-                        nk, no = blocks[nb]
-                        if nk == "p":
-                            nt = strip_invisible(no.text or "").strip()
-                            if nt == "" and has_inline_image(no):
+                    for nb in range(bi + 1, min(n_blocks, bi + 5)):
+                        if kinds[nb] == BLOCK_PARA:
+                            nt = texts[nb].strip()
+                            if nt == "" and flags[nb] & F_IMAGE:
                                 has_next_image = True
                                 break
                             if nt == "":
@@ -1339,17 +2083,15 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                             break
 
                     if has_next_image:
-                        skip_elems.add(obj._element)
+                        skip_blocks.add(bi)
 
                         cap_text = (auto_cap or "").strip()
                         if not cap_text:
-                            if bi + 1 < len(blocks) and blocks[bi + 1][0] == "p":
-                                cont_p = blocks[bi + 1][1]
-                                cont = strip_invisible(cont_p.text or "").strip()
-                                ck, _ = parse_near_caption_line(cont, lang=lang)
-                                if cont and (ck is None):
+                            if bi + 1 < n_blocks and kinds[bi + 1] == BLOCK_PARA:
+                                cont = texts[bi + 1].strip()
+                                if cont and not (flags[bi + 1] & near_flags):
                                     cap_text = cont
-                                    skip_elems.add(cont_p._element)
+                                    skip_blocks.add(bi + 1)
 
                         if cap_text:
                             pending_caption_for_inline_figure = cap_text
@@ -1388,8 +2130,11 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 escaped = escape_latex(text)
                 escaped = replace_greek_unicode_after_escape(escaped)
 
+                if tight_use is None:
+                    tight_use = bool(f & F_TIGHT_ITEM) and not (f & F_TIGHT_TRIGGER)
+
                 # --- Tight list modu başlatan satır mı? ---
-                if is_tight_list_trigger(text):
+                if f & F_TIGHT_TRIGGER:
                     escaped = escape_latex(text)
                     escaped = replace_greek_unicode_after_escape(escaped)
 
@@ -1402,7 +2147,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                     continue
 
                 # --- Tight list item mı? ---
-                if tight_list_mode and is_tight_list_item(text):
+                if tight_list_mode and f & F_TIGHT_ITEM:
                     escaped = escape_latex(text)
                     escaped = replace_greek_unicode_after_escape(escaped)
 
@@ -1413,7 +2158,7 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                     continue
 
                 # Eğer tight_list_mode açık ama artık madde değilse, modu kapat
-                if tight_list_mode and (not is_tight_list_item(text)):
+                if tight_list_mode and not (f & F_TIGHT_ITEM):
                     tight_list_mode = False
 
                 # --- Normal paragraf (eski davranış) ---
@@ -1425,11 +2170,11 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
                 last_kind = "text"
                 continue
 
-        elif kind == "tbl":
+        elif kind == BLOCK_TABLE:
             close_word_list()
             if not features.use_tables:
                 if pending_caption_for_table is not None:
-                    print(_t(lang,
+                    log(_t(lang,
                              f"⚠️ UYARI: Tablo kapalı ama caption + tablo bulundu. Caption atlandı: '{pending_caption_for_table}'",
                              f"⚠️ WARNING: Tables are disabled but a caption+table was found. Caption skipped: '{pending_caption_for_table}'"))
                     pending_caption_for_table = None
@@ -1442,11 +2187,11 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
 
             if pending_caption_for_table is None:
                 # --- NEW: Tablo gördüğün yerin üst/alt satırlarından "Tablo/Table ..." caption'ını yakala ---
-                near_cap = collect_caption_below(blocks, bi, lang=lang, want_kind="table", skip_elems=skip_elems)
+                near_cap = collect_caption_below(ir, bi, lang=lang, want_kind="table", skip_blocks=skip_blocks)
                 if near_cap:
                     pending_caption_for_table = near_cap
                 else:
-                    print(_t(lang,
+                    log(_t(lang,
                              "⚠️ UYARI: Caption marker olmadan tablo bulundu. Tablo atlandı. (Tablodan önce: --- ... --- yaz)",
                              "⚠️ WARNING: Found a table without a caption marker. Table skipped. (Write --- ... --- before the table)"))
                     continue
@@ -1470,25 +2215,337 @@ def convert_docx_to_latex(docx_filename: str, lang: str, features: Features):
             latex_output.append("\n\\begin{table}[H]")
             latex_output.append("  \\centering")
             latex_output.append(f"  \\caption*{{{escape_latex(cap_full)}}}")
-            latex_output.extend(["  " + ln if ln else "" for ln in table_to_latex_lines(obj)])
+            latex_output.extend(["  " + ln if ln else "" for ln in table_to_latex_lines(ir.cells[bi])])
             latex_output.append("\\end{table}\n")
 
             last_kind = "table"
 
+    if profile_blocks and kind is not None:
+        ctx.timer.lap("block:" + ("table" if kind == BLOCK_TABLE else last_kind))
+
     close_word_list()
-    flush_pending_media_without_caption()
+    if section_break if section_break is not None else end < n_blocks:
+        close_section()
+    else:
+        flush_pending_media_without_caption()
+
+        if pending_caption_for_table is not None and features.use_tables:
+            log(_t(lang,
+                     f"⚠️ UYARI: Tablo caption bulundu ama ardından tablo gelmedi: '{pending_caption_for_table}'",
+                     f"⚠️ WARNING: Table caption found but no table followed: '{pending_caption_for_table}'"))
+
+        flush_output()
+
+    end_state = SectionState(heading_counter, eq_counter, img_counter_global, plot_counter_global,
+                             tight_list_mode, first=not wrote_any, section_no=current_section_no,
+                             fig_in_section=fig_in_section, plot_in_section=plot_in_section,
+                             tbl_in_section=tbl_in_section)
+    return end_state, tight_use
+
+# ================== Bölüm bazlı paralel üretim ==================
+# Başlıklar belgeyi bölümlere ayırır; bölüm içi sayaçlar (fig/plot/tbl_in_section) her başlıkta
+# sıfırlanır, yalnızca SectionState'teki sayaçlar ve tight-list modu bir sonrakine taşınır.
+# Her bölümün başlangıç durumu IR bayraklarından tahmin edilip (önek toplam) işçilere verilir;
+# sonuçlar sırayla birleştirilirken gerçek durum tahminden farklıysa o bölüm ana süreçte
+# yeniden üretilir. Böylece çıktı her durumda seri üretimle birebir aynıdır.
+def split_sections(ir: DocumentIR, lang: str, start: int) -> list[int]:
+    """
+    Bölüm sınırları [start, b1, ..., len(ir)]. Sınır yalnızca her durumda başlık olarak
+    işlenen paragraflardır: liste, caption, marker, denklem ve yakın-caption bayrağı
+    taşıyan başlık satırları (durumuna göre başka türlü işlenebilir) sınır olmaz.
+    """
+    heading_flag = lang_flag(L_HEADING, lang)
+    ambiguous = (F_LIST | F_CAPTION_MARKER | F_PLOT_MARKER | F_DOLLAR_EQ
+                 | lang_flag(L_FIG_MARKER | L_NEAR_FIGURE | L_NEAR_TABLE, lang))
+    kinds, flags = ir.kinds, ir.flags
+    bounds = [start]
+    for i in range(start + 1, len(ir)):
+        if kinds[i] == BLOCK_PARA and flags[i] & heading_flag and not flags[i] & ambiguous:
+            bounds.append(i)
+    bounds.append(len(ir))
+    return bounds
+
+def estimate_section_counts(ir: DocumentIR, lang: str, features: Features, lo: int, hi: int) -> tuple[int, int, int, int]:
+    """
+    [lo, hi) bölümündeki (başlık, denklem, görsel, grafik) sayısının tahmini.
+    Yalnızca işçilere verilecek başlangıç sayaçları için; yanlışsa bölüm yeniden üretilir.
+    """
+    heading_flag = lang_flag(L_HEADING, lang)
+    bib_flag = lang_flag(L_BIB_HEADING, lang)
+    fig_marker_flag = lang_flag(L_FIG_MARKER, lang)
+    caption_of = {"table": lang_flag(L_NEAR_TABLE, lang) | F_CAPTION_MARKER,
+                  "figure": lang_flag(L_NEAR_FIGURE, lang) | F_CAPTION_MARKER}
+    headings = eqs = imgs = plots = 0
+    in_bib = False
+    expect = None           # tablo/görselden sonra ilk dolu satır caption olarak yutulabilir
+    for i in range(lo, hi):
+        f = ir.flags[i]
+        if ir.kinds[i] != BLOCK_PARA:
+            if features.use_tables and not in_bib:
+                expect = "table"
+            continue
+        t = ir.texts[i].strip()
+        if t and expect is not None:
+            consumed = f & caption_of[expect]
+            expect = None
+            if consumed:
+                continue
+        if not t:
+            if not in_bib and features.use_equations and f & F_OMML:
+                eqs += 1
+            elif not in_bib and features.use_figures and f & F_IMAGE:
+                imgs += 1
+                expect = "figure"
+        elif f & F_LIST and not in_bib and t != "---" or f & F_CAPTION_MARKER:
+            continue
+        elif f & F_PLOT_MARKER:
+            plots += features.use_plots and not in_bib
+        elif f & fig_marker_flag:
+            imgs += features.use_figures and not in_bib
+        elif f & F_DOLLAR_EQ:
+            eqs += features.use_equations and not in_bib
+        elif f & heading_flag:
+            headings += 1
+            in_bib = features.use_bibliography and bool(f & bib_flag)
+    return headings, eqs, imgs, plots
+
+def _emit_range_job(docx_path: str, ir_data: tuple, start: int, end: int, section_break: bool | None,
+                    lang: str, features: Features, input_root: str | None, out_dir: str | None,
+                    state: SectionState, profile: bool, asset_base: tuple[int, int] = (0, 0)):
+    """
+    İşçi: IR'nin [start, end) bloklarını üretir; dosyalar, loglar ve profil ana sürece döner.
+    asset_base: (image_base, plot_base), bkz. ConversionContext.
+    """
+    ir = DocumentIR.load(ir_data)
+    logs: list[str] = []
+    chunks: list[str] = []
+    timer = PhaseTimer() if profile else NULL_TIMER
+    ctx = ConversionContext(input_root=input_root, out_dir=out_dir, log=logs.append, timer=timer, keep_assets=True,
+                            image_base=asset_base[0], plot_base=asset_base[1])
+    with DocxPackage(docx_path) as pkg:
+        end_state, tight_use = emit_section_range(ir, pkg, lang, features, ctx, chunks.append,
+                                                  start, end, state, section_break)
+    return chunks, logs, ctx.assets, end_state, tight_use, (timer.as_dict() if profile else None)
+
+def _stitch_speculative(guesses: list[SectionState], local: list[bool], submit, render_local,
+                        ctx: ConversionContext, write: Callable[[str], None],
+                        announce: Callable[[int], None] | None = None) -> list[SectionState]:
+    """
+    Tahmini başlangıç durumlarıyla işçilerde üretilmiş birimleri (bölüm/belge) sırayla akıtır.
+    submit(k, state) -> _emit_range_job future'ı; render_local(k, state) -> bitiş durumu (doğrudan yazar).
+    Gerçek başlangıç durumu tahminle aynı değilse (local[k]: bölüm içi sayaçlar dahil) veya çıktı
+    tight-list moduna bağlıysa birim ana süreçte yeniden üretilir; sonraki tahminler aynı farkla
+    kaydırılıp yeniden gönderilir. Döner: her birimin gerçek başlangıç durumu + son durum.
+    """
+    n = len(guesses)
+    futures = [submit(k, guesses[k]) for k in range(n)]
+    state = SectionState()
+    starts = []
+    for k in range(n):
+        starts.append(state)
+        if announce is not None:
+            announce(k)
+        chunks, logs, assets, end_state, tight_use, prof = futures[k].result()
+        if not guesses[k].matches(state, local[k]) or (tight_use and guesses[k].tight != state.tight):
+            # tahmin tutmadı: birim gerçek durumla burada yeniden üretilir
+            state = render_local(k, state)
+            if k + 1 < n and not (guesses[k + 1].matches(state, True) and guesses[k + 1].tight == state.tight):
+                g = guesses[k + 1]
+                dh, de, di, dp = state.heading - g.heading, state.eq - g.eq, state.img - g.img, state.plot - g.plot
+                guesses[k + 1] = replace(state)
+                for j in range(k + 2, n):
+                    guesses[j] = guesses[j].shifted(dh, de, di, dp)
+                for j in range(k + 1, n):
+                    futures[j].cancel()
+                    futures[j] = submit(j, guesses[j])
+            continue
 
-    if pending_caption_for_table is not None and features.use_tables:
-        print(_t(lang,
-                 f"⚠️ UYARI: Tablo caption bulundu ama ardından tablo gelmedi: '{pending_caption_for_table}'",
-                 f"⚠️ WARNING: Table caption found but no table followed: '{pending_caption_for_table}'"))
+        for rel_path, data in assets.items():
+            ctx.write_asset(rel_path, data)
+        for line in logs:
+            ctx.log(line)
+        for chunk in chunks:
+            write(chunk)
+        if prof:
+            ctx.timer.merge(prof)
+        if tight_use is None:
+            end_state.tight = state.tight
+        state = end_state
+    starts.append(state)
+    return starts
+
+def emit_content_latex_parallel(ir: DocumentIR, docx_path: str, pkg: DocxPackage, lang: str, features: Features,
+                                ctx: ConversionContext, write: Callable[[str], None], jobs: int) -> None:
+    """emit_content_latex ile aynı çıktı; bölümler `jobs` süreçte üretilir, sırayla akıtılır."""
+    bounds = split_sections(ir, lang, ir.content_start or 0)
+    n_sections = len(bounds) - 1
+    if jobs <= 1 or n_sections < 2:
+        emit_content_latex(ir, pkg, lang, features, ctx, write)
+        return
 
-    with open("content.tex", "w", encoding="utf-8") as f:
-        f.write("\n".join(latex_output))
+    guesses = [SectionState()]
+    for lo, hi in zip(bounds[:-2], bounds[1:-1]):
+        h, e, i, p = estimate_section_counts(ir, lang, features, lo, hi)
+        g = guesses[-1]
+        guesses.append(SectionState(g.heading + h, g.eq + e, g.img + i, g.plot + p, first=False))
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    profile = ctx.timer.enabled
+    with ProcessPoolExecutor(max_workers=min(jobs, n_sections)) as pool:
+        def submit(k, state):
+            lo, hi = bounds[k], bounds[k + 1]
+            part = ir.slice(lo, min(len(ir), hi + CAPTION_LOOKAHEAD))
+            return pool.submit(_emit_range_job, docx_path, part.dump(), 0, hi - lo, None, lang, features,
+                               ctx.input_root, ctx.out_dir, state, profile)
+
+        def render_local(k, state):
+            end_state, _ = emit_section_range(ir, pkg, lang, features, ctx, write, bounds[k], bounds[k + 1], state)
+            return end_state
+
+        # bölümler başlıkla başlar: bölüm içi sayaçlar başlıkta sıfırlanır
+        _stitch_speculative(guesses, [False] * n_sections, submit, render_local, ctx, write)
+
+# ================== Çok belgeli rapor ==================
+# Grup raporları üye/bölüm başına ayrı .docx olarak yazılır. Belgeler verilen sırayla tek
+# content.tex/toc.tex'e birleşir: başlık (sec:N), denklem, görsel/grafik sayaçları ve üretilen
+# dosya adları belgeler boyunca sürer; her belge bir bölüm başlığı gibi yeni sayfadan başlar.
+# $fig$/$plot$ dosyaları (imageN, plotN) bu sürekli numarayla, belgenin kendi klasöründe aranır.
+def _parse_ir_job(docx_path: str, lang: str, ir_cache: bool, profile: bool):
+    """İşçi: belgeyi ayrıştırır (veya önbellekten okur); IR yerleşik tiplerle döner."""
+    logs: list[str] = []
+    timer = PhaseTimer() if profile else NULL_TIMER
+    ctx = ConversionContext(log=logs.append, timer=timer, ir_cache=ir_cache)
+    with DocxPackage(docx_path) as pkg:
+        ir = load_or_parse_ir(docx_path, pkg, ctx, lang)
+    return ir.dump(), logs, (timer.as_dict() if profile else None)
+
+def starts_with_heading(ir: DocumentIR, lang: str) -> bool:
+    """İçerik her durumda başlık sayılan bir paragrafla mı başlıyor (bölüm içi sayaçlar orada sıfırlanır)?"""
+    start = ir.content_start or 0
+    if start >= len(ir) or ir.kinds[start] != BLOCK_PARA:
+        return False
+    ambiguous = (F_LIST | F_CAPTION_MARKER | F_PLOT_MARKER | F_DOLLAR_EQ
+                 | lang_flag(L_FIG_MARKER | L_NEAR_FIGURE | L_NEAR_TABLE, lang))
+    f = ir.flags[start]
+    return bool(f & lang_flag(L_HEADING, lang)) and not f & ambiguous
+
+def convert_docx_files_to_latex(docx_filenames: list[str], lang: str, features: Features,
+                                out_dir: str | None = None, input_root: str | None = None,
+                                log: Callable[[str], None] = print,
+                                timer: PhaseTimer | None = None,
+                                ir_cache: bool = True, jobs: int = 1,
+                                fragments: bool = False, only_sections: tuple[int, ...] = ()) -> bool:
+    """
+    Sıralı .docx listesi -> tek toc.tex + content.tex.
+    out_dir verilmezse ilk belgenin klasörü; input_root verilmezse her belge kendi klasöründe aranır.
+    jobs > 1: belgeler süreç havuzunda ayrıştırılır ve üretilir; çıktı jobs=1 ile aynıdır.
+    """
+    docx_filenames = [os.path.abspath(p) for p in docx_filenames]
+    ctx = ConversionContext(
+        out_dir=out_dir or os.path.dirname(docx_filenames[0]),
+        log=log,
+        timer=timer or NULL_TIMER,
+        ir_cache=ir_cache,
+        fragments=fragments or bool(only_sections),
+        only_sections=tuple(only_sections),
+    )
+    return convert_docx_files_with_context(docx_filenames, lang, features, ctx, input_root=input_root, jobs=jobs)
+
+def convert_docx_files_with_context(docx_filenames: list[str], lang: str, features: Features,
+                                    ctx: ConversionContext, input_root: str | None = None, jobs: int = 1) -> bool:
+    log = ctx.log
+    for path in docx_filenames:
+        if not os.path.exists(path):
+            name, folder = os.path.basename(path), os.path.dirname(path)
+            log(_t(lang, f"❌ {name} bulunamadı! (Klasör: {folder})", f"❌ {name} not found! (Folder: {folder})"))
+            return False
+    if not docx_filenames:
+        return False
+
+    os.makedirs(ctx.out_dir, exist_ok=True)
+    n = len(docx_filenames)
+    roots = [input_root or os.path.dirname(p) for p in docx_filenames]
+    names = [os.path.basename(p) for p in docx_filenames]
+
+    def asset_base(state: SectionState) -> tuple[int, int]:
+        # ortak input_root: tek klasör, sürekli numara; yoksa her belge kendi imageN/plotN'ini 1'den sayar
+        return (0, 0) if input_root else (state.img, state.plot)
+
+    def doc_ctx(k: int, state: SectionState) -> ConversionContext:
+        # assets sözlüğü ve log paylaşılır; arama klasörü ve yerel numara belgeye özgüdür
+        image_base, plot_base = asset_base(state)
+        return replace(ctx, input_root=roots[k], image_base=image_base, plot_base=plot_base)
+
+    def announce(k: int):
+        log(f"📄 {names[k]}")
+
+    irs: list[DocumentIR] = []
+    with content_writer(ctx, lang) as write:
+        if jobs <= 1 or n < 2:
+            state = SectionState()
+            starts = []
+            for k, path in enumerate(docx_filenames):
+                announce(k)
+                starts.append(state)
+                with DocxPackage(path) as pkg:
+                    ir = load_or_parse_ir(path, pkg, ctx, lang)
+                    state, _ = emit_section_range(ir, pkg, lang, features, doc_ctx(k, state), write,
+                                                  ir.content_start or 0, len(ir), state, section_break=k < n - 1)
+                irs.append(ir)
+            starts.append(state)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            profile = ctx.timer.enabled
+            with ProcessPoolExecutor(max_workers=min(jobs, n)) as pool:
+                parsed = [pool.submit(_parse_ir_job, p, lang, ctx.ir_cache, profile) for p in docx_filenames]
+                for fut in parsed:
+                    ir_data, logs, prof = fut.result()
+                    irs.append(DocumentIR.load(ir_data))
+                    for line in logs:
+                        log(line)
+                    if prof:
+                        ctx.timer.merge(prof)
+
+                guesses = [SectionState()]
+                for ir in irs[:-1]:
+                    h, e, i, p = estimate_section_counts(ir, lang, features, ir.content_start or 0, len(ir))
+                    g = guesses[-1]
+                    guesses.append(SectionState(g.heading + h, g.eq + e, g.img + i, g.plot + p, first=False,
+                                                section_no=g.heading + h if h else g.section_no))
+                local = [not starts_with_heading(ir, lang) for ir in irs]
+
+                def submit(k, state):
+                    ir = irs[k]
+                    return pool.submit(_emit_range_job, docx_filenames[k], ir.dump(), ir.content_start or 0, len(ir),
+                                       k < n - 1, lang, features, roots[k], ctx.out_dir, state, profile,
+                                       asset_base(state))
+
+                def render_local(k, state):
+                    ir = irs[k]
+                    with DocxPackage(docx_filenames[k]) as pkg:
+                        end_state, _ = emit_section_range(ir, pkg, lang, features, doc_ctx(k, state), write,
+                                                          ir.content_start or 0, len(ir), state, section_break=k < n - 1)
+                    return end_state
+
+                starts = _stitch_speculative(guesses, local, submit, render_local, ctx, write, announce)
+
+    # toc: her belgenin başlıkları, o belgeden önce üretilen başlık sayısı kadar kaydırılır (sec:N)
+    toc_entries = []
+    for ir, st in zip(irs, starts):
+        toc_entries.extend((st.heading + num, title) for num, title in collect_toc_entries(ir, lang))
+    with ctx.timer.span("write"):
+        write_toc_tex_with_pagenum(toc_entries, lang=lang, out_path=ctx.output_path("toc.tex"))
+
+    log(_t(lang, "\n === Sonuçlar ===", "\n=== Results ==="))
+    log(_t(lang, f"✅ Dil = {lang}", f"✅ Lang = {lang}"))
+    log(_t(lang, f"✅ Birleştirilen belge: {n}", f"✅ Merged documents: {n}"))
+    log(_t(lang, "✅ toc.tex yazıldı.", "✅ toc.tex written."))
+    log(_t(lang, f"✅ Başlık sayısı: {len(toc_entries)}", f"✅ Title number: {len(toc_entries)}"))
+    log("✅ " + _t(lang, "content.tex yazıldı.", "content.tex written."))
+    return True
 
-    print("✅ " + _t(lang, "content.tex yazıldı.", "content.tex written."))
-    print("ℹ️ " + _t(lang, "Sayfa numaraları için PDF'yi en az 2 kez derlemen gerekebilir (ilkinde ?? çıkabilir).",
-                      "You may need to compile the PDF at least twice for page numbers (?? may appear the first time)."))
 
 if __name__ == "__main__":
     lang = ask_language()
@@ -0,0 +1,369 @@
+"""
+PaperX yerel dönüşüm sunucusu.
+
+Sıcak (python-docx, lxml, pandas/matplotlib önceden yüklenmiş) bir işçi süreç
+havuzu tutar; böylece editörler ve toplu sistemler her iş için Python açılışı,
+import ve araç (pandoc, xelatex ...) arama maliyetini ödemez.
+
+Protokol: yerel HTTP/1.1 (TCP veya Unix soketi), tek istek / bağlantı.
+  POST /convert?lang=tr&figures=1&...&input_root=...&out_dir=...
+       gövde: .docx baytları
+  POST /plots
+       gövde: {"excel": "...", "lang": "tr", "out_dir": "...", "plots": [{"degree": 2, "x": "A", "y": ["B"]}]}
+       (PaperX_plots.load_plot_job çıktısı: yollar mutlak; grafik başına workbook/sheet/name/etiketler olabilir)
+  GET  /health
+
+Yanıtlar chunked NDJSON olay akışıdır; her satır bir olay:
+  {"event": "queued", "position": 1}
+  {"event": "content", "data": "..."}        (convert, başlık sınırlarında; işçi ürettikçe gönderilir)
+  {"event": "log", "line": "..."}            (plots: işçi ürettikçe; convert: iş bitince)
+  {"event": "toc", "data": "..."}            (convert, iş bitince)
+  {"event": "asset", "path": "assets/...", "data": "<base64>"}
+  {"event": "done", "ok": true, "seconds": 0.42, ...}
+İşçi, parçaları iş başına bir Manager kuyruğuna koyar; sunucu onları iş sürerken istemciye aktarır.
+
+Kuyruk dolarsa iş kabul edilmez: 503 + Retry-After (geri basınç).
+"""
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 200 * 1024 * 1024
+
+TOOLS = ("pandoc", "xelatex", "pdflatex", "magick", "pdftocairo")
+
+
+# ================== Worker side ==================
+def _warm_worker():
+    """Havuz işçisi açılırken ağır modülleri yükler ve araçları bir kez arar."""
+    import docx  # noqa: F401
+    import PaperX_plots  # noqa: F401
+    import PaperX_report
+
+    for tool in TOOLS:
+        PaperX_report.find_tool(tool)
+
+
+# İşçiler stream'e (Manager kuyruğu) (olay, veri) çiftleri koyar; bitiş işaretini (None)
+# sunucu tarafı koyar, böylece iş hata verse de akış kapanır.
+def _job_convert(stream, data: bytes, lang: str, feature_values: dict, input_root: str | None,
+                 out_dir: str | None) -> dict:
+    from PaperX_report import Features, convert_docx_in_memory
+
+    t0 = time.perf_counter()
+    res = convert_docx_in_memory(
+        data, lang, Features(**feature_values),
+        input_root=input_root, writer=lambda chunk: stream.put(("content", chunk)), out_dir=out_dir,
+    )
+    return {
+        "toc": res.toc,
+        "assets": res.assets,
+        "log": res.log,
+        "headings": len(res.toc_entries),
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def _job_plots(stream, job: dict) -> dict:
+    from PaperX_plots import generate_plots, plot_specs_from_dicts
+
+    t0 = time.perf_counter()
+    specs = plot_specs_from_dicts(job["plots"])
+    meta = generate_plots(
+        job.get("excel"), specs, job.get("lang", "tr"),
+        base_dir=job.get("out_dir") or os.path.dirname(os.path.abspath(job["excel"] or specs[0].workbook)),
+        log=lambda line: stream.put(("log", line)),
+    )
+    return {"meta": meta, "seconds": time.perf_counter() - t0}
+
+
+# ================== Server side ==================
+@dataclass
+class _Job:
+    fn: object
+    args: tuple
+    stream: object = None                               # Manager().Queue(): işçiden akan olaylar
+    started: asyncio.Event = field(default_factory=asyncio.Event)
+    done: asyncio.Future = field(default=None)
+
+
+class ConversionServer:
+    """
+    Sınırlı kuyruk + sıcak süreç havuzu.
+    workers: işçi süreç sayısı, queue_size: bekleyebilecek en fazla iş.
+    """
+
+    def __init__(self, workers: int | None = None, queue_size: int = 16):
+        self.workers = workers or (os.cpu_count() or 1)
+        self.queue_size = queue_size
+        self.queue: asyncio.Queue | None = None
+        self.pool: ProcessPoolExecutor | None = None
+        self.manager = None
+        self.drains: ThreadPoolExecutor | None = None    # akış kuyruklarını bekleyen iş parçacıkları
+        self.running = 0
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str | None = None):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        self.manager = multiprocessing.Manager()
+        # yalnızca çalışan işler akıtılır (bkz. _run_job): işçi başına bir iş parçacığı yeter
+        self.drains = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="paperx-stream")
+        # işçileri hemen ısıt (ilk iş beklemesin)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_worker) for _ in range(self.workers)))
+
+        dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        if unix_path:
+            server = await asyncio.start_unix_server(self._handle, path=unix_path)
+            where = unix_path
+        else:
+            server = await asyncio.start_server(self._handle, host=host, port=port)
+            where = f"http://{host}:{port}"
+        print(f"PaperX server: {where} ({self.workers} workers, queue {self.queue_size})")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for d in dispatchers:
+                d.cancel()
+            self.pool.shutdown(cancel_futures=True)
+            self.drains.shutdown(wait=False, cancel_futures=True)
+            self.manager.shutdown()
+            if unix_path and os.path.exists(unix_path):
+                os.unlink(unix_path)
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            self.running += 1
+            job.started.set()
+            try:
+                result = await loop.run_in_executor(self.pool, job.fn, job.stream, *job.args)
+                if not job.done.done():
+                    job.done.set_result(result)
+            except Exception as e:
+                if not job.done.done():
+                    job.done.set_exception(e)
+            finally:
+                job.stream.put(None)    # işçinin koyduklarından sonra: akışın sonu
+                self.running -= 1
+                self.queue.task_done()
+
+    # ---------- HTTP ----------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, target, headers = await _read_request_head(reader)
+            length = int(headers.get("content-length", "0") or 0)
+            if length > MAX_BODY_BYTES:
+                await _send_json(writer, 413, {"error": "request body too large"})
+                return
+            body = await reader.readexactly(length) if length else b""
+
+            url = urlsplit(target)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+            if method == "GET" and url.path == "/health":
+                await _send_json(writer, 200, {
+                    "workers": self.workers,
+                    "running": self.running,
+                    "queued": self.queue.qsize(),
+                    "queue_size": self.queue_size,
+                })
+            elif method == "POST" and url.path == "/convert":
+                await self._run_job(writer, _job_convert, _convert_args(body, query), _convert_events)
+            elif method == "POST" and url.path == "/plots":
+                job = json.loads(body.decode("utf-8"))
+                await self._run_job(writer, _job_plots, (job,), _plots_events)
+            else:
+                await _send_json(writer, 404, {"error": f"no route for {method} {url.path}"})
+        except (ValueError, KeyError, TypeError) as e:
+            await _send_json(writer, 400, {"error": str(e)})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _run_job(self, writer, fn, args: tuple, to_events):
+        loop = asyncio.get_running_loop()
+        job = _Job(fn=fn, args=args, stream=self.manager.Queue(), done=loop.create_future())
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            await _send_json(writer, 503, {"error": "server busy, queue full"}, extra_headers={"Retry-After": "1"})
+            return
+
+        await _start_stream(writer)
+        await _send_event(writer, {"event": "queued", "position": self.queue.qsize()})
+        await job.started.wait()
+        while True:
+            item = await loop.run_in_executor(self.drains, job.stream.get)
+            if item is None:
+                break
+            kind, data = item
+            await _send_event(writer, {"event": kind, "line" if kind == "log" else "data": data})
+        try:
+            result = await job.done
+        except Exception as e:
+            await _send_event(writer, {"event": "done", "ok": False, "error": f"{type(e).__name__}: {e}"})
+        else:
+            for ev in to_events(result):
+                await _send_event(writer, ev)
+        await _end_stream(writer)
+
+
+def _convert_args(body: bytes, query: dict) -> tuple:
+    from PaperX_report import Features
+
+    if not body:
+        raise ValueError("empty .docx body")
+    lang = query.get("lang", "tr")
+    if lang not in ("tr", "en"):
+        raise ValueError("lang must be 'tr' or 'en'")
+    feature_values = {}
+    for f in fields(Features):
+        flag = f.name.removeprefix("use_")
+        if flag in query:
+            feature_values[f.name] = query[flag] not in ("0", "false", "no")
+    return body, lang, feature_values, query.get("input_root"), query.get("out_dir")
+
+
+def _convert_events(result: dict):
+    """İş bittikten sonraki olaylar (content parçaları iş sürerken gönderildi)."""
+    yield {"event": "toc", "data": result["toc"]}
+    for path, data in result["assets"].items():
+        yield {"event": "asset", "path": path, "data": base64.b64encode(data).decode("ascii")}
+    for line in result["log"]:
+        yield {"event": "log", "line": line}
+    yield {"event": "done", "ok": True, "seconds": result["seconds"], "headings": result["headings"]}
+
+
+def _plots_events(result: dict):
+    yield {"event": "done", "ok": True, "seconds": result["seconds"], "meta": result["meta"]}
+
+
+# ================== HTTP helpers ==================
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+async def _read_request_head(reader: asyncio.StreamReader):
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    parts = request_line.split(" ")
+    if len(parts) != 3:
+        raise ValueError(f"bad request line: {request_line!r}")
+    method, target, _ = parts
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+async def _send_json(writer, status: int, obj: dict, extra_headers: dict | None = None):
+    body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    head = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+    ]
+    for k, v in (extra_headers or {}).items():
+        head.append(f"{k}: {v}")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def _start_stream(writer):
+    writer.write(
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: application/x-ndjson; charset=utf-8\r\n"
+        b"Transfer-Encoding: chunked\r\n"
+        b"Connection: close\r\n\r\n"
+    )
+    await writer.drain()
+
+
+async def _send_event(writer, event: dict):
+    data = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+    writer.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+    await writer.drain()
+
+
+async def _end_stream(writer):
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str | None = None,
+          workers: int | None = None, queue_size: int = 16):
+    server = ConversionServer(workers=workers, queue_size=queue_size)
+    try:
+        asyncio.run(server.serve(host=host, port=port, unix_path=unix_path))
+    except KeyboardInterrupt:
+        pass
+
+
+# ================== Thin client ==================
+def _connect(host: str, port: int, unix_path: str | None, timeout: float | None):
+    import http.client
+    import socket
+
+    if not unix_path:
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    class UnixHTTPConnection(http.client.HTTPConnection):
+        def connect(self):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            if self.timeout is not None:
+                self.sock.settimeout(self.timeout)
+            self.sock.connect(unix_path)
+
+    return UnixHTTPConnection("localhost", timeout=timeout)
+
+
+def request_events(method: str, path: str, body: bytes | None = None,
+                   host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str | None = None,
+                   timeout: float | None = None):
+    """
+    Sunucuya istek atar ve yanıt olaylarını sırayla üretir (yield).
+    Akış yanıtı değilse (hata, /health) tek bir sözlük üretilir.
+    """
+    conn = _connect(host, port, unix_path, timeout)
+    try:
+        conn.request(method, path, body=body, headers={"Content-Length": str(len(body or b""))})
+        resp = conn.getresponse()
+        if resp.status != 200 or "ndjson" not in (resp.getheader("Content-Type") or ""):
+            payload = json.loads(resp.read().decode("utf-8") or "{}")
+            if resp.status != 200:
+                payload = {"event": "done", "ok": False, "status": resp.status,
+                           "error": payload.get("error", resp.reason)}
+            yield payload
+            return
+        while True:
+            line = resp.readline()
+            if not line:
+                break
+            yield json.loads(line.decode("utf-8"))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    serve()
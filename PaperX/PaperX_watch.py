@@ -0,0 +1,355 @@
+"""
+PaperX izleme modu (paperx watch).
+
+Word belgesi, assets/ klasörü ve (verilirse) grafik işinin Excel kaynağı izlenir;
+kaydedildikçe yalnızca etkilenen kısım yeniden üretilir ve LaTeX derlemesi tetiklenir:
+  .docx değişti          -> dönüşüm (bölüm parçaları: içeriği aynı kalan sec_NN.tex'e dokunulmaz)
+  Excel / iş dosyası     -> grafikler yeniden üretilir
+  assets/ dosya kümesi   -> dönüşüm (imageN/plotN bulunabilirliği LaTeX'i değiştirir)
+  assets/ dosya içeriği  -> yalnızca derleme (LaTeX yolu aynı kalır)
+
+Linux'ta inotify (ctypes, ek paket yok) kullanılır; yoksa veya açılamazsa periyodik
+stat karşılaştırmasına (polling) düşülür. Olaylar yalnızca uyandırır: ne değiştiği,
+debounce süresi sessiz geçtikten sonra alınan anlık görüntülerin farkından bulunur.
+Word'ün bir kayıtta yaptığı birkaç yazma (geçici dosya + yeniden adlandırma) tek tura iner.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import shlex
+import struct
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from PaperX_report import Features, _t, convert_docx_to_latex, find_tool
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".pdf")
+# dönüşümün kendi yazdığı klasörler (out_dir belgenin klasörüyse) izlenmez
+OUTPUT_ASSET_DIRS = ("temp", "equations")
+
+
+# ================== Anlık görüntü ==================
+def _sig(path: str | None):
+    """Dosya imzası (mtime_ns, boyut); yoksa None."""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def scan_assets(assets_dir: str) -> dict[str, tuple]:
+    """assets/ altındaki görsel dosyaları: göreli yol -> imza (çıktı klasörleri hariç)."""
+    out = {}
+    for root, dirs, files in os.walk(assets_dir):
+        if root == assets_dir:
+            dirs[:] = [d for d in dirs if d not in OUTPUT_ASSET_DIRS]
+        for name in files:
+            if name.lower().endswith(IMAGE_EXTS):
+                path = os.path.join(root, name)
+                sig = _sig(path)
+                if sig is not None:
+                    out[os.path.relpath(path, assets_dir).replace("\\", "/")] = sig
+    return out
+
+
+@dataclass
+class WatchTargets:
+    docx: str
+    out_dir: str
+    plots_job: str | None = None     # submit-plots ile aynı JSON/TOML iş dosyası
+    excel: list[str] = field(default_factory=list)     # iş dosyasının okuduğu çalışma kitapları
+
+    @property
+    def assets_dir(self) -> str:
+        return os.path.join(os.path.dirname(self.docx), "assets")
+
+    def dirs(self) -> list[str]:
+        """İzlenecek klasörler (dosyaların kendisi değil: Word kaydı yeniden adlandırmayla biter)."""
+        out = [os.path.dirname(self.docx), self.assets_dir]
+        for p in (self.plots_job, *self.excel):
+            if p:
+                out.append(os.path.dirname(p))
+        return list(dict.fromkeys(out))
+
+    def snapshot(self) -> dict:
+        return {
+            "docx": _sig(self.docx),
+            "job": _sig(self.plots_job),
+            "excel": tuple((p, _sig(p)) for p in self.excel),
+            "assets": scan_assets(self.assets_dir) if os.path.isdir(self.assets_dir) else {},
+        }
+
+
+def diff_snapshots(old: dict, new: dict) -> set[str]:
+    """
+    Değişen kısımlar: "docx", "job", "excel", "assets" (içerik) ve "asset_set" (eklenen/silinen).
+    Word kaydederken belge kısa süre yok olabilir: yokken değişiklik sayılmaz.
+    """
+    changed = set()
+    for key in ("docx", "job", "excel"):
+        if new[key] is not None and new[key] != old[key]:
+            changed.add(key)
+    if new["assets"].keys() != old["assets"].keys():
+        changed.add("asset_set")
+    elif new["assets"] != old["assets"]:
+        changed.add("assets")
+    return changed
+
+
+# ================== Olay kaynakları ==================
+class InotifyWatcher:
+    """Linux inotify (ctypes). wait() olay gelirse True döner; alt klasörler de izlenir."""
+
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, dirs: list[str]):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, str] = {}
+        for d in dirs:
+            for root, subdirs, _ in os.walk(d):
+                self._add(root)
+
+    def _add(self, path: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.MASK)
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def wait(self, timeout: float | None) -> bool:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        self.drain()
+        return True
+
+    def drain(self):
+        """Bekleyen olayları okuyup atar; yeni klasörleri izlemeye ekler."""
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            pos = 0
+            while pos < len(data):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(data, pos)
+                pos += self._EVENT.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+                if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO) and wd in self._dirs:
+                    self._add(os.path.join(self._dirs[wd], os.fsdecode(name)))
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Yedek: her `interval` saniyede anlık görüntü alır; fark varsa wait() True döner."""
+
+    def __init__(self, targets: WatchTargets, interval: float = 1.0):
+        self.targets = targets
+        self.interval = interval
+        self._last = targets.snapshot()
+
+    def wait(self, timeout: float | None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            step = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(step)
+            snap = self.targets.snapshot()
+            if snap != self._last:
+                self._last = snap
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def drain(self):
+        self._last = self.targets.snapshot()
+
+    def close(self):
+        pass
+
+
+def open_watcher(targets: WatchTargets, poll: bool = False, interval: float = 1.0):
+    """inotify açılabiliyorsa onu, değilse polling izleyiciyi döndürür."""
+    if not poll:
+        try:
+            return InotifyWatcher([d for d in targets.dirs() if os.path.isdir(d)])
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(targets, interval)
+
+
+# ================== Derleme ==================
+def run_build(out_dir: str, command: str, lang: str, log: Callable[[str], None] = print) -> bool:
+    """
+    out_dir'de LaTeX derlemesi. command "auto" ise latexmk, yoksa pdflatex (iki kez:
+    içindekiler ve sayfa numaraları için); aksi halde verilen komut out_dir'de çalışır.
+    """
+    if command == "auto":
+        if not os.path.exists(os.path.join(out_dir, "main.tex")):
+            log(_t(lang, f"⚠️ UYARI: {out_dir} içinde main.tex yok; derleme atlandı.",
+                         f"⚠️ WARNING: No main.tex in {out_dir}; build skipped."))
+            return False
+        if find_tool("latexmk"):
+            commands = [["latexmk", "-pdf", "-interaction=nonstopmode", "main.tex"]]
+        elif find_tool("pdflatex"):
+            commands = [["pdflatex", "-interaction=nonstopmode", "-halt-on-error", "main.tex"]] * 2
+        else:
+            log(_t(lang, "⚠️ UYARI: latexmk/pdflatex bulunamadı; derleme atlandı.",
+                         "⚠️ WARNING: latexmk/pdflatex not found; build skipped."))
+            return False
+    else:
+        commands = [shlex.split(command)]
+
+    t0 = time.perf_counter()
+    for cmd in commands:
+        res = subprocess.run(cmd, cwd=out_dir, capture_output=True, text=True, errors="replace")
+        if res.returncode != 0:
+            tail = "\n".join((res.stdout or res.stderr or "").strip().splitlines()[-5:])
+            log(_t(lang, f"❌ Derleme başarısız ({cmd[0]}):\n{tail}", f"❌ Build failed ({cmd[0]}):\n{tail}"))
+            return False
+    log(_t(lang, f"✅ Derlendi ({time.perf_counter() - t0:.2f} sn)", f"✅ Built ({time.perf_counter() - t0:.2f} s)"))
+    return True
+
+
+# ================== İzleme döngüsü ==================
+@dataclass
+class WatchSession:
+    targets: WatchTargets
+    lang: str
+    features: Features
+    build: str | None = None         # None: derleme yok, "auto" veya komut
+    section_jobs: int = 1
+    log: Callable[[str], None] = field(default=print)
+    _assets_before: dict = field(default_factory=dict, repr=False)
+
+    def load_plots_job(self) -> dict | None:
+        if not self.targets.plots_job:
+            return None
+        from PaperX_plots import load_plot_job
+
+        job = load_plot_job(self.targets.plots_job)
+        job.setdefault("lang", self.lang)
+        workbooks = [job["excel"], *(item.get("workbook") for item in job["plots"])]
+        self.targets.excel = list(dict.fromkeys(p for p in workbooks if p))
+        return job
+
+    def regenerate_plots(self) -> bool:
+        from PaperX_plots import run_plot_job
+
+        try:
+            job = self.load_plots_job()
+            run_plot_job(job, log=self.log, jobs=job.get("jobs") or 1)
+        except FileNotFoundError as e:
+            self.log(str(e))
+            return False
+        return True
+
+    def convert(self) -> bool:
+        t0 = time.perf_counter()
+        lines: list[str] = []
+        ok = convert_docx_to_latex(self.targets.docx, self.lang, self.features, out_dir=self.targets.out_dir,
+                                   log=lines.append, ir_cache=True, section_jobs=self.section_jobs,
+                                   fragments=True)
+        for line in lines:
+            if line.startswith(("⚠️", "❌", "ℹ️ Bölüm parçaları", "ℹ️ Section fragments")):
+                self.log(line)
+        name = os.path.basename(self.targets.docx)
+        if ok:
+            self.log(_t(self.lang, f"✅ {name} dönüştürüldü ({time.perf_counter() - t0:.2f} sn)",
+                                   f"✅ {name} converted ({time.perf_counter() - t0:.2f} s)"))
+        return ok
+
+    def process(self, changed: set[str], first: bool = False) -> None:
+        """Tek tur: değişen kısma göre grafik / dönüşüm / derleme."""
+        try:
+            rebuilt = False
+            if self.targets.plots_job and (first or changed & {"job", "excel"}):
+                if self.regenerate_plots():
+                    rebuilt = True
+                    # grafik dosya kümesi değiştiyse $plot$ çözümü de değişir
+                    if scan_assets(self.targets.assets_dir).keys() != self._assets_before.keys():
+                        changed.add("asset_set")
+            if first or changed & {"docx", "asset_set"}:
+                if not self.convert():
+                    return
+                rebuilt = True
+            if self.build and (rebuilt or "assets" in changed):
+                run_build(self.targets.out_dir, self.build, self.lang, self.log)
+        except Exception as e:  # kayıt yarıda okunduysa bir sonraki olay yeniden dener
+            self.log(f"❌ {type(e).__name__}: {e}")
+
+    def _settled(self, before: dict) -> dict:
+        """
+        İşlemden sonraki karşılaştırma tabanı. docx/iş/Excel imzaları işlem ÖNCESİ görüntüden kalır
+        (işlem sürerken yapılan kayıt kaybolmaz); assets ve iş dosyasıyla yeni eklenen çalışma
+        kitapları şimdiki halinden alınır (kendi yazdığımız grafikler değişiklik sayılmaz).
+        """
+        now = self.targets.snapshot()
+        old_excel = dict(before["excel"])
+        return dict(before, assets=now["assets"],
+                    excel=tuple((p, old_excel.get(p, sig)) for p, sig in now["excel"]))
+
+    def run(self, debounce: float = 0.5, poll: bool = False, interval: float = 1.0,
+            stop: Callable[[], bool] | None = None) -> None:
+        """Ctrl+C (veya stop() True) gelene kadar izler."""
+        self.load_plots_job()
+        prev = self.targets.snapshot()
+        self._assets_before = prev["assets"]
+        self.process(set(), first=True)
+        watcher = open_watcher(self.targets, poll=poll, interval=interval)
+        self.log(_t(self.lang,
+                    f"👀 İzleniyor ({'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'}): "
+                    f"{self.targets.docx} — durdurmak için Ctrl+C",
+                    f"👀 Watching ({'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'}): "
+                    f"{self.targets.docx} — press Ctrl+C to stop"))
+        try:
+            watcher.drain()
+            prev = self._settled(prev)
+            # işlem sürerken gelen kayıtların olayları boşaltıldı: fark varsa beklemeden yeni tur
+            pending = bool(diff_snapshots(prev, self.targets.snapshot()))
+            while stop is None or not stop():
+                if not pending and not watcher.wait(0.5 if stop is not None else None):
+                    continue
+                pending = False
+                # debounce: olaylar `debounce` saniye kesilene kadar bekle
+                while watcher.wait(debounce):
+                    pass
+                snap = self.targets.snapshot()
+                changed = diff_snapshots(prev, snap)
+                if not changed:
+                    continue
+                self._assets_before = snap["assets"]
+                self.process(changed)
+                # kendi yazdıklarımız (grafikler, IR önbelleği, çıktı) bir sonraki tura sayılmaz
+                watcher.drain()
+                prev = self._settled(snap)
+                pending = bool(diff_snapshots(prev, self.targets.snapshot()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
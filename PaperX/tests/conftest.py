@@ -0,0 +1,5 @@
+import os
+import sys
+
+# modüller paket değil, PaperX/ klasöründe düz dosyalar
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,26 @@
+import zipfile
+
+import pytest
+
+from PaperX_bench import MEMORY_DOC_PER100, build_synthetic_docx, measure_memory, scaled_spec
+
+pytest.importorskip("docx")
+
+
+@pytest.mark.parametrize("paragraphs", [200, 2000], ids=["small", "medium"])
+def test_report_memory_within_budget(tmp_path, paragraphs):
+    path = str(tmp_path / "report.docx")
+    build_synthetic_docx(scaled_spec(paragraphs, MEMORY_DOC_PER100, (5, 4), 25), path)
+    with zipfile.ZipFile(path) as z:
+        xml_bytes = z.getinfo("word/document.xml").file_size
+
+    r = measure_memory("report", path, xml_bytes)
+
+    # ayrıştırma aşamaları da ölçülmeli (yalnızca süre yazılırsa tepe değeri kaybolur)
+    assert {"load", "classify", "text", "tables", "write"} <= r["phases"].keys()
+    for phase, v in r["phases"].items():   # bir aşama iki ölçümden yalnızca birinde görünebilir
+        if v["peak_traced"] is not None:
+            assert v["peak_traced"] <= r["budget_traced"], phase
+        if v["peak_rss_growth"] is not None:
+            assert v["peak_rss_growth"] <= r["budget_rss"], phase
+    assert r["ok"], r
@@ -0,0 +1,11 @@
+import pytest
+
+from PaperX_bench import HEAVY_MODULES, STARTUP_BUDGET_MS, measure_import
+
+
+@pytest.mark.parametrize("module", sorted(STARTUP_BUDGET_MS))
+def test_import_within_budget(module):
+    ms, imported = measure_import(module, runs=3)
+    heavy = sorted(h for h in HEAVY_MODULES if any(n == h or n.startswith(h + ".") for n in imported))
+    assert not heavy, f"{module} imports heavy modules at startup: {', '.join(heavy)}"
+    assert 0 < ms <= STARTUP_BUDGET_MS[module], f"{module}: {ms:.1f} ms > {STARTUP_BUDGET_MS[module]} ms"